@@ -0,0 +1,93 @@
+"""
+Parity check and timing of the tree-sitter and javalang Java front-ends.
+
+Every .java file under REPO_ROOT is summarized by both front-ends. The
+summaries are compared field by field and the parse time is reported. Files
+javalang cannot parse (Java 9+ syntax, for instance) are counted separately.
+
+Usage (from backend/):
+    python -m benchmarks.bench_java_frontend [REPO_ROOT] [--show N]
+
+Without REPO_ROOT the synthetic corpus of bench_tree_sitter_queries is used.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ast_parsing.java_frontend import parse_java_summary
+from services.ast_parsing.parse_cache import ParseCache
+from services.discovery.repo_file_index import RepoFileIndex
+
+
+def as_tuple(summary):
+    return (
+        summary.package,
+        [(i.path, i.static, i.wildcard) for i in summary.imports],
+        [(c.name, [(m.name, m.annotations) for m in c.methods]) for c in summary.classes],
+        summary.has_test_method,
+        summary.string_literals,
+        summary.method_calls,
+    )
+
+
+FIELDS = ("package", "imports", "classes", "has_test_method", "string_literals", "method_calls")
+
+
+def synthetic_repo() -> str:
+    from benchmarks.bench_tree_sitter_queries import synthetic_java
+    root = tempfile.mkdtemp(prefix="java-frontend-")
+    for i in range(200):
+        with open(os.path.join(root, f"Generated{i}Test.java"), "wb") as f:
+            f.write(synthetic_java(i))
+    return root
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("repo_root", nargs="?")
+    ap.add_argument("--show", type=int, default=5, help="mismatching files to print")
+    args = ap.parse_args()
+
+    paths = RepoFileIndex.build(args.repo_root or synthetic_repo()).paths(".java")
+    timings = {}
+    summaries = {}
+    for frontend in ("tree-sitter", "javalang"):
+        cache = ParseCache()
+        for path in paths:
+            cache.read(path)  # time parsing only
+        results = {}
+        start = time.perf_counter()
+        for path in paths:
+            try:
+                results[path] = as_tuple(parse_java_summary(cache, path, frontend))
+            except Exception:
+                results[path] = None
+        timings[frontend] = time.perf_counter() - start
+        summaries[frontend] = results
+
+    unparsable = [p for p in paths if summaries["javalang"][p] is None]
+    mismatches = [
+        p for p in paths
+        if summaries["javalang"][p] is not None and summaries["javalang"][p] != summaries["tree-sitter"][p]
+    ]
+
+    print(f"files: {len(paths)}  javalang failures: {len(unparsable)}  mismatches: {len(mismatches)}")
+    for frontend, seconds in timings.items():
+        print(f"{frontend:<12}{seconds * 1000:>10.1f} ms")
+    if timings["tree-sitter"]:
+        print(f"speedup     {timings['javalang'] / timings['tree-sitter']:>10.1f}x")
+
+    for path in mismatches[:args.show]:
+        expected, actual = summaries["javalang"][path], summaries["tree-sitter"][path]
+        differing = [name for name, a, b in zip(FIELDS, expected, actual) if a != b]
+        print(f"  {path}: {', '.join(differing)}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
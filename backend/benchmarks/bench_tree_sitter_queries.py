@@ -0,0 +1,208 @@
+"""
+Compare the precompiled tree-sitter queries against recursive Python tree walks.
+
+Both extract the same outline (imports, classes, methods/functions, annotations
+or test calls) from already-parsed trees, so only node iteration is timed.
+Results are checked for equality before timing.
+
+Usage (from backend/):
+    python -m benchmarks.bench_tree_sitter_queries [REPO_ROOT] [--rounds N]
+
+Without REPO_ROOT a synthetic Java and TypeScript corpus is generated.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tree_sitter import Parser
+from tree_sitter_languages import get_language
+
+from services.ast_parsing.tree_sitter_queries import captures, node_text
+from services.discovery.repo_file_index import RepoFileIndex
+
+
+# ==========================================================
+# Reference walkers (the former per-node Python recursion)
+# ==========================================================
+
+def walk_java(node, source: bytes, result):
+    if node.type == "import_declaration":
+        result["imports"].append(source[node.start_byte:node.end_byte].decode("utf-8"))
+    if node.type == "class_declaration":
+        name_node = node.child_by_field_name("name")
+        if name_node:
+            result["classes"].append(source[name_node.start_byte:name_node.end_byte].decode("utf-8"))
+    if node.type == "method_declaration":
+        name_node = node.child_by_field_name("name")
+        if name_node:
+            result["functions"].append(source[name_node.start_byte:name_node.end_byte].decode("utf-8"))
+    if node.type == "marker_annotation":
+        result["annotations"].append(source[node.start_byte:node.end_byte].decode("utf-8"))
+    for child in node.children:
+        walk_java(child, source, result)
+
+
+def walk_typescript(node, source: bytes, result):
+    if node.type == "import_statement":
+        module_node = node.child_by_field_name("source")
+        if module_node:
+            result["imports"].append(source[module_node.start_byte:module_node.end_byte].decode("utf-8"))
+    if node.type == "class_declaration":
+        name_node = node.child_by_field_name("name")
+        if name_node:
+            result["classes"].append(source[name_node.start_byte:name_node.end_byte].decode("utf-8"))
+    if node.type in ["function_declaration", "method_definition"]:
+        name_node = node.child_by_field_name("name")
+        if name_node:
+            result["functions"].append(source[name_node.start_byte:name_node.end_byte].decode("utf-8"))
+    if node.type == "call_expression":
+        function_node = node.child_by_field_name("function")
+        if function_node:
+            result["annotations"].append(source[function_node.start_byte:function_node.end_byte].decode("utf-8"))
+    for child in node.children:
+        walk_typescript(child, source, result)
+
+
+# ==========================================================
+# Query layer
+# ==========================================================
+
+QUERY_PLAN = {
+    "java": (("imports", "classes", "methods", "annotations"),
+             {"import": "imports", "class.name": "classes", "method.name": "functions", "annotation": "annotations"}),
+    "typescript": (("imports", "classes", "functions", "calls"),
+                   {"import.source": "imports", "class.name": "classes", "function.name": "functions", "call.function": "annotations"}),
+}
+
+
+def query_outline(language: str, root, source: bytes, result):
+    concerns, targets = QUERY_PLAN[language]
+    for node, capture in captures(language, root, *concerns):
+        target = targets.get(capture)
+        if target:
+            result[target].append(node_text(source, node))
+
+
+# ==========================================================
+# Corpus
+# ==========================================================
+
+def synthetic_java(i: int) -> bytes:
+    methods = "\n".join(
+        f"""    @Test
+    public void test{m}() {{
+        LoginPage page = new LoginPage(driver);
+        page.open("https://example.com/{m}");
+        for (int k = 0; k < {m}; k++) {{ page.clickElement(By.id("btn{m}")); }}
+        Assert.assertEquals(page.title(), "Title {m}");
+    }}"""
+        for m in range(40)
+    )
+    return f"""package com.acme.tests;
+
+import org.testng.annotations.Test;
+import org.testng.Assert;
+import org.openqa.selenium.By;
+import com.acme.pages.LoginPage;
+
+public class Generated{i}Test extends BaseTest {{
+    @BeforeMethod
+    public void setUp() {{ driver = DriverFactory.create(); }}
+{methods}
+}}
+""".encode()
+
+
+def synthetic_ts(i: int) -> bytes:
+    tests = "\n".join(
+        f"""  test('case {m}', async ({{ page }}) => {{
+    await page.goto('/items/{m}');
+    await page.click('#item-{m}');
+    expect(await page.textContent('h1')).toBe('Item {m}');
+  }});"""
+        for m in range(40)
+    )
+    return f"""import {{ test, expect }} from '@playwright/test';
+import {{ LoginPage }} from './pages/login';
+
+class Helper{i} {{
+  open(url: string) {{ return url; }}
+}}
+
+describe('suite {i}', () => {{
+  beforeEach(async () => {{ await new Helper{i}().open('/'); }});
+{tests}
+}});
+""".encode()
+
+
+def load_corpus(repo_root: str = None, files: int = 200):
+    if repo_root is None:
+        return {
+            "java": [synthetic_java(i) for i in range(files)],
+            "typescript": [synthetic_ts(i) for i in range(files)],
+        }
+    index = RepoFileIndex.build(repo_root)
+    corpus = {"java": [], "typescript": []}
+    for path in index.paths(".java"):
+        corpus["java"].append(open(path, "rb").read())
+    for path in index.paths(".ts", ".js"):
+        corpus["typescript"].append(open(path, "rb").read())
+    return corpus
+
+
+# ==========================================================
+# Runner
+# ==========================================================
+
+def empty_outline():
+    return {"imports": [], "classes": [], "functions": [], "annotations": []}
+
+
+def time_extraction(fn, trees, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for tree, source in trees:
+            fn(tree.root_node, source, empty_outline())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("repo_root", nargs="?")
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    corpus = load_corpus(args.repo_root)
+    walkers = {"java": walk_java, "typescript": walk_typescript}
+
+    print(f"{'language':<12}{'files':>7}{'walker ms':>12}{'query ms':>12}{'speedup':>10}")
+    for language, sources in corpus.items():
+        if not sources:
+            continue
+        parser = Parser()
+        parser.set_language(get_language(language))
+        trees = [(parser.parse(src), src) for src in sources]
+
+        walker = walkers[language]
+        query = lambda root, src, result, language=language: query_outline(language, root, src, result)
+
+        for tree, source in trees:
+            expected, actual = empty_outline(), empty_outline()
+            walker(tree.root_node, source, expected)
+            query(tree.root_node, source, actual)
+            if expected != actual:
+                raise SystemExit(f"{language}: query results differ from the walker")
+
+        walker_s = time_extraction(walker, trees, args.rounds)
+        query_s = time_extraction(query, trees, args.rounds)
+        print(f"{language:<12}{len(trees):>7}{walker_s * 1000:>12.1f}{query_s * 1000:>12.1f}{walker_s / query_s:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Memory held by the intent WorkspaceIndex: compact method spans against the
+former layout, which kept every indexed file's tree-sitter tree and source
+alive through the method nodes it stored.
+
+Each layout is built in a fresh interpreter over the same Java files, with
+the extractor as the server configures it (its parse cache capped by
+INTENT_PARSE_CACHE_MB). The growth of the resident set size is reported after
+the index build and again after every indexed method has been expanded once,
+which fills the parse cache up to its cap, along with the bytes of the
+persisted (JSON) form. Expansion through the compact index is checked to
+yield the same method bodies as the pinned nodes.
+
+Usage (from backend/):
+    python -m benchmarks.bench_workspace_index [REPO_ROOT]
+
+Without REPO_ROOT the synthetic corpus of bench_tree_sitter_queries is used.
+Linux only (reads /proc/self/statm).
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_tree_sitter_queries import synthetic_java
+from services.discovery.repo_file_index import RepoFileIndex
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def java_files(repo_root: str = None, files: int = 200):
+    if repo_root is None:
+        repo_root = tempfile.mkdtemp(prefix="bench_workspace_index_")
+        for i in range(files):
+            with open(os.path.join(repo_root, f"Generated{i}Test.java"), "wb") as f:
+                f.write(synthetic_java(i))
+    return RepoFileIndex.build(repo_root).paths(".java")
+
+
+def measure(layout: str, paths):
+    """Run in the child: build one layout and print its footprint as JSON."""
+    from services.intent_extractor_service import ASTExtractor, WorkspaceIndex
+
+    extractor = ASTExtractor()
+    extractor._init_java_parser()
+    gc.collect()
+    before = rss_bytes()
+
+    index, pinned = WorkspaceIndex(), []
+    for path in paths:
+        part = extractor.index_java_file(path)
+        if part is None:
+            continue
+        index.merge(part)
+        if layout == "pinned":
+            src_bytes = open(path, "rb").read()
+            pinned.append((extractor._java_parser.parse(src_bytes), src_bytes.decode("utf-8"), src_bytes))
+    gc.collect()
+    grown = rss_bytes() - before
+
+    classes = len(index.class_to_file)
+    methods = sum(len(m) for m in index.class_methods.values())
+    # Expansion: the pinned layout already holds every node
+    checked = 0
+    if layout == "compact":
+        for spans in index.class_methods.values():
+            for span in spans.values():
+                src, node = extractor.materialize_method(span)
+                with open(span.file_path, "rb") as f:
+                    expected = f.read()[span.start_byte:span.end_byte]
+                if src.encode("utf-8")[node.start_byte:node.end_byte] != expected:
+                    raise SystemExit(f"{span.file_path}: re-materialized method differs at {span.start_byte}")
+                checked += 1
+    gc.collect()
+    expanded = rss_bytes() - before
+
+    print(json.dumps({
+        "classes": classes,
+        "methods": methods,
+        "rss": grown,
+        "rss_expanded": expanded,
+        "json": len(json.dumps(index.to_dict())),
+        "checked": checked,
+    }))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("repo_root", nargs="?")
+    ap.add_argument("--measure", choices=("pinned", "compact"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    paths = java_files(args.repo_root)
+    if args.measure:
+        measure(args.measure, paths)
+        return
+
+    results = {}
+    for layout in ("pinned", "compact"):
+        cmd = [sys.executable, "-m", "benchmarks.bench_workspace_index", "--measure", layout]
+        if args.repo_root:
+            cmd.insert(3, args.repo_root)
+        out = subprocess.run(cmd, capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        results[layout] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    compact = results["compact"]
+    print(f"{len(paths)} files, {compact['classes']} classes, {compact['methods']} methods "
+          f"({compact['checked']} re-materialized and checked)")
+    print(f"{'layout':<10}{'index KiB':>11}{'per class':>12}{'expanded KiB':>14}{'JSON KiB':>10}")
+    for layout, r in results.items():
+        per_class = r["rss"] / max(1, r["classes"])
+        print(f"{layout:<10}{r['rss'] / 1024:>11.0f}{per_class / 1024:>11.1f}K"
+              f"{r['rss_expanded'] / 1024:>14.0f}{r['json'] / 1024:>10.0f}")
+    for column, label in (("rss", "index"), ("rss_expanded", "expanded")):
+        if compact[column] > 0:
+            print(f"reduction ({label}): {results['pinned'][column] / compact[column]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,16 @@ import sqlite3
 import os
 import logging
 
+from database.pool import get_pool
+from database.migrations import apply_migrations
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = "migration_system.db"
 
 def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Pooled connection; close() returns it to the pool."""
+    return get_pool(DB_PATH).acquire()
 
 def init_db():
     """Initializes the database with required tables using the new schema."""
@@ -183,5 +185,9 @@ def init_db():
                 logger.warning(f"Migration skipped/failed for {name}: {e}")
 
     conn.commit()
+
+    # Versioned migrations (indexes, ...) tracked in schema_migrations
+    apply_migrations(conn)
+
     conn.close()
     logger.info("Database initialized successfully.")
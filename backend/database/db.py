@@ -1,13 +1,49 @@
-import sqlite3
 import os
+import threading
+from contextlib import contextmanager
+
+from database.pool import get_pool
 
 class Database:
     def __init__(self, db_path="migration_system.db"):
         self.db_path = db_path
+        # Connection of the transaction open on the current thread, if any
+        self._local = threading.local()
+
+    def _connect(self):
+        # Long-lived pooled connection (WAL, tuned PRAGMAs); close() returns it to the pool
+        return get_pool(self.db_path).acquire()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run every execute/executemany/fetch* call in the block on one connection,
+        committed once on exit (rolled back on error). Nested blocks join the
+        outer transaction.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._connect()
+        self._local.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            conn.close()
 
     def execute(self, query, params=()):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        tx_conn = getattr(self._local, "conn", None)
+        if tx_conn is not None:
+            return tx_conn.execute(query, params)
+
+        conn = self._connect()
         try:
             cursor = conn.cursor()
             cursor.execute(query, params)
@@ -16,9 +52,27 @@ class Database:
         finally:
             conn.close()
 
+    def executemany(self, query, seq_of_params):
+        """Run `query` once per parameter tuple in a single statement batch and commit."""
+        tx_conn = getattr(self._local, "conn", None)
+        if tx_conn is not None:
+            return tx_conn.executemany(query, seq_of_params)
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(query, seq_of_params)
+            conn.commit()
+            return cursor
+        finally:
+            conn.close()
+
     def fetchall(self, query, params=()):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        tx_conn = getattr(self._local, "conn", None)
+        if tx_conn is not None:
+            return [dict(row) for row in tx_conn.execute(query, params).fetchall()]
+
+        conn = self._connect()
         try:
             cursor = conn.cursor()
             cursor.execute(query, params)
@@ -27,8 +81,12 @@ class Database:
             conn.close()
 
     def fetchone(self, query, params=()):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        tx_conn = getattr(self._local, "conn", None)
+        if tx_conn is not None:
+            row = tx_conn.execute(query, params).fetchone()
+            return dict(row) if row else None
+
+        conn = self._connect()
         try:
             cursor = conn.cursor()
             cursor.execute(query, params)
@@ -37,6 +95,10 @@ class Database:
         finally:
             conn.close()
 
+    def explain(self, query, params=()):
+        """Return the SQLite query plan for `query` as a list of plan step descriptions."""
+        return [row["detail"] for row in self.fetchall(f"EXPLAIN QUERY PLAN {query}", params)]
+
     def init_schema(self):
         """Initialize required tables including `feature_intent`."""
         create_feature_intent = """
@@ -56,7 +118,7 @@ class Database:
             updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
         );
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
             cursor = conn.cursor()
             cursor.execute(create_feature_intent)
@@ -69,6 +131,9 @@ class Database:
                 cursor.execute("ALTER TABLE feature_intent ADD COLUMN enrichment_status TEXT")
             if 'enrichment_version' not in columns:
                 cursor.execute("ALTER TABLE feature_intent ADD COLUMN enrichment_version TEXT")
+
+            # Enrichment cache lookups go by intent hash
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_feature_intent_hash ON feature_intent (intent_hash)")
                 
             conn.commit()
         finally:
@@ -0,0 +1,91 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Ordered, append-only list of (version, name, statements). Never edit an
+# applied migration; add a new version instead.
+MIGRATIONS = [
+    (1, "analysis_indexes", [
+        "CREATE INDEX IF NOT EXISTS idx_features_session_file ON features (session_id, file_path)",
+        "CREATE INDEX IF NOT EXISTS idx_features_session_name ON features (session_id, feature_name)",
+        "CREATE INDEX IF NOT EXISTS idx_tests_feature ON tests (feature_id)",
+        "CREATE INDEX IF NOT EXISTS idx_dependency_nodes_session_file ON dependency_nodes (session_id, file_path)",
+        "CREATE INDEX IF NOT EXISTS idx_dependency_edges_session_from ON dependency_edges (session_id, from_file)",
+        "CREATE INDEX IF NOT EXISTS idx_dependency_edges_session_to ON dependency_edges (session_id, to_file)",
+        "CREATE INDEX IF NOT EXISTS idx_build_dependencies_session ON build_dependencies (session_id)",
+        "CREATE INDEX IF NOT EXISTS idx_assertions_session_file ON assertions (session_id, file_path)",
+        "CREATE INDEX IF NOT EXISTS idx_config_files_session_file ON config_files (session_id, file_path)",
+        "CREATE INDEX IF NOT EXISTS idx_shared_modules_session_file ON shared_modules (session_id, file_path)",
+        "CREATE INDEX IF NOT EXISTS idx_feature_dependencies_feature ON feature_dependencies (feature_id)",
+        "CREATE INDEX IF NOT EXISTS idx_feature_dependencies_session_file ON feature_dependencies (session_id, file_path)",
+        "CREATE INDEX IF NOT EXISTS idx_feature_shared_modules_feature ON feature_shared_modules (feature_id)",
+        "CREATE INDEX IF NOT EXISTS idx_feature_shared_modules_session ON feature_shared_modules (session_id, feature_id)",
+        "CREATE INDEX IF NOT EXISTS idx_feature_config_deps_feature ON feature_config_dependencies (feature_id)",
+        "CREATE INDEX IF NOT EXISTS idx_feature_config_deps_session ON feature_config_dependencies (session_id, feature_id)",
+        "CREATE INDEX IF NOT EXISTS idx_feature_hooks_feature ON feature_hooks (feature_id)",
+        "CREATE INDEX IF NOT EXISTS idx_feature_hooks_session ON feature_hooks (session_id, feature_id)",
+        "CREATE INDEX IF NOT EXISTS idx_feature_snapshots_feature_created ON feature_snapshots (feature_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_migration_runs_session ON migration_runs (session_id)",
+    ]),
+    (2, "file_hashes", [
+        """CREATE TABLE IF NOT EXISTS file_hashes (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            hash TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+    ]),
+    (3, "snapshot_subtree_hashes", [
+        "ALTER TABLE features ADD COLUMN test_hash TEXT",
+        "ALTER TABLE features ADD COLUMN deps_hash TEXT",
+        "ALTER TABLE features ADD COLUMN config_hash TEXT",
+        "ALTER TABLE features ADD COLUMN status_reason TEXT",
+        "ALTER TABLE feature_snapshots ADD COLUMN test_hash TEXT",
+        "ALTER TABLE feature_snapshots ADD COLUMN deps_hash TEXT",
+        "ALTER TABLE feature_snapshots ADD COLUMN config_hash TEXT",
+    ]),
+    (4, "workspace_index_parts", [
+        """CREATE TABLE IF NOT EXISTS workspace_index_parts (
+            session_id TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            file_hash TEXT NOT NULL,
+            data TEXT,
+            PRIMARY KEY (session_id, file_path)
+        )""",
+    ]),
+    (5, "dependency_node_declarations", [
+        "ALTER TABLE dependency_nodes ADD COLUMN declared_types TEXT",
+    ]),
+]
+
+
+def apply_migrations(conn):
+    """Apply every migration newer than the recorded schema version, each in its own transaction."""
+    conn.execute("""CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""")
+    conn.commit()
+
+    current = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+
+    for version, name, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            # sqlite3 runs DDL outside any implicit transaction; without an explicit
+            # BEGIN a failed migration would keep its earlier statements
+            conn.execute("BEGIN")
+            for sql in statements:
+                conn.execute(sql)
+            conn.execute("INSERT INTO schema_migrations (version, name) VALUES (?, ?)", (version, name))
+            conn.commit()
+            logger.info(f"Applied schema migration {version}: {name}")
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Schema migration {version} ({name}) failed: {e}")
+            raise
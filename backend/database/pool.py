@@ -0,0 +1,100 @@
+import os
+import queue
+import sqlite3
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Idle connections kept per database file; extra connections are closed on release
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+
+# Applied once to every new connection
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-65536",      # 64 MiB page cache
+    "PRAGMA mmap_size=268435456",    # 256 MiB memory-mapped I/O
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3 connection whose close() hands it back to its pool instead of
+    closing it, so existing `conn.close()` call sites keep working unchanged.
+    """
+
+    _pool = None
+    _checked_out = False
+
+    def close(self):
+        if self._pool is not None and self._checked_out:
+            self._checked_out = False
+            self._pool.release(self)
+        elif self._pool is None:
+            super().close()
+
+    def _really_close(self):
+        self._pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of long-lived connections to one SQLite database file."""
+
+    def __init__(self, db_path: str, max_idle: int = POOL_SIZE):
+        self.db_path = db_path
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+
+    def acquire(self) -> PooledConnection:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        conn._checked_out = True
+        return conn
+
+    def release(self, conn: PooledConnection):
+        try:
+            # Never hand out a connection with a half-finished transaction
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn._really_close()
+        except sqlite3.Error as e:
+            logger.warning(f"Dropping broken pooled connection to {self.db_path}: {e}")
+            conn._really_close()
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait()._really_close()
+            except queue.Empty:
+                return
+
+    def _connect(self) -> PooledConnection:
+        # Connections move between threads, but the pool guarantees one user at a time
+        conn = sqlite3.connect(self.db_path, factory=PooledConnection, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        conn._pool = self
+        return conn
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """The shared pool for `db_path` (resolved against the current working directory)."""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(key)
+        return pool
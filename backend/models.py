@@ -9,6 +9,8 @@ class FeatureSummaryResponse(BaseModel):
     feature_id: str
     name: str
     status: str = "NOT_MIGRATED"
+    # Sub-trees that changed for NEEDS_UPDATE: comma-separated "test", "dependencies", "config"
+    status_reason: Optional[str] = None
     last_migrated: Optional[str] = None
     dependent_count: int = 0
     config_count: int = 0
@@ -94,6 +96,24 @@ class AnalysisResponse(BaseModel):
     config_files: List[ConfigFileModel]
     shared_modules: List[str] = []
 
+class DependencyGraphPage(BaseModel):
+    session_id: str
+    total_nodes: int
+    dependency_graph: Dict[str, JavaFileDependency]
+    next_cursor: Optional[int] = None
+
+class ImpactRequest(BaseModel):
+    # Either explicit paths (absolute or repo-relative) or a commit range
+    paths: Optional[List[str]] = None
+    base_commit: Optional[str] = None
+    head_commit: Optional[str] = None
+
+class ImpactResponse(BaseModel):
+    session_id: str
+    changed_files: int
+    affected_feature_ids: List[str]
+    unmatched_paths: List[str] = []
+
 class SelectFeaturesRequest(BaseModel):
     session_id: str
     feature_ids: List[str]
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from services.repository_analyzer_service import RepositoryAnalyzerService
 from services.feature_query_service import FeatureQueryService
 from services.websocket_manager import ws_manager
@@ -6,7 +6,7 @@ from database.db import Database
 from models import (
     AnalysisResponse, FeatureModel, JavaFileDependency, TestMethod,
     BuildDependency, DriverModel, AssertionModel, ConfigFileModel,
-    FeatureSummaryResponse
+    FeatureSummaryResponse, DependencyGraphPage, ImpactRequest, ImpactResponse
 )
 from typing import List
 import logging
@@ -20,10 +20,12 @@ service = RepositoryAnalyzerService(db, ws_manager)
 query_service = FeatureQueryService(db)
 
 @router.post("/{session_id}/analyze")
-async def trigger_analysis(session_id: str):
+async def trigger_analysis(session_id: str, incremental: bool = False):
     """
     Triggers full analysis using the new RepositoryAnalyzerService.
     Analysis runs as a background async task; progress is streamed via WebSocket.
+    With `incremental=true`, only files changed (per git) since the last analysed
+    commit are re-processed; falls back to a full analysis when that is not possible.
     """
     try:
         session = db.fetchone("SELECT repo_root FROM sessions WHERE id = ?", (session_id,))
@@ -33,7 +35,7 @@ async def trigger_analysis(session_id: str):
         repo_root = session["repo_root"]
         
         # Start as async background task (not blocking the response)
-        task = asyncio.create_task(service.analyze(repo_root, session_id))
+        task = asyncio.create_task(service.analyze(repo_root, session_id, incremental))
         
         # Ensure exceptions from the background task are logged
         def _on_task_done(t):
@@ -82,3 +84,30 @@ async def get_analysis(session_id: str):
     if not results:
         raise HTTPException(status_code=404, detail="No analysis results found for this session.")
     return results
+
+@router.get("/{session_id}/dependency-graph", response_model=DependencyGraphPage)
+async def get_dependency_graph(session_id: str, cursor: int = 0, limit: int = Query(500, ge=1, le=900)):
+    """
+    Returns the dependency graph one page of nodes at a time.
+    Pass the returned `next_cursor` as `cursor` to fetch the next page.
+    """
+    page = query_service.get_dependency_graph_page(session_id, cursor, limit)
+    if not page:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return page
+
+@router.post("/{session_id}/impact", response_model=ImpactResponse)
+async def get_impact(session_id: str, request: ImpactRequest):
+    """
+    Returns the IDs of the features affected by a change, given either the changed
+    `paths` or a `base_commit` (and optional `head_commit`, else the working tree).
+    """
+    try:
+        impact = query_service.get_affected_features(
+            session_id, request.paths, request.base_commit, request.head_commit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not impact:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return impact
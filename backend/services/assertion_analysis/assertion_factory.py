@@ -1,20 +1,22 @@
 from .java_assertion_detector import JavaAssertionDetector
 from .ts_assertion_detector import TSAssertionDetector
 from .python_assertion_detector import PythonAssertionDetector
+from services.discovery.repo_file_index import RepoFileIndex
+from services.ast_parsing.parse_cache import ParseCache
 
 
 class AssertionDetectorFactory:
 
     @staticmethod
-    def get_detector(language, repo_root):
+    def get_detector(language, repo_root, file_index: RepoFileIndex = None, parse_cache: ParseCache = None):
 
         if language == "java":
-            return JavaAssertionDetector(repo_root)
+            return JavaAssertionDetector(repo_root, file_index, parse_cache)
 
         if language in ["typescript", "js", "javascript"]:
-            return TSAssertionDetector(repo_root)
+            return TSAssertionDetector(repo_root, file_index, parse_cache)
 
         if language == "python":
-            return PythonAssertionDetector(repo_root)
+            return PythonAssertionDetector(repo_root, file_index, parse_cache)
 
         raise ValueError("Unsupported language")
@@ -1,11 +1,18 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict
 
+from services.discovery.repo_file_index import RepoFileIndex
+from services.ast_parsing.parse_cache import ParseCache
+
 
 class AbstractAssertionDetector(ABC):
 
-    def __init__(self, repo_root: str):
+    def __init__(self, repo_root: str, file_index: RepoFileIndex = None, parse_cache: ParseCache = None):
         self.repo_root = repo_root
+        self.file_index = file_index if file_index is not None else RepoFileIndex.build(repo_root)
+        self.parse_cache = parse_cache or ParseCache()
+        # Set by detectors that skip parses with a byte prefilter
+        self.prefilter = None
 
     @abstractmethod
     def detect_assertions(self) -> List[Dict]:
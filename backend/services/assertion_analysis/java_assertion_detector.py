@@ -1,32 +1,30 @@
-import os
-import javalang
 from pathlib import Path
 from .base_assertion_detector import AbstractAssertionDetector
+from services.ast_parsing.java_frontend import parse_java_summary
+from services.ast_parsing.byte_prefilter import BytePrefilter
 
 
 class JavaAssertionDetector(AbstractAssertionDetector):
 
     def detect_assertions(self):
         results = []
+        self.prefilter = BytePrefilter("java", "assertions")
 
-        for root, _, files in os.walk(self.repo_root):
-            for file in files:
-                if file.endswith(".java"):
-                    file_path = Path(root) / file
-                    try:
-                        code = file_path.read_text()
-                        tree = javalang.parse.parse(code)
-                    except:
-                        continue
+        for path in self.file_index.paths(".java"):
+            if not self.prefilter.admits_file(self.parse_cache, path):
+                continue
+            file_path = Path(path)
+            try:
+                summary = parse_java_summary(self.parse_cache, path)
+            except:
+                continue
 
-                    for _, node in tree.filter(javalang.tree.MethodInvocation):
-                        name = node.member
-
-                        if name.startswith("assert"):
-                            results.append({
-                                "file_path": str(file_path),
-                                "assertion_type": name,
-                                "library": "JUnit/TestNG"
-                            })
+            for name in summary.method_calls:
+                if name.startswith("assert"):
+                    results.append({
+                        "file_path": str(file_path),
+                        "assertion_type": name,
+                        "library": "JUnit/TestNG"
+                    })
 
         return results
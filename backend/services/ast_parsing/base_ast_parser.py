@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List
 
+from .parse_cache import ParseCache
+
 
 class BaseASTParser(ABC):
 
-    def __init__(self, repo_root: str):
+    def __init__(self, repo_root: str, parse_cache: ParseCache = None):
         self.repo_root = repo_root
+        self.parse_cache = parse_cache or ParseCache()
 
     @abstractmethod
     def parse_file(self, file_path: str) -> Dict:
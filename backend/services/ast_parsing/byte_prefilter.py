@@ -0,0 +1,99 @@
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Optional
+
+from .parse_cache import ParseCache
+
+
+# Set PREFILTER=0 to parse every file, e.g. to check that no result is lost
+PREFILTER_ENABLED = os.getenv("PREFILTER", "1") != "0"
+
+# Byte patterns per (language, concern). A file that matches none of them
+# cannot contribute to the concern, so its parse is skipped. Patterns must be
+# conservative: false positives only cost a parse, false negatives lose results.
+# An empty tuple means no file can contribute.
+PREFILTER_PATTERNS = {
+    # Features need a method annotated exactly @Test; comments may sit between @ and the name
+    ("java", "features"): (rb"@(?:\s|/\*[\s\S]*?\*/|//[^\n]*)*Test\b",),
+    # Assertions are invocations of assert* methods
+    ("java", "assertions"): (rb"assert",),
+    # Hooks are these marker annotations, compared verbatim
+    ("java", "hooks"): (rb"@(?:BeforeSuite|BeforeMethod|AfterMethod|BeforeClass|AfterClass)\b",),
+    # Features need a `def test_*` function (the name may follow a line continuation)
+    ("python", "features"): (rb"\bdef(?:\s|\\)+test_",),
+    # The Python parser reports no hooks
+    ("python", "hooks"): (),
+    # Features need a top-level statement containing `test(` or `it(`
+    ("typescript", "features"): (rb"test\(", rb"it\("),
+    # Hooks are calls to these functions
+    ("typescript", "hooks"): (rb"(?:before|after)(?:Each|All)",),
+}
+
+_LANGUAGE_KEYS = {
+    "java": "java",
+    "python": "python",
+    "ts": "typescript",
+    "typescript": "typescript",
+    "js": "typescript",
+    "javascript": "typescript",
+}
+
+
+def prefilter_language(language: str) -> Optional[str]:
+    """Pattern key for a session language, or None if it has no prefilters."""
+    return _LANGUAGE_KEYS.get((language or "").lower())
+
+
+@lru_cache(maxsize=None)
+def _compile(language: str, concern: str):
+    patterns = PREFILTER_PATTERNS.get((language, concern))
+    if patterns is None:
+        return None
+    if not patterns:
+        return False
+    # One alternation per concern, so each file is scanned once
+    return re.compile(b"|".join(b"(?:" + p + b")" for p in patterns))
+
+
+class BytePrefilter:
+    """
+    Classifies files for one analysis concern with a single compiled regex over
+    their raw bytes, and counts how many it let through.
+    """
+
+    def __init__(self, language: str, concern: str, enabled: bool = PREFILTER_ENABLED):
+        self.language = prefilter_language(language)
+        self.concern = concern
+        self._pattern = _compile(self.language, concern) if enabled and self.language else None
+        self.scanned = 0
+        self.skipped = 0
+
+    def admits(self, source: bytes) -> bool:
+        """False only if `source` cannot contribute to the concern."""
+        self.scanned += 1
+        if self._pattern is None:
+            return True
+        if self._pattern is False or not self._pattern.search(source):
+            self.skipped += 1
+            return False
+        return True
+
+    def admits_file(self, parse_cache: ParseCache, path) -> bool:
+        """`admits` for the file at `path`; unreadable files are admitted, so the parse reports them."""
+        if self._pattern is None:
+            self.scanned += 1
+            return True
+        try:
+            source = parse_cache.read(path)
+        except OSError:
+            self.scanned += 1
+            return True
+        return self.admits(source)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "scanned": self.scanned,
+            "skipped": self.skipped,
+            "skip_rate": round(self.skipped / self.scanned, 3) if self.scanned else 0.0,
+        }
@@ -5,12 +5,14 @@ from tree_sitter import Parser
 from tree_sitter_languages import get_language
 
 from .base_ast_parser import BaseASTParser
+from .parse_cache import TREE_SITTER_JAVA
+from .tree_sitter_queries import captures, node_text
 
 
 class JavaASTParser(BaseASTParser):
 
-    def __init__(self, repo_root: str):
-        super().__init__(repo_root)
+    def __init__(self, repo_root: str, parse_cache=None):
+        super().__init__(repo_root, parse_cache)
         self.language = get_language("java")
         self.parser = Parser()
         self.parser.set_language(self.language)
@@ -27,64 +29,55 @@ class JavaASTParser(BaseASTParser):
         full_path = os.path.join(self.repo_root, file_path)
 
         try:
-            with open(full_path, "rb") as f:
-                source_code = f.read()
-
-            tree = self.parser.parse(source_code)
+            source_code = self.parse_cache.read(full_path)
+            tree = self.parse_cache.parse(full_path, TREE_SITTER_JAVA, self.parser.parse)
             root = tree.root_node
 
-            self._walk_tree(root, source_code, result)
+            self._collect(root, source_code, result)
 
         except Exception:
             pass
 
         return result
 
-    def _walk_tree(self, node, source_code: bytes, result: Dict):
-
-        # -----------------------------
-        # Import Detection
-        # -----------------------------
-        if node.type == "import_declaration":
-            text = source_code[node.start_byte:node.end_byte].decode("utf-8")
-            cleaned = text.replace("import", "").replace(";", "").strip()
-            result["imports"].append(cleaned)
-
-        # -----------------------------
-        # Class Detection
-        # -----------------------------
-        if node.type == "class_declaration":
-            name_node = node.child_by_field_name("name")
-            if name_node:
-                name = source_code[name_node.start_byte:name_node.end_byte].decode("utf-8")
-                result["classes"].append(name)
-
-        # -----------------------------
-        # Method Detection
-        # -----------------------------
-        if node.type == "method_declaration":
-            name_node = node.child_by_field_name("name")
-            if name_node:
-                name = source_code[name_node.start_byte:name_node.end_byte].decode("utf-8")
-                result["functions"].append(name)
-
-        # -----------------------------
-        # Annotation Detection
-        # -----------------------------
-        if node.type == "marker_annotation":
-            annotation_text = source_code[node.start_byte:node.end_byte].decode("utf-8")
-
-            if "@Test" in annotation_text:
-                result["is_test"] = True
-
-            if annotation_text in [
-                "@BeforeSuite",
-                "@BeforeMethod",
-                "@AfterMethod",
-                "@BeforeClass",
-                "@AfterClass"
-            ]:
-                result["hooks"].append(annotation_text)
-
-        for child in node.children:
-            self._walk_tree(child, source_code, result)
+    def _collect(self, root, source_code: bytes, result: Dict):
+        """Fill `result` from the captures of one precompiled query."""
+        for node, capture in captures("java", root, "imports", "classes", "methods", "annotations"):
+
+            # -----------------------------
+            # Import Detection
+            # -----------------------------
+            if capture == "import":
+                text = node_text(source_code, node)
+                cleaned = text.replace("import", "").replace(";", "").strip()
+                result["imports"].append(cleaned)
+
+            # -----------------------------
+            # Class Detection
+            # -----------------------------
+            elif capture == "class.name":
+                result["classes"].append(node_text(source_code, node))
+
+            # -----------------------------
+            # Method Detection
+            # -----------------------------
+            elif capture == "method.name":
+                result["functions"].append(node_text(source_code, node))
+
+            # -----------------------------
+            # Annotation Detection
+            # -----------------------------
+            elif capture == "annotation":
+                annotation_text = node_text(source_code, node)
+
+                if "@Test" in annotation_text:
+                    result["is_test"] = True
+
+                if annotation_text in [
+                    "@BeforeSuite",
+                    "@BeforeMethod",
+                    "@AfterMethod",
+                    "@BeforeClass",
+                    "@AfterClass"
+                ]:
+                    result["hooks"].append(annotation_text)
@@ -0,0 +1,217 @@
+import os
+import threading
+from typing import List, Optional, Set
+
+from tree_sitter import Parser
+from tree_sitter_languages import get_language
+
+from .parse_cache import (
+    ParseCache, JAVALANG, TREE_SITTER_JAVA, JAVA_SUMMARY_JAVALANG, JAVA_SUMMARY_TREE_SITTER, parse_javalang
+)
+from .tree_sitter_queries import captures
+
+
+# "tree-sitter" (default) or "javalang". The javalang front-end is kept for
+# result-parity testing; it is much slower and fails on Java 9+ syntax.
+JAVA_FRONTEND = os.getenv("JAVA_FRONTEND", "tree-sitter").lower()
+
+
+class JavaImport:
+    __slots__ = ("path", "static", "wildcard")
+
+    def __init__(self, path: str, static: bool = False, wildcard: bool = False):
+        self.path = path
+        self.static = static
+        self.wildcard = wildcard
+
+    def __repr__(self):
+        return f"JavaImport({self.path!r}, static={self.static}, wildcard={self.wildcard})"
+
+
+class JavaMethod:
+    __slots__ = ("name", "annotations")
+
+    def __init__(self, name: str, annotations: List[str]):
+        self.name = name
+        self.annotations = annotations
+
+    def __repr__(self):
+        return f"JavaMethod({self.name!r}, {self.annotations!r})"
+
+
+class JavaClass:
+    __slots__ = ("name", "methods")
+
+    def __init__(self, name: str, methods: List[JavaMethod]):
+        self.name = name
+        self.methods = methods
+
+    def __repr__(self):
+        return f"JavaClass({self.name!r}, {self.methods!r})"
+
+
+class JavaFileSummary:
+    """
+    Everything the Java analysis stages need from one source file, produced by
+    a single parse: package, imports, class declarations with their methods and
+    annotation names, string literals (quotes included), invoked method names and
+    the simple names used as types (comments and strings excluded).
+    """
+
+    __slots__ = ("package", "imports", "classes", "has_test_method", "string_literals", "method_calls",
+                 "type_references")
+
+    def __init__(self):
+        self.package: Optional[str] = None
+        self.imports: List[JavaImport] = []
+        self.classes: List[JavaClass] = []          # every class declaration, outer first
+        self.has_test_method = False                # any method anywhere annotated @Test
+        self.string_literals: List[str] = []
+        self.method_calls: List[str] = []
+        self.type_references: Set[str] = set()
+
+    def __repr__(self):
+        return f"JavaFileSummary(package={self.package!r}, classes={[c.name for c in self.classes]})"
+
+
+def parse_java_summary(parse_cache: ParseCache, path, frontend: str = None) -> JavaFileSummary:
+    """
+    Summary of the Java file at `path`, cached in `parse_cache` next to the
+    tree it was built from. Raises when the front-end cannot parse the file.
+    """
+    frontend = frontend or JAVA_FRONTEND
+    # The tree is only fetched (or parsed) when the summary is not cached
+    if frontend == "javalang":
+        return parse_cache.parse(
+            path, JAVA_SUMMARY_JAVALANG,
+            lambda source: summarize_javalang(parse_cache.parse(path, JAVALANG, parse_javalang))
+        )
+
+    return parse_cache.parse(
+        path, JAVA_SUMMARY_TREE_SITTER,
+        lambda source: summarize_tree_sitter(parse_cache.parse(path, TREE_SITTER_JAVA, _tree_sitter_parser().parse), source)
+    )
+
+
+# ==========================================================
+# tree-sitter front-end
+# ==========================================================
+
+_local = threading.local()
+
+
+def _tree_sitter_parser() -> Parser:
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = Parser()
+        parser.set_language(get_language("java"))
+    return parser
+
+
+def _text(source: bytes, node) -> str:
+    return source[node.start_byte:node.end_byte].decode("utf-8", errors="ignore")
+
+
+def _annotation_names(source: bytes, declaration) -> List[str]:
+    names = []
+    for child in declaration.children:
+        if child.type == "modifiers":
+            for mod in child.children:
+                if mod.type in ("marker_annotation", "annotation"):
+                    name = mod.child_by_field_name("name")
+                    if name:
+                        names.append(_text(source, name))
+    return names
+
+
+def summarize_tree_sitter(tree, source: bytes) -> JavaFileSummary:
+    summary = JavaFileSummary()
+
+    concerns = ("package", "imports", "classes", "methods", "strings", "calls", "type_references")
+    for node, capture in captures("java", tree.root_node, *concerns):
+        if capture == "package":
+            if summary.package is None:
+                summary.package = _text(source, node)
+
+        elif capture == "import":
+            path, static, wildcard = None, False, False
+            for child in node.children:
+                if child.type == "static":
+                    static = True
+                elif child.type == "asterisk":
+                    wildcard = True
+                elif child.type in ("scoped_identifier", "identifier"):
+                    path = _text(source, child)
+            if path:
+                summary.imports.append(JavaImport(path, static, wildcard))
+
+        elif capture == "class":
+            body = node.child_by_field_name("body")
+            methods = []
+            if body:
+                for member in body.children:
+                    if member.type == "method_declaration":
+                        name = member.child_by_field_name("name")
+                        methods.append(JavaMethod(_text(source, name), _annotation_names(source, member)))
+            summary.classes.append(JavaClass(_text(source, node.child_by_field_name("name")), methods))
+
+        elif capture == "method":
+            if not summary.has_test_method and "Test" in _annotation_names(source, node):
+                summary.has_test_method = True
+
+        elif capture == "string":
+            summary.string_literals.append(_text(source, node))
+
+        elif capture == "call.name":
+            # javalang models super.m() as a separate node type; keep parity
+            target = node.parent.child_by_field_name("object")
+            if target is None or target.type != "super":
+                summary.method_calls.append(_text(source, node))
+
+        elif capture == "type_ref":
+            summary.type_references.add(_text(source, node))
+
+    return summary
+
+
+# ==========================================================
+# javalang front-end
+# ==========================================================
+
+def summarize_javalang(tree) -> JavaFileSummary:
+    import javalang
+
+    summary = JavaFileSummary()
+    summary.package = tree.package.name if tree.package else None
+    summary.imports = [JavaImport(imp.path, bool(imp.static), bool(imp.wildcard)) for imp in tree.imports]
+
+    for _, class_node in tree.filter(javalang.tree.ClassDeclaration):
+        summary.classes.append(JavaClass(
+            class_node.name,
+            [JavaMethod(m.name, [a.name for a in m.annotations]) for m in class_node.methods]
+        ))
+
+    summary.has_test_method = any(
+        a.name == "Test" for _, m in tree.filter(javalang.tree.MethodDeclaration) for a in m.annotations
+    )
+
+    try:
+        summary.string_literals = [
+            node.value for _, node in tree.filter(javalang.tree.Literal)
+            if isinstance(node.value, str) and node.value.startswith('"')
+        ]
+    except Exception:
+        # AST might fail on some complex literals
+        summary.string_literals = []
+
+    summary.method_calls = [node.member for _, node in tree.filter(javalang.tree.MethodInvocation)]
+
+    refs = summary.type_references
+    refs.update(node.name for _, node in tree.filter(javalang.tree.ReferenceType))
+    refs.update(node.name for _, node in tree.filter(javalang.tree.Annotation))
+    for node_type in (javalang.tree.MethodInvocation, javalang.tree.MemberReference, javalang.tree.MethodReference):
+        for _, node in tree.filter(node_type):
+            qualifier = getattr(node, "qualifier", None)
+            if isinstance(qualifier, str) and qualifier:
+                refs.update(qualifier.split("."))
+    return summary
@@ -0,0 +1,221 @@
+import ast
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Parser kinds shared between stages
+JAVALANG = "javalang"
+TREE_SITTER_JAVA = "tree-sitter-java"
+TREE_SITTER_TYPESCRIPT = "tree-sitter-typescript"
+PYTHON_AST = "python-ast"
+JAVA_SUMMARY_TREE_SITTER = "java-summary-tree-sitter"
+JAVA_SUMMARY_JAVALANG = "java-summary-javalang"
+
+SOURCE = "source"
+
+DEFAULT_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+
+class _ParseFailure:
+    """Remembers that a file failed to parse so it is not retried."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class ParseCache:
+    """
+    Per-analysis cache of file sources and parsed trees.
+
+    Trees are keyed by (path, content hash, parser kind), so each file is read
+    and parsed at most once per parser during a run. A file whose size or
+    mtime changed since it was read is treated as a miss. The estimated memory
+    footprint is capped at `max_bytes`; least recently used entries are
+    evicted first.
+    """
+
+    # Rough size of a parsed tree relative to its source, per parser kind
+    # (tree-sitter figures measured as resident memory per source byte)
+    TREE_WEIGHT = {
+        SOURCE: 1,
+        JAVALANG: 20,
+        TREE_SITTER_JAVA: 40,
+        TREE_SITTER_TYPESCRIPT: 50,
+        PYTHON_AST: 15,
+        JAVA_SUMMARY_TREE_SITTER: 2,
+        JAVA_SUMMARY_JAVALANG: 2,
+    }
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[Any, int]]" = OrderedDict()
+        # path -> (content digest, size, mtime_ns) of the last read
+        self._digests: Dict[str, Tuple[str, int, int]] = {}
+        self._size = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    # ----------------------------------------------------------
+    # Public API
+    # ----------------------------------------------------------
+
+    def read(self, path: str) -> bytes:
+        """Return the raw bytes of `path`, reading the file only on a cache miss."""
+        path = self._normalize(path)
+        with self._lock:
+            digest = self._current_digest(path)
+            if digest is not None:
+                entry = self._entries.get((path, digest, SOURCE))
+                if entry is not None:
+                    self._entries.move_to_end((path, digest, SOURCE))
+                    return entry[0]
+
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            source = f.read()
+
+        digest = hashlib.blake2b(source, digest_size=16).hexdigest()
+        with self._lock:
+            self._digests[path] = (digest, st.st_size, st.st_mtime_ns)
+            self._store((path, digest, SOURCE), source, len(source))
+        return source
+
+    def parse(self, path: str, kind: str, parse_fn: Callable[[bytes], Any]) -> Any:
+        """
+        Return the tree produced by `parse_fn(source)` for `path`.
+
+        Failures are cached too: the original exception is re-raised on every
+        lookup without parsing the file again.
+        """
+        path = self._normalize(path)
+        with self._lock:
+            digest = self._current_digest(path)
+            key = (path, digest, kind)
+            entry = self._entries.get(key) if digest is not None else None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._unwrap(entry[0])
+            self.misses += 1
+
+        source = self.read(path)
+        key = (path, self._digests[path][0], kind)
+        try:
+            value = parse_fn(source)
+        except Exception as e:
+            value = _ParseFailure(e)
+
+        with self._lock:
+            cost = max(len(source), 1) * self.TREE_WEIGHT.get(kind, 10)
+            self._store(key, value, cost)
+        return self._unwrap(value)
+
+    def take(self, path: str, kinds) -> Optional[Tuple[Tuple[str, int, int], Dict[str, Any]]]:
+        """
+        Drop every entry of `path` and return (digest, size, mtime_ns) of its last
+        read with the values of `kinds` among them, for `adopt` in another process.
+        """
+        path = self._normalize(path)
+        with self._lock:
+            known = self._digests.pop(path, None)
+            taken = {}
+            for key in [k for k in self._entries if k[0] == path]:
+                value, cost = self._entries.pop(key)
+                self._size -= cost
+                # Failures stay behind: their exceptions need not be picklable
+                if known is not None and key[1] == known[0] and key[2] in kinds and not isinstance(value, _ParseFailure):
+                    taken[key[2]] = value
+        return (known, taken) if known is not None else None
+
+    def adopt(self, path: str, taken) -> None:
+        """Cache values handed over by `take`, unless the file changed since they were parsed."""
+        if taken is None:
+            return
+        (digest, size, mtime_ns), values = taken
+        path = self._normalize(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+            return
+        with self._lock:
+            self._digests[path] = (digest, size, mtime_ns)
+            for kind, value in values.items():
+                self._store((path, digest, kind), value, max(size, 1) * self.TREE_WEIGHT.get(kind, 10))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "estimated_bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # ----------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------
+
+    @staticmethod
+    def _normalize(path) -> str:
+        return str(path).replace("\\", "/")
+
+    def _current_digest(self, path: str):
+        """Digest of the last read of `path`, or None if unknown or the file changed since."""
+        known = self._digests.get(path)
+        if known is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if (st.st_size, st.st_mtime_ns) != known[1:]:
+            return None
+        return known[0]
+
+    @staticmethod
+    def _unwrap(value):
+        if isinstance(value, _ParseFailure):
+            raise value.error
+        return value
+
+    def _store(self, key, value, cost: int):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= old[1]
+
+        # Entries larger than the whole budget are returned but never cached
+        if cost > self.max_bytes:
+            return
+
+        self._entries[key] = (value, cost)
+        self._size += cost
+
+        while self._size > self.max_bytes and self._entries:
+            _, (_, evicted_cost) = self._entries.popitem(last=False)
+            self._size -= evicted_cost
+
+
+# ==========================================================
+# Shared parse functions
+# ==========================================================
+
+def parse_javalang(source: bytes):
+    import javalang
+    return javalang.parse.parse(source.decode("utf-8", errors="ignore"))
+
+
+def parse_python(source: bytes):
+    return ast.parse(source.decode("utf-8", errors="ignore"))
@@ -1,17 +1,18 @@
 from .python_ast_parser import PythonASTParser
 from .ts_ast_parser import TypeScriptASTParser
 from .java_ast_parser import JavaASTParser
+from .parse_cache import ParseCache
 
 
 class ASTParserFactory:
 
     @staticmethod
-    def get_parser(language: str, repo_root: str):
+    def get_parser(language: str, repo_root: str, parse_cache: ParseCache = None):
         if language.lower() == "python":
-            return PythonASTParser(repo_root)
+            return PythonASTParser(repo_root, parse_cache)
         if language.lower() in ["typescript", "javascript"]:
-            return TypeScriptASTParser(repo_root)
+            return TypeScriptASTParser(repo_root, parse_cache)
         if language.lower() == "java":
-            return JavaASTParser(repo_root)
+            return JavaASTParser(repo_root, parse_cache)
 
         raise ValueError(f"Unsupported language: {language}")
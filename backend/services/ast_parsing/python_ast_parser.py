@@ -3,6 +3,7 @@ import os
 from typing import Dict
 
 from .base_ast_parser import BaseASTParser
+from .parse_cache import PYTHON_AST, parse_python
 
 
 class PythonASTParser(BaseASTParser):
@@ -19,8 +20,7 @@ class PythonASTParser(BaseASTParser):
         full_path = os.path.join(self.repo_root, file_path)
 
         try:
-            with open(full_path, "r", encoding="utf-8") as f:
-                tree = ast.parse(f.read())
+            tree = self.parse_cache.parse(full_path, PYTHON_AST, parse_python)
 
             for node in ast.walk(tree):
 
@@ -0,0 +1,64 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+from tree_sitter import Node, Query
+from tree_sitter_languages import get_language
+
+
+# S-expression patterns per language and concern. Capture names are prefixed
+# with the concern, so several concerns can share one compiled query and be
+# told apart in its captures.
+QUERY_PATTERNS = {
+    "java": {
+        "package": "(package_declaration [(scoped_identifier) (identifier)] @package)",
+        "imports": "(import_declaration) @import",
+        "classes": "(class_declaration name: (_) @class.name) @class",
+        "methods": "(method_declaration name: (_) @method.name) @method",
+        "fields": "(field_declaration) @field",
+        "local_variables": "(local_variable_declaration) @local_variable",
+        "annotations": "(marker_annotation) @annotation",
+        "strings": "(string_literal) @string",
+        "calls": "(method_invocation name: (_) @call.name) @call",
+        # Simple names code refers to types by: type uses, and qualifiers of
+        # static calls/fields, annotations and method references
+        "type_references": """[
+            (type_identifier) @type_ref
+            (method_invocation object: (identifier) @type_ref)
+            (field_access object: (identifier) @type_ref)
+            (marker_annotation name: (identifier) @type_ref)
+            (annotation name: (identifier) @type_ref)
+            (method_reference . (identifier) @type_ref)
+        ]""",
+    },
+    "typescript": {
+        "imports": "(import_statement source: (_) @import.source) @import",
+        "classes": "(class_declaration name: (_) @class.name) @class",
+        "functions": "[(function_declaration name: (_) @function.name) (method_definition name: (_) @function.name)]",
+        "calls": "(call_expression function: (_) @call.function) @call",
+        "strings": "(string) @string",
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def get_query(language: str, *concerns: str) -> Query:
+    """
+    Compiled query matching every pattern of `concerns` for `language`.
+    Compiled once per process and combination of concerns.
+    """
+    patterns = QUERY_PATTERNS[language]
+    return get_language(language).query("\n".join(patterns[c] for c in concerns))
+
+
+def captures(language: str, node: Node, *concerns: str) -> List[Tuple[Node, str]]:
+    """(node, capture name) pairs under `node`, in document order, matched in native code."""
+    return get_query(language, *concerns).captures(node)
+
+
+def capture_nodes(language: str, node: Node, concern: str, capture: str) -> List[Node]:
+    """Nodes of one `capture` of `concern` under `node`, in document order."""
+    return [n for n, name in captures(language, node, concern) if name == capture]
+
+
+def node_text(source: bytes, node: Node) -> str:
+    return source[node.start_byte:node.end_byte].decode("utf-8")
@@ -5,12 +5,14 @@ from tree_sitter import Parser
 from tree_sitter_languages import get_language
 
 from .base_ast_parser import BaseASTParser
+from .parse_cache import TREE_SITTER_TYPESCRIPT
+from .tree_sitter_queries import captures, node_text
 
 
 class TypeScriptASTParser(BaseASTParser):
 
-    def __init__(self, repo_root: str):
-        super().__init__(repo_root)
+    def __init__(self, repo_root: str, parse_cache=None):
+        super().__init__(repo_root, parse_cache)
         self.language = get_language("typescript")
         self.parser = Parser()
         self.parser.set_language(self.language)
@@ -27,61 +29,48 @@ class TypeScriptASTParser(BaseASTParser):
         full_path = os.path.join(self.repo_root, file_path)
 
         try:
-            with open(full_path, "rb") as f:
-                source_code = f.read()
-
-            tree = self.parser.parse(source_code)
+            source_code = self.parse_cache.read(full_path)
+            tree = self.parse_cache.parse(full_path, TREE_SITTER_TYPESCRIPT, self.parser.parse)
             root = tree.root_node
 
-            self._walk_tree(root, source_code, result)
+            self._collect(root, source_code, result)
 
         except Exception:
             pass
 
         return result
 
-    def _walk_tree(self, node, source_code: bytes, result: Dict):
+    def _collect(self, root, source_code: bytes, result: Dict):
+        """Fill `result` from the captures of one precompiled query."""
+        for node, capture in captures("typescript", root, "imports", "classes", "functions", "calls"):
 
-        # -----------------------------
-        # Import Detection
-        # -----------------------------
-        if node.type == "import_statement":
-            module_node = node.child_by_field_name("source")
-            if module_node:
-                module_text = source_code[module_node.start_byte:module_node.end_byte].decode("utf-8")
+            # -----------------------------
+            # Import Detection
+            # -----------------------------
+            if capture == "import.source":
+                module_text = node_text(source_code, node)
                 result["imports"].append(module_text.strip('"').strip("'"))
 
-        # -----------------------------
-        # Class Detection
-        # -----------------------------
-        if node.type == "class_declaration":
-            name_node = node.child_by_field_name("name")
-            if name_node:
-                name = source_code[name_node.start_byte:name_node.end_byte].decode("utf-8")
-                result["classes"].append(name)
-
-        # -----------------------------
-        # Function Detection
-        # -----------------------------
-        if node.type in ["function_declaration", "method_definition"]:
-            name_node = node.child_by_field_name("name")
-            if name_node:
-                name = source_code[name_node.start_byte:name_node.end_byte].decode("utf-8")
-                result["functions"].append(name)
-
-        # -----------------------------
-        # Test Detection (Jest / Cypress / Playwright)
-        # -----------------------------
-        if node.type == "call_expression":
-            function_node = node.child_by_field_name("function")
-            if function_node:
-                fn_name = source_code[function_node.start_byte:function_node.end_byte].decode("utf-8")
+            # -----------------------------
+            # Class Detection
+            # -----------------------------
+            elif capture == "class.name":
+                result["classes"].append(node_text(source_code, node))
+
+            # -----------------------------
+            # Function Detection
+            # -----------------------------
+            elif capture == "function.name":
+                result["functions"].append(node_text(source_code, node))
+
+            # -----------------------------
+            # Test Detection (Jest / Cypress / Playwright)
+            # -----------------------------
+            elif capture == "call.function":
+                fn_name = node_text(source_code, node)
 
                 if fn_name in ["test", "it", "describe"]:
                     result["is_test"] = True
 
                 if fn_name in ["beforeEach", "afterEach", "beforeAll", "afterAll"]:
                     result["hooks"].append(fn_name)
-
-        for child in node.children:
-            self._walk_tree(child, source_code, result)
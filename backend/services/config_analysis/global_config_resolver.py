@@ -2,6 +2,9 @@ import os
 import re
 from typing import Dict, List, Set
 
+from services.discovery.repo_file_index import RepoFileIndex
+from services.dependency_graph.closure_engine import ClosureEngine
+
 
 class GlobalConfigResolver:
     """
@@ -44,16 +47,20 @@ class GlobalConfigResolver:
         self,
         repo_root: str,
         dependency_graph: Dict[str, Set[str]],
-        feature_files: Dict[str, List[str]]
+        feature_files: Dict[str, List[str]],
+        file_index: RepoFileIndex = None
     ):
         """
         :param repo_root: root path of repo
         :param dependency_graph: directed graph {file: {deps}}
         :param feature_files: {feature_id: [test_files]}
+        :param file_index: pre-built file index (built on demand if omitted)
         """
         self.repo_root = repo_root
         self.graph = dependency_graph
         self.feature_files = feature_files
+        self.file_index = file_index if file_index is not None else RepoFileIndex.build(repo_root)
+        self._closure_engine = None
 
     # ==========================================================
     # PUBLIC API
@@ -86,18 +93,13 @@ class GlobalConfigResolver:
     def _detect_global_configs(self) -> List[str]:
         detected = []
 
-        for root, _, files in os.walk(self.repo_root):
-            for file in files:
-                full_path = os.path.join(root, file)
-
-                relative_path = os.path.relpath(full_path, self.repo_root)
-
-                if self._is_global_config(file):
-                    detected.append(relative_path)
-                    continue
+        for entry in self.file_index:
+            if self._is_global_config(entry.name):
+                detected.append(entry.rel_path)
+                continue
 
-                if self._contains_global_hook(full_path):
-                    detected.append(relative_path)
+            if self._contains_global_hook(entry.path):
+                detected.append(entry.rel_path)
 
         return list(set(detected))
 
@@ -155,19 +157,8 @@ class GlobalConfigResolver:
 
     def _resolve_feature_closure(self, start_files: List[str]) -> Set[str]:
 
-        visited = set()
-        stack = list(start_files)
-
-        while stack:
-            current = stack.pop()
-
-            if current in visited:
-                continue
-
-            visited.add(current)
-
-            for dep in self.graph.get(current, []):
-                if dep not in visited:
-                    stack.append(dep)
+        if self._closure_engine is None:
+            self._closure_engine = ClosureEngine(self.graph)
 
-        return visited
+        # Start files are part of their own closure
+        return self._closure_engine.closure(start_files)
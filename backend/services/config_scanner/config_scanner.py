@@ -1,4 +1,4 @@
-import os
+from services.discovery.repo_file_index import RepoFileIndex
 
 
 class ConfigScanner:
@@ -15,17 +15,17 @@ class ConfigScanner:
     ]
 
     @staticmethod
-    def scan(repo_root):
+    def scan(repo_root, file_index: RepoFileIndex = None):
 
         results = []
+        file_index = file_index if file_index is not None else RepoFileIndex.build(repo_root)
 
-        for root, _, files in os.walk(repo_root):
-            for file in files:
-                for ext in ConfigScanner.CONFIG_EXTENSIONS:
-                    if file.endswith(ext):
-                        results.append({
-                            "file_path": os.path.join(root, file),
-                            "type": ext
-                        })
+        for entry in file_index:
+            for ext in ConfigScanner.CONFIG_EXTENSIONS:
+                if entry.name.endswith(ext):
+                    results.append({
+                        "file_path": entry.path,
+                        "type": ext
+                    })
 
         return results
@@ -1,20 +1,23 @@
 from .java_dependency_analyzer import JavaDependencyAnalyzer
 from .ts_and_js_dependency_analyzer import TSDependencyAnalyzer
 from .python_dependency_analyzer import PythonDependencyAnalyzer
+from services.discovery.repo_file_index import RepoFileIndex
+from services.ast_parsing.parse_cache import ParseCache
 
 
 class DependencyAnalyzerFactory:
 
     @staticmethod
-    def get_analyzer(language: str, repo_root: str):
+    def get_analyzer(language: str, repo_root: str, file_index: RepoFileIndex = None,
+                     parse_cache: ParseCache = None, parse_workers: int = None):
 
         if language.lower() == "java":
-            return JavaDependencyAnalyzer(repo_root)
+            return JavaDependencyAnalyzer(repo_root, file_index, parse_cache, parse_workers)
 
         if language.lower() in ["ts", "typescript", "js", "javascript"]:
-            return TSDependencyAnalyzer(repo_root)
+            return TSDependencyAnalyzer(repo_root, file_index, parse_cache, parse_workers)
 
         if language.lower() == "python":
-            return PythonDependencyAnalyzer(repo_root)
+            return PythonDependencyAnalyzer(repo_root, file_index, parse_cache, parse_workers)
 
         raise ValueError("Unsupported language")
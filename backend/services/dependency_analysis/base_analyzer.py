@@ -1,31 +1,80 @@
 import os
+import uuid
+import pickle
+import logging
+import threading
+import multiprocessing
 from abc import ABC, abstractmethod
-from typing import Dict, Set, List
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Set, List
+
+from services.discovery.repo_file_index import RepoFileIndex
+from services.ast_parsing.parse_cache import ParseCache
+from services.dependency_graph.closure_engine import ClosureEngine
+from .config_reference_scanner import ConfigReferenceScanner
+
+logger = logging.getLogger(__name__)
+
+
+# Number of worker processes used to parse source files; 1 (default) parses in-process, 0 uses every core
+DEFAULT_PARSE_WORKERS = int(os.getenv("ANALYSIS_PARSE_WORKERS", "1"))
+
+# Below this many files in-process parsing beats shipping paths and results to
+# the workers (and, on first use, spawning them and importing the parsers)
+PARALLEL_MIN_FILES = int(os.getenv("ANALYSIS_PARALLEL_MIN_FILES", "1000"))
 
 
 class AbstractDependencyAnalyzer(ABC):
 
-    def __init__(self, repo_root: str):
+    # File suffixes parsed by this analyzer
+    SOURCE_EXTENSIONS = ()
+
+    # Parse cache kinds that parse workers send back, so later stages of the
+    # analysis find them in self.parse_cache (picklable values only)
+    SHARED_PARSE_KINDS = ()
+
+    def __init__(self, repo_root: str, file_index: RepoFileIndex = None, parse_cache: ParseCache = None,
+                 parse_workers: int = None):
         self.repo_root = repo_root.replace("\\", "/")
+        self.file_index = file_index if file_index is not None else RepoFileIndex.build(repo_root)
+        self.parse_cache = parse_cache or ParseCache()
+        workers = DEFAULT_PARSE_WORKERS if parse_workers is None else parse_workers
+        self.parse_workers = workers if workers > 0 else (os.cpu_count() or 1)
         self.graph = {}  # file_path -> set(dependencies)
         self.metadata = {}
-        self.config_map = {} # filename -> absolute_path
+        # file_path -> what parse_file left for _resolve_parsed, which runs once
+        # every file of the batch is parsed (e.g. references to other files' types)
+        self.unresolved: Dict[str, Any] = {}
+        self.config_scanner = None  # built from the config files in _index_repo
         self.all_files = [] # List of all absolute paths
+        self._closure_engine = None  # built on first build_dependency_tree call
+        self._worker_state = None  # pickled for the parse workers on first use
 
     def _index_repo(self, source_ext: str):
         """Common indexing logic for source files and config files."""
-        config_exts = [".properties", ".xml", ".json", ".yaml", ".yml", ".env", ".ini", ".toml"]
-        for root, _, files in os.walk(self.repo_root):
-            for file in files:
-                norm_root = root.replace("\\", "/")
-                abs_path = f"{norm_root}/{file}"
-                self.all_files.append(abs_path)
-                
-                # Index config files
-                for ext in config_exts:
-                    if file.endswith(ext):
-                        self.config_map[file] = abs_path
-                        break
+        for entry in self.file_index:
+            self.all_files.append(entry.path)
+
+        self.config_scanner = ConfigReferenceScanner.from_file_index(self.file_index)
+
+    def config_references(self, file_path: str) -> Set[str]:
+        """Config files referenced by string literals of `file_path`, from one byte scan (no parse)."""
+        try:
+            return self.config_scanner.scan(self.parse_cache.read(file_path))
+        except OSError:
+            return set()
+
+    def affects_resolution(self, file_path: str) -> bool:
+        """True if changing `file_path` (e.g. a tsconfig.json) can change how any import resolves."""
+        return False
+
+    def use_previous_analysis(self, nodes: List[dict]):
+        """
+        Dependency nodes (file_path, file_type, package_name, declared_types) of the previous
+        analysis, standing in for files an incremental run does not re-parse.
+        """
+        pass
 
     @abstractmethod
     def analyze(self) -> Dict[str, dict]:
@@ -36,12 +85,133 @@ class AbstractDependencyAnalyzer(ABC):
         pass
 
     @abstractmethod
-    def build_dependency_tree(self, entry_file: str) -> Set[str]:
+    def parse_file(self, file_path: str):
+        """Parse one source file into self.graph / self.metadata."""
+        pass
+
+    def analyze_files(self, file_paths: List[str]) -> Dict[str, dict]:
         """
-        Return transitive closure of dependencies.
+        Parse only `file_paths` (e.g. files changed since the last analysis).
+        Imports are still resolved against the whole repository index.
         """
+        self._parse_files([p for p in file_paths if p.endswith(self.SOURCE_EXTENSIONS)])
+        return self._build_result(file_paths)
+
+    def _parse_files(self, file_paths: List[str]):
+        """Parse `file_paths` in-process, or across `parse_workers` processes when enabled."""
+        self._closure_engine = None
+        if self.parse_workers <= 1 or len(file_paths) < PARALLEL_MIN_FILES:
+            for file_path in file_paths:
+                self.parse_file(file_path)
+            self._resolve_parsed()
+            return
+
+        workers = self.parse_workers
+        chunksize = -(-len(file_paths) // (workers * 4))
+        chunks = [file_paths[i:i + chunksize] for i in range(0, len(file_paths), chunksize)]
+        logger.info(f"[Dependency Analysis] parsing {len(file_paths)} files with {workers} workers")
+
+        # Workers keep one analyzer per analyzer instance (keyed by a token) and send
+        # back only the per-file results and the SHARED_PARSE_KINDS parse cache entries
+        if self._worker_state is None:
+            self._worker_state = (uuid.uuid4().hex, type(self), self.repo_root, pickle.dumps(self.file_index))
+        pool = _parse_pool(workers)
+        try:
+            for results in pool.map(_parse_in_worker, [self._worker_state] * len(chunks), chunks):
+                for file_path, deps, meta, unresolved, parsed in results:
+                    self.graph[file_path] = deps
+                    if meta is not None:
+                        self.metadata[file_path] = meta
+                    if unresolved is not None:
+                        self.unresolved[file_path] = unresolved
+                    self.parse_cache.adopt(file_path, parsed)
+        except BrokenProcessPool:
+            _discard_parse_pool(pool)
+            raise
+        self._resolve_parsed()
+
+    def _resolve_parsed(self):
+        """Complete self.graph from self.unresolved, once the whole batch is parsed."""
         pass
 
+    def _build_result(self, file_paths: List[str] = None) -> Dict[str, dict]:
+        result = {}
+        for file_path in (self.graph if file_paths is None else file_paths):
+            if file_path not in self.graph:
+                continue
+            meta = self.metadata.get(file_path, {})
+            result[file_path] = {
+                "imports": list(self.graph[file_path]),
+                "package": meta.get("package"),
+                "type": meta.get("type", "source"),
+                "declares": meta.get("declares")
+            }
+        return result
+
+    def build_dependency_tree(self, entry_file: str) -> Set[str]:
+        """
+        Return transitive closure of dependencies (entry_file included).
+        """
+        if self._closure_engine is None:
+            self._closure_engine = ClosureEngine(self.graph)
+        return self._closure_engine.closure([entry_file])
+
     def get_graph(self):
         return self.graph
 
+
+
+# ==========================================================
+# Process-pool workers
+# ==========================================================
+
+# Spawned, not forked: the server process holds locks (database pool, parse
+# cache, hashing threads) that a forked child could inherit held. Spawning and
+# importing the parsers takes seconds, so one pool serves every analysis.
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _parse_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared parse pool, (re)created when a different number of workers is asked for."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _discard_parse_pool(pool: ProcessPoolExecutor):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+# (token, analyzer) of the analysis this worker process last parsed for
+_worker_analyzer = (None, None)
+
+
+def _parse_in_worker(state, file_paths):
+    global _worker_analyzer
+    token, analyzer_cls, repo_root, file_index = state
+    if _worker_analyzer[0] != token:
+        _worker_analyzer = (token, analyzer_cls(repo_root, pickle.loads(file_index), parse_workers=1))
+    analyzer = _worker_analyzer[1]
+
+    results = []
+    for file_path in file_paths:
+        analyzer.parse_file(file_path)
+        results.append((
+            file_path,
+            analyzer.graph.pop(file_path, set()),
+            analyzer.metadata.pop(file_path, None),
+            analyzer.unresolved.pop(file_path, None),
+            analyzer.parse_cache.take(file_path, analyzer.SHARED_PARSE_KINDS)
+        ))
+    return results
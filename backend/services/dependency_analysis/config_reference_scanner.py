@@ -0,0 +1,122 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+# Config file suffixes indexed by the dependency analyzers
+CONFIG_EXTENSIONS = (".properties", ".xml", ".json", ".yaml", ".yml", ".env", ".ini", ".toml")
+
+# A reference ends a string literal (see the candidate pattern) and starts it,
+# or follows a path separator or scheme ("classpath:app.properties")
+_LEFT_BOUNDARY = frozenset(b"\"'`/\\:")
+
+
+class ConfigReferenceScanner:
+    """
+    Aho-Corasick automaton over the names and repo-relative paths of config
+    files, so config references are found in raw source bytes without a parse.
+
+    Every path suffix starting at a "/" is a key: src/test/resources/config/app.properties
+    is found as "app.properties", "config/app.properties", "resources/config/app.properties"
+    and so on. A match counts only when it ends right before a quote and starts
+    at a path boundary; the longest such key at each position wins. Keys shared
+    by several files (same name in different directories) resolve to the file
+    indexed last, like the former filename lookup.
+    """
+
+    def __init__(self, configs: Iterable[Tuple[str, str]]):
+        """`configs`: (rel_path, abs_path) pairs, in index order."""
+        targets: Dict[bytes, str] = {}
+        for rel_path, abs_path in configs:
+            parts = rel_path.replace("\\", "/").split("/")
+            for i in range(len(parts)):
+                targets["/".join(parts[i:]).encode()] = abs_path
+
+        self._goto: List[Dict[int, int]] = [{}]
+        self._depth: List[int] = [0]
+        self._target: List[str] = [None]
+        self._build(targets)
+        self.max_key_length = max((len(k) for k in targets), default=0)
+
+        # Candidate ends: a config suffix right before a closing quote. Only
+        # those windows are run through the automaton.
+        suffixes = {k[k.rfind(b"."):] if b"." in k else k for k in targets}
+        self._candidates = re.compile(
+            rb"(?:" + b"|".join(re.escape(s) for s in sorted(suffixes)) + rb")(?=[\"'`])"
+        ) if suffixes else None
+
+    @classmethod
+    def from_file_index(cls, file_index, paths: Set[str] = None) -> "ConfigReferenceScanner":
+        """Scanner over the config files of `file_index` (optionally only `paths`)."""
+        return cls(
+            (e.rel_path, e.path) for e in file_index
+            if e.name.endswith(CONFIG_EXTENSIONS) and (paths is None or e.path in paths)
+        )
+
+    # ----------------------------------------------------------
+    # Construction
+    # ----------------------------------------------------------
+
+    def _build(self, targets: Dict[bytes, str]):
+        goto, depth, target = self._goto, self._depth, self._target
+        for key, abs_path in targets.items():
+            state = 0
+            for byte in key:
+                nxt = goto[state].get(byte)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][byte] = nxt
+                    goto.append({})
+                    depth.append(depth[state] + 1)
+                    target.append(None)
+                state = nxt
+            target[state] = abs_path
+
+        # Failure links breadth-first (depth-1 states fail to the root);
+        # `output` skips to the next state on the failure chain that ends a key
+        fail = [0] * len(goto)
+        output = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for byte, nxt in goto[state].items():
+                f = fail[state]
+                while f and byte not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(byte, 0)
+                output[nxt] = fail[nxt] if target[fail[nxt]] is not None else output[fail[nxt]]
+                queue.append(nxt)
+        self._fail = fail
+        self._output = output
+
+    # ----------------------------------------------------------
+    # Scanning
+    # ----------------------------------------------------------
+
+    def scan(self, source: bytes) -> Set[str]:
+        """Absolute paths of the config files referenced in `source`."""
+        found = set()
+        if self._candidates is None:
+            return found
+
+        goto, fail, output = self._goto, self._fail, self._output
+        depth, target = self._depth, self._target
+        for m in self._candidates.finditer(source):
+            end = m.end()
+            # Any key ending at `end` starts within the last max_key_length bytes
+            state = 0
+            for byte in source[max(0, end - self.max_key_length):end]:
+                while state and byte not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(byte, 0)
+
+            # Longest key ending at `end` first
+            if target[state] is None:
+                state = output[state]
+            while state:
+                start = end - depth[state]
+                if start > 0 and source[start - 1] in _LEFT_BOUNDARY:
+                    found.add(target[state])
+                    break
+                state = output[state]
+        return found
@@ -1,36 +1,41 @@
 import os
 from pathlib import Path
-import javalang
+from typing import Dict, List
 from .base_analyzer import AbstractDependencyAnalyzer
+from services.ast_parsing.java_frontend import parse_java_summary
+from services.ast_parsing.parse_cache import JAVA_SUMMARY_JAVALANG, JAVA_SUMMARY_TREE_SITTER
+from services.dependency_resolution.java_symbol_index import JavaFileSymbols, JavaSymbolIndex
 
 
 class JavaDependencyAnalyzer(AbstractDependencyAnalyzer):
 
-    def __init__(self, repo_root: str):
-        super().__init__(repo_root)
-        self.java_map = {}   # ClassName -> AbsolutePath (first match, for import resolution)
-        self._index_repo(".java")
-
-    def _index_repo(self, source_ext: str):
-        """Index Java files for class resolution and config files."""
-        super()._index_repo(source_ext)
-        for abs_path in self.all_files:
-            if abs_path.endswith(".java"):
-                class_name = os.path.basename(abs_path).replace(".java", "")
-                if class_name not in self.java_map:
-                    self.java_map[class_name] = abs_path
+    SOURCE_EXTENSIONS = (".java",)
+    # Assertion detection reads the same summaries after dependency analysis
+    SHARED_PARSE_KINDS = (JAVA_SUMMARY_TREE_SITTER, JAVA_SUMMARY_JAVALANG)
 
+    def __init__(self, repo_root: str, file_index=None, parse_cache=None, parse_workers=None):
+        super().__init__(repo_root, file_index, parse_cache, parse_workers)
+        # file_path -> declarations of every file parsed so far, or known from the previous analysis
+        self.symbols: Dict[str, JavaFileSymbols] = {}
+        # Rebuilt from self.symbols after each parse batch, so no file is parsed just to index it
+        self.symbol_index = JavaSymbolIndex()
+        self._index_repo(".java")
 
-    def is_test_file(self, tree, file_path_str: str):
+    def use_previous_analysis(self, nodes: List[dict]):
+        for node in nodes:
+            path = node["file_path"]
+            if path.endswith(".java") and path not in self.symbols:
+                self.symbols[path] = (
+                    JavaFileSymbols.unparsed(path) if node["file_type"] == "unknown"
+                    else JavaFileSymbols(node["package_name"], node["declared_types"].split(",")
+                                         if node.get("declared_types") else [os.path.basename(path)[:-len(".java")]], ())
+                )
+
+    def is_test_file(self, summary, file_path_str: str):
         """Check if a file is a test file using annotations or naming convention."""
-        try:
-            for _, node in tree.filter(javalang.tree.MethodDeclaration):
-                for annotation in node.annotations:
-                    if annotation.name == "Test":
-                        return True
-        except Exception:
-            pass
-            
+        if summary.has_test_method:
+            return True
+
         if "Test" in os.path.basename(file_path_str):
             return True
         return False
@@ -38,85 +43,55 @@ class JavaDependencyAnalyzer(AbstractDependencyAnalyzer):
     def analyze(self):
         """Analyze all Java files to build the dependency graph."""
         # Parse ALL Java files
-        for file_path in self.all_files:
-            if file_path.endswith(".java"):
-                self.parse_file(file_path)
+        self._parse_files([p for p in self.all_files if p.endswith(self.SOURCE_EXTENSIONS)])
 
         # Build final result format
-        result = {}
-        for file_path, deps in self.graph.items():
-            meta = self.metadata.get(file_path, {})
-            result[file_path] = {
-                "imports": list(deps),
-                "package": meta.get("package"),
-                "type": meta.get("type", "source")
-            }
-        return result
+        return self._build_result()
 
     def parse_file(self, file_path):
         """Parse a single Java file to extract imports and config references."""
+        # 1. String literal references to config files (e.g. "application.properties")
+        self.graph[file_path] = self.config_references(file_path)
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                code = f.read()
-            
-            tree = javalang.parse.parse(code)
-            
-            package_name = tree.package.name if tree.package else None
-            file_type = "test" if self.is_test_file(tree, file_path) else "source"
-            
+            summary = parse_java_summary(self.parse_cache, file_path)
+
+            package_name = summary.package
+            file_type = "test" if self.is_test_file(summary, file_path) else "source"
+            symbols = JavaFileSymbols.from_summary(file_path, summary)
+
             self.metadata[file_path] = {
                 "package": package_name,
-                "type": file_type
+                "type": file_type,
+                "declares": symbols.type_names
             }
 
-            deps = set()
-            
-            # 1. Standard imports
-            for imp in tree.imports:
-                resolved = self.resolve_import(imp.path)
-                if resolved:
-                    deps.add(resolved)
-
-            # 2. String literal references to config files (e.g. "application.properties")
-            try:
-                for _, node in tree.filter(javalang.tree.Literal):
-                    if isinstance(node.value, str):
-                        # Strip quotes and check if it matches any indexed config file
-                        val = node.value.strip('"').strip("'")
-                        if val in self.config_map:
-                            deps.add(self.config_map[val])
-            except Exception:
-                # AST might fail on some complex literals, ignore and continue
-                pass
-
-            self.graph[file_path] = deps
-            
+            # 2. Imports and same-package references, resolved once every file is parsed
+            self.unresolved[file_path] = symbols
+
         except Exception:
-            # If parsing fails for one file, still include it in graph with empty deps
-            self.graph[file_path] = set()
+            # If parsing fails for one file, still include it in graph with its config references
+            self.unresolved[file_path] = JavaFileSymbols.unparsed(file_path)
             if file_path not in self.metadata:
                 self.metadata[file_path] = {
                     "package": None,
                     "type": "unknown"
                 }
 
-    def resolve_import(self, import_path):
-        """Resolve a package-style import to an absolute file path."""
-        class_name = import_path.split(".")[-1]
-        return self.java_map.get(class_name)
-
-    def build_dependency_tree(self, entry_file):
-        """Transitive closure traversal."""
-        visited = set()
-        stack = [entry_file]
+    def _resolve_parsed(self):
+        """Index the declarations of every known file, then resolve the files parsed in this batch."""
+        parsed, self.unresolved = self.unresolved, {}
+        self.symbols.update(parsed)
 
-        while stack:
-            current = stack.pop()
-            if current in visited:
-                continue
+        # In file index order, so duplicate names resolve as they always have
+        self.symbol_index = JavaSymbolIndex()
+        for path in self.file_index.paths(".java"):
+            symbols = self.symbols.get(path)
+            if symbols is not None:
+                self.symbol_index.add_file(path, symbols)
 
-            visited.add(current)
-            for dep in self.graph.get(current, []):
-                stack.append(dep)
+        for path, symbols in parsed.items():
+            self.graph[path] |= self.symbol_index.resolve_references(path, symbols)
 
-        return visited
+    def resolve_import(self, import_path):
+        """Resolve a fully-qualified import to an absolute file path."""
+        return self.symbol_index.resolve_type(import_path)
@@ -1,97 +1,58 @@
 import os
-from pathlib import Path
-from tree_sitter import Language, Parser
-import tree_sitter_typescript as ts_ts
+from tree_sitter import Parser
+from tree_sitter_languages import get_language
 from .base_analyzer import AbstractDependencyAnalyzer
+from services.ast_parsing.parse_cache import TREE_SITTER_TYPESCRIPT
+from services.ast_parsing.tree_sitter_queries import captures, node_text
+from services.dependency_resolution.ts_module_resolver import TSModuleResolver
 
 
 class TSDependencyAnalyzer(AbstractDependencyAnalyzer):
 
-    def __init__(self, repo_root):
-        super().__init__(repo_root)
-        self.parser = Parser(Language(ts_ts.language_typescript()))
+    SOURCE_EXTENSIONS = (".ts", ".js", ".tsx", ".jsx")
+
+    def __init__(self, repo_root, file_index=None, parse_cache=None, parse_workers=None):
+        super().__init__(repo_root, file_index, parse_cache, parse_workers)
+        self.parser = Parser()
+        self.parser.set_language(get_language("typescript"))
         self._index_repo(".ts")
+        self.module_resolver = TSModuleResolver(self.file_index, self.parse_cache)
+
+    def affects_resolution(self, file_path: str) -> bool:
+        name = os.path.basename(file_path)
+        return name == "package.json" or (name.startswith("tsconfig") and name.endswith(".json"))
 
     def analyze(self):
-        for file_path in self.all_files:
-            if file_path.endswith((".ts", ".js", ".tsx", ".jsx")):
-                self.parse_file(file_path)
+        self._parse_files([p for p in self.all_files if p.endswith(self.SOURCE_EXTENSIONS)])
 
-        result = {}
-        for file_path, imports in self.graph.items():
-            meta = self.metadata.get(file_path, {})
-            result[file_path] = {
-                "imports": list(imports),
-                "package": None,
-                "type": meta.get("type", "source")
-            }
-        return result
+        return self._build_result()
 
     def parse_file(self, file_path):
+        config_refs = self.config_references(file_path)
         try:
-            code = Path(file_path).read_text(encoding="utf-8")
-            tree = self.parser.parse(bytes(code, "utf-8"))
+            code = self.parse_cache.read(file_path)
+            tree = self.parse_cache.parse(file_path, TREE_SITTER_TYPESCRIPT, self.parser.parse)
 
             file_type = "test" if any(x in file_path.lower() for x in [".test.", ".spec.", "tests/"]) else "source"
             self.metadata[file_path] = {"type": file_type}
 
-            deps = set()
-            
-            # recursive traversal for tree-sitter
-            stack = [tree.root_node]
-            while stack:
-                node = stack.pop()
-                
-                # 1. Standard imports
-                if node.type == "import_statement":
-                    text = code[node.start_byte:node.end_byte]
-                    if "from" in text:
-                        try:
-                            module = text.split("from")[1].strip().strip(";").strip().strip('"').strip("'")
-                            resolved = self.resolve_import(file_path, module)
-                            if resolved: deps.add(resolved)
-                        except: pass
-                
-                # 2. Config string literals
-                elif node.type == "string":
-                    # Get value without quotes
-                    val = code[node.start_byte:node.end_byte].strip('"').strip("'").strip("`")
-                    if val in self.config_map:
-                        deps.add(self.config_map[val])
-                
-                for child in node.children:
-                    stack.append(child)
+            # Config string literals
+            deps = set(config_refs)
+
+            for node, capture in captures("typescript", tree.root_node, "imports"):
+
+                # Standard imports
+                if capture == "import.source":
+                    module = node_text(code, node).strip('"').strip("'")
+                    resolved = self.resolve_import(file_path, module)
+                    if resolved: deps.add(resolved)
 
             self.graph[file_path] = deps
         except:
-            self.graph[file_path] = set()
+            self.graph[file_path] = config_refs
             self.metadata[file_path] = {"type": "unknown"}
 
     def resolve_import(self, from_file, import_path):
-        if not import_path.startswith("."):
-            return None
-
-        # Absolute paths (if already resolved)
-        if os.path.isabs(import_path):
-            return import_path.replace("\\", "/")
-
-        base = Path(from_file).parent
-        full = (base / import_path).resolve()
-
-        for ext in [".ts", ".js", ".tsx", ".jsx", "/index.ts", "/index.js"]:
-            candidate = Path(str(full) + ext)
-            if candidate.exists():
-                return str(candidate).replace("\\", "/")
-
-        return None
-
-    def build_dependency_tree(self, entry_file):
-        visited = set()
-        stack = [entry_file]
-        while stack:
-            current = stack.pop()
-            if current in visited: continue
-            visited.add(current)
-            stack.extend(self.graph.get(current, []))
-        return visited
+        """Relative, tsconfig-aliased or local-package import, resolved without touching the filesystem."""
+        return self.module_resolver.resolve(from_file, import_path)
 
@@ -0,0 +1,175 @@
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+
+class ClosureEngine:
+    """
+    Answers transitive-closure queries over a dependency graph {file: {deps}}.
+
+    The graph is condensed once into strongly connected components (iterative
+    Tarjan). Components come out in reverse topological order, so the
+    reachability of every component is computed bottom-up as a bitset (a
+    Python int) from its successors' bitsets. Only components that something
+    depends on get a bit, so the many test classes nothing imports do not
+    widen every bitset. Materialized closures are memoized per component, so
+    features sharing the same page objects and utilities reuse the same work.
+
+    The graph must not change after the engine is built.
+    """
+
+    def __init__(self, graph: Dict[str, Iterable[str]]):
+        self.graph = graph
+        self._comp_of: Dict[str, int] = {}
+        self._components: List[List[str]] = []
+        self._bit_members: List[List[str]] = []  # bit position -> members of its component
+        self._reach: List[int] = []    # component -> bits reachable with 0+ edges (itself included)
+        self._strict: List[int] = []   # component -> bits reachable with 1+ edges
+        self._strict_sets: Dict[int, FrozenSet[str]] = {}
+        self._reach_sets: Dict[int, FrozenSet[str]] = {}
+
+        self._condense()
+        self._compute_reachability()
+
+    # ----------------------------------------------------------
+    # Queries
+    # ----------------------------------------------------------
+
+    def reachable(self, node: str) -> FrozenSet[str]:
+        """Files reachable from `node` through at least one edge (`node` only if it is on a cycle)."""
+        c = self._comp_of.get(node)
+        if c is None:
+            return frozenset()
+        result = self._strict_sets.get(c)
+        if result is None:
+            result = self._strict_sets[c] = self._decode(self._strict[c])
+        return result
+
+    def closure(self, nodes: Iterable[str]) -> Set[str]:
+        """`nodes` plus every file reachable from any of them."""
+        nodes = set(nodes)
+        bits = 0
+        comps = set()
+        for node in nodes:
+            c = self._comp_of.get(node)
+            if c is not None:
+                comps.add(c)
+                bits |= self._reach[c]
+
+        # Components without a bit (nothing depends on them) are added through `nodes`
+        if len(comps) == 1:
+            c = next(iter(comps))
+            result = self._reach_sets.get(c)
+            if result is None:
+                result = self._reach_sets[c] = self._decode(bits)
+            return set(result) | nodes
+
+        return set(self._decode(bits)) | nodes
+
+    def component_count(self) -> int:
+        return len(self._components)
+
+    # ----------------------------------------------------------
+    # Construction
+    # ----------------------------------------------------------
+
+    def _successors(self, node: str):
+        return self.graph.get(node, ())
+
+    def _condense(self):
+        """Iterative Tarjan; appends components in reverse topological order."""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        counter = 0
+
+        nodes = list(self.graph)
+        for deps in list(self.graph.values()):
+            nodes.extend(deps)
+
+        for root in nodes:
+            if root in index:
+                continue
+
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self._successors(root)))]
+
+            while work:
+                v, successors = work[-1]
+                descended = False
+                for w in successors:
+                    if w not in index:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack.add(w)
+                        work.append((w, iter(self._successors(w))))
+                        descended = True
+                        break
+                    if w in on_stack and index[w] < low[v]:
+                        low[v] = index[w]
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+
+                if low[v] == index[v]:
+                    comp_id = len(self._components)
+                    members = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        self._comp_of[w] = comp_id
+                        members.append(w)
+                        if w == v:
+                            break
+                    self._components.append(members)
+
+    def _compute_reachability(self):
+        successors: List[Set[int]] = []
+        cyclic: List[bool] = []
+        has_pred = set()
+        for c, members in enumerate(self._components):
+            succ = set()
+            is_cyclic = len(members) > 1
+            for v in members:
+                for w in self._successors(v):
+                    d = self._comp_of[w]
+                    if d == c:
+                        is_cyclic = True
+                    else:
+                        succ.add(d)
+            successors.append(succ)
+            cyclic.append(is_cyclic)
+            has_pred |= succ
+
+        # Successor components always have a smaller id, so one forward pass suffices
+        for c, members in enumerate(self._components):
+            own = 0
+            if c in has_pred or cyclic[c]:
+                own = 1 << len(self._bit_members)
+                self._bit_members.append(members)
+
+            strict = 0
+            for d in successors[c]:
+                strict |= self._reach[d]
+            if cyclic[c]:
+                strict |= own
+            self._strict.append(strict)
+            self._reach.append(strict | own)
+
+    def _decode(self, bits: int) -> FrozenSet[str]:
+        result = []
+        # Reversed binary string: character i is bit i
+        digits = bin(bits)[:1:-1]
+        i = digits.find("1")
+        while i != -1:
+            result.extend(self._bit_members[i])
+            i = digits.find("1", i + 1)
+        return frozenset(result)
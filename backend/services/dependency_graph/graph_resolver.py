@@ -1,18 +1,11 @@
+from services.dependency_graph.closure_engine import ClosureEngine
+
+
 class DependencyResolver:
 
     def __init__(self, graph):
         self.graph = graph
+        self.engine = ClosureEngine(graph)
 
     def resolve_closure(self, start_file: str):
-        visited = set()
-        stack = [start_file]
-
-        while stack:
-            current = stack.pop()
-
-            for dep in self.graph.get(current, []):
-                if dep not in visited:
-                    visited.add(dep)
-                    stack.append(dep)
-
-        return visited
+        return self.engine.reachable(start_file)
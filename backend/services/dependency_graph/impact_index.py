@@ -0,0 +1,35 @@
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+
+class ImpactIndex:
+    """
+    Reverse-reachability index of one session: {file: ids of the features whose
+    test file or dependency closure contains it}.
+
+    Feature closures are already stored per feature, so inverting them once
+    answers "which features does this change affect?" with one dictionary
+    lookup per changed file, without walking the reverse graph.
+    """
+
+    def __init__(self, feature_files: Iterable[Tuple[str, str]]):
+        """feature_files = [(feature_id, file_path)]"""
+        index: Dict[str, Set[str]] = defaultdict(set)
+        for feature_id, path in feature_files:
+            index[path].add(feature_id)
+        self._index: Dict[str, FrozenSet[str]] = {p: frozenset(ids) for p, ids in index.items()}
+
+    def affected(self, paths: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """(sorted ids of the affected features, paths no feature depends on)."""
+        features: Set[str] = set()
+        unmatched = []
+        for path in paths:
+            ids = self._index.get(path)
+            if ids is None:
+                unmatched.append(path)
+            else:
+                features |= ids
+        return sorted(features), unmatched
+
+    def __len__(self) -> int:
+        return len(self._index)
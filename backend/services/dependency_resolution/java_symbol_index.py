@@ -0,0 +1,131 @@
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+from services.ast_parsing.java_frontend import parse_java_summary
+from services.ast_parsing.parse_cache import ParseCache
+from services.discovery.repo_file_index import RepoFileIndex
+
+
+class JavaFileSymbols:
+    """
+    What indexing and resolving one Java file needs from its parse: small,
+    so parse workers can send it back instead of the summary. `imports` is
+    None for a file that could not be parsed.
+    """
+
+    __slots__ = ("package", "type_names", "imports", "referenced")
+
+    def __init__(self, package: Optional[str], type_names: List[str], imports=None, referenced: Set[str] = frozenset()):
+        self.package = package
+        self.type_names = type_names
+        self.imports = imports
+        self.referenced = referenced
+
+    @classmethod
+    def from_summary(cls, path: str, summary) -> "JavaFileSymbols":
+        # The file name is the primary (public) type; other declarations rank after it
+        return cls(summary.package, [_stem(path)] + [c.name for c in summary.classes],
+                   summary.imports, summary.type_references)
+
+    @classmethod
+    def unparsed(cls, path: str) -> "JavaFileSymbols":
+        return cls(None, [_stem(path)])
+
+
+def _stem(path: str) -> str:
+    return os.path.basename(path)[:-len(".java")]
+
+
+class JavaSymbolIndex:
+    """
+    Fully-qualified Java type names mapped to the files declaring them, built
+    from the package and class declarations of every Java file.
+
+    Resolution follows Java's shadowing order: single-type imports, then
+    types of the file's own package, then on-demand (wildcard) imports.
+    Every lookup is a dict access, so resolving a file costs O(imports +
+    referenced names) whatever the size of the repository.
+    """
+
+    def __init__(self):
+        self.types: Dict[str, str] = {}                # "com.acme.pages.LoginPage" -> path
+        self.packages: Dict[str, Dict[str, str]] = {}  # "com.acme.pages" -> {"LoginPage": path}
+        self.unindexed: Dict[str, str] = {}            # simple name -> path, for files that failed to parse
+
+    @classmethod
+    def build(cls, file_index: RepoFileIndex, parse_cache: ParseCache = None) -> "JavaSymbolIndex":
+        """Index of every Java file of `file_index`, parsed here (see JavaDependencyAnalyzer for the parse-once path)."""
+        parse_cache = parse_cache or ParseCache()
+        index = cls()
+        for path in file_index.paths(".java"):
+            try:
+                symbols = JavaFileSymbols.from_summary(path, parse_java_summary(parse_cache, path))
+            except Exception:
+                symbols = JavaFileSymbols.unparsed(path)
+            index.add_file(path, symbols)
+        return index
+
+    def add_file(self, path: str, symbols: JavaFileSymbols):
+        if symbols.imports is None:
+            self.unindexed.setdefault(_stem(path), path)
+        else:
+            self.add(path, symbols.package, symbols.type_names)
+
+    def add(self, path: str, package: Optional[str], type_names: Iterable[str]):
+        members = self.packages.setdefault(package or "", {})
+        for name in type_names:
+            self.types.setdefault(f"{package}.{name}" if package else name, path)
+            members.setdefault(name, path)
+
+    # ----------------------------------------------------------
+    # Resolution
+    # ----------------------------------------------------------
+
+    def resolve_type(self, name: str) -> Optional[str]:
+        """
+        File declaring the fully-qualified `name`. Nested types and static
+        members (a.b.Outer.Inner, a.b.Util.method) resolve to the file of the
+        outermost indexed type.
+        """
+        path = self.types.get(name)
+        while path is None and "." in name:
+            name = name.rsplit(".", 1)[0]
+            path = self.types.get(name)
+        return path
+
+    def resolve_references(self, file_path: str, symbols: JavaFileSymbols) -> Set[str]:
+        """
+        Files `file_path` depends on through its imports (single-type, static
+        and wildcard) and its references to types of its own package.
+        """
+        deps = set()
+        imported = set()        # simple names bound by single-type imports
+        on_demand = []          # packages imported with a wildcard
+
+        for imp in symbols.imports or ():
+            if imp.wildcard and not imp.static and imp.path in self.packages:
+                on_demand.append(self.packages[imp.path])
+                continue
+
+            # import a.b.C; import static a.b.C.m; import static a.b.C.*; import a.b.Outer.*;
+            target = self.resolve_type(imp.path)
+            if target is None and not imp.wildcard:
+                target = self.unindexed.get(imp.path.rsplit(".", 1)[-1])
+            if target:
+                deps.add(target)
+            if not imp.wildcard:
+                imported.add(imp.path.rsplit(".", 1)[-1])
+
+        own_package = self.packages.get(symbols.package or "", {})
+        for name in symbols.referenced - imported:
+            target = own_package.get(name)
+            if target is None:
+                for members in on_demand:
+                    target = members.get(name)
+                    if target:
+                        break
+            if target:
+                deps.add(target)
+
+        deps.discard(file_path)
+        return deps
@@ -1,14 +1,25 @@
 import os
 from typing import Optional
 
+from services.ast_parsing.parse_cache import ParseCache
+from services.discovery.repo_file_index import RepoFileIndex
+from services.dependency_resolution.java_symbol_index import JavaSymbolIndex
+from services.dependency_resolution.ts_module_resolver import TSModuleResolver
+from services.dependency_resolution.python_module_index import PythonModuleIndex
+
 
 class PathResolver:
     """
     Resolves import strings to actual repository-relative file paths.
     """
 
-    def __init__(self, repo_root: str):
+    def __init__(self, repo_root: str, file_index: RepoFileIndex = None, parse_cache: ParseCache = None):
         self.repo_root = repo_root
+        self.file_index = file_index
+        self.parse_cache = parse_cache
+        self._java_index = None  # built on the first Java import
+        self._ts_resolver = None  # built on the first TypeScript import
+        self._python_index = None  # built on the first Python import
 
     # ---------------------------------------------------------
     # PUBLIC ENTRY
@@ -33,16 +44,17 @@ class PathResolver:
 
     def _resolve_ts(self, import_path: str, current_file: str) -> Optional[str]:
 
-        # Handle relative imports: ./ or ../
-        if import_path.startswith("."):
+        # Relative imports, tsconfig paths/baseUrl aliases and local packages,
+        # answered from the file index; anything else is an external lib
 
-            base_dir = os.path.dirname(current_file)
-            full_path = os.path.normpath(os.path.join(base_dir, import_path))
+        if self._ts_resolver is None:
+            self._ts_resolver = TSModuleResolver(self._get_file_index(), self.parse_cache)
 
-            return self._find_existing_file(full_path)
+        abs_path = self._ts_resolver.resolve(os.path.join(self.file_index.repo_root, current_file), import_path)
+        if abs_path is None:
+            return None
 
-        # Non-relative → likely external lib
-        return None
+        return os.path.relpath(abs_path, self.file_index.repo_root)
 
     # ---------------------------------------------------------
     # PYTHON
@@ -50,17 +62,17 @@ class PathResolver:
 
     def _resolve_python(self, import_path: str) -> Optional[str]:
 
-        # Convert module path to file path
-        # e.g., utils.helper → utils/helper.py
+        # Look the dotted module up in the module index
+        # e.g., shop.utils.helper → src/shop/utils/helper.py
 
-        file_path = import_path.replace(".", os.sep) + ".py"
+        if self._python_index is None:
+            self._python_index = PythonModuleIndex(self._get_file_index(), self.parse_cache)
 
-        abs_path = os.path.join(self.repo_root, file_path)
+        abs_path = self._python_index.lookup(import_path)
+        if abs_path is None:
+            return None
 
-        if os.path.exists(abs_path):
-            return file_path
-
-        return None
+        return os.path.relpath(abs_path, self.file_index.repo_root)
 
     # ---------------------------------------------------------
     # JAVA
@@ -68,37 +80,24 @@ class PathResolver:
 
     def _resolve_java(self, import_path: str) -> Optional[str]:
 
-        # Convert package path to file path
+        # Look the fully-qualified name up in the symbol index
         # e.g., com.project.utils.Helper
-        # → com/project/utils/Helper.java
+        # → src/main/java/com/project/utils/Helper.java
 
-        file_path = import_path.replace(".", os.sep) + ".java"
+        if self._java_index is None:
+            self._java_index = JavaSymbolIndex.build(self._get_file_index(), self.parse_cache)
 
-        for root, _, files in os.walk(self.repo_root):
-            if file_path in [os.path.join(root, f).replace(self.repo_root + os.sep, "")
-                             for f in files]:
-                return file_path
+        abs_path = self._java_index.resolve_type(import_path)
+        if abs_path is None:
+            return None
 
-        return None
+        return os.path.relpath(abs_path, self.file_index.repo_root)
 
     # ---------------------------------------------------------
-    # File existence resolution
+    # Repository index
     # ---------------------------------------------------------
 
-    def _find_existing_file(self, base_path: str) -> Optional[str]:
-
-        extensions = [".ts", ".tsx", ".js", ".jsx"]
-
-        for ext in extensions:
-            candidate = base_path + ext
-            abs_path = os.path.join(self.repo_root, candidate)
-            if os.path.exists(abs_path):
-                return candidate
-
-        # Handle index.ts resolution
-        index_candidate = os.path.join(base_path, "index.ts")
-        abs_index = os.path.join(self.repo_root, index_candidate)
-        if os.path.exists(abs_index):
-            return index_candidate
-
-        return None
+    def _get_file_index(self) -> RepoFileIndex:
+        if self.file_index is None:
+            self.file_index = RepoFileIndex.build(self.repo_root)
+        return self.file_index
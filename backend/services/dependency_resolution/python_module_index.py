@@ -0,0 +1,236 @@
+import ast
+import posixpath
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from services.ast_parsing.parse_cache import ParseCache, PYTHON_AST, parse_python
+from services.discovery.repo_file_index import RepoFileIndex
+
+
+# Directories conventionally holding importable packages (src/ layout)
+SOURCE_ROOTS = ("src",)
+
+
+def is_pytest_module(path: str) -> bool:
+    """Test modules and conftest.py files, whose fixture requests pytest resolves through conftest.py."""
+    name = posixpath.basename(path)
+    return name == "conftest.py" or (name.startswith("test_") and name.endswith(".py")) or name.endswith("_test.py")
+
+
+class PythonModuleIndex:
+    """
+    Dotted module names mapped to files, built once from the file index.
+
+    A file is known by its package-qualified name (climbing __init__.py
+    directories), by its name under a src/ directory and by its name
+    relative to the repository root, in that priority. Imports are resolved
+    the way pytest's default (prepend) import mode sees them: the importing
+    file's basedir (first directory up without __init__.py) comes first,
+    then these names. Every lookup is a set or dict access.
+    """
+
+    def __init__(self, file_index: RepoFileIndex, parse_cache: ParseCache = None):
+        self.repo_root = file_index.repo_root
+        self.parse_cache = parse_cache or ParseCache()
+        self.files: Set[str] = set(file_index.paths(".py"))
+        self.modules: Dict[str, str] = {}
+        self._fixtures: Dict[str, Tuple[Set[str], bool]] = {}
+
+        ranked: List[Tuple[int, str, str]] = []
+        for path in sorted(self.files):
+            for rank, name in enumerate(self._names(path)):
+                ranked.append((rank, name, path))
+        for _, name, path in sorted(ranked, key=lambda r: r[0]):
+            self.modules.setdefault(name, path)
+
+    def _names(self, path: str) -> Iterable[str]:
+        parts = path[len(self.repo_root) + 1:-len(".py")].split("/")
+        if parts[-1] == "__init__":
+            parts.pop()
+        if not parts:
+            return
+
+        # Package-qualified: the parts below the first directory without __init__.py
+        if f"{posixpath.dirname(path)}/__init__.py" in self.files:
+            base = self.basedir(path)
+            depth = base[len(self.repo_root) + 1:].count("/") + 1 if base != self.repo_root else 0
+            yield ".".join(parts[depth:])
+
+        for i, part in enumerate(parts[:-1]):
+            if part in SOURCE_ROOTS:
+                yield ".".join(parts[i + 1:])
+        yield ".".join(parts)
+
+    def basedir(self, path: str) -> str:
+        """First directory above `path` without __init__.py (where pytest puts the module on sys.path)."""
+        directory = posixpath.dirname(path)
+        while f"{directory}/__init__.py" in self.files and len(directory) > len(self.repo_root):
+            directory = posixpath.dirname(directory)
+        return directory
+
+    # ----------------------------------------------------------
+    # Imports
+    # ----------------------------------------------------------
+
+    def lookup(self, module: str) -> Optional[str]:
+        """File of the dotted `module` (module file or package __init__.py)."""
+        return self.modules.get(module)
+
+    def resolve_module(self, from_file: str, module: str) -> Optional[str]:
+        """File that `import module` in `from_file` loads (its packages excluded)."""
+        return self._resolve_absolute(from_file, module)[0]
+
+    def resolve(self, from_file: str, module: Optional[str], level: int = 0, names: Iterable[str] = ()) -> Set[str]:
+        """
+        Files imported by `import module` (level 0, no names) or
+        `from <level dots>module import names`, including the __init__.py of
+        every package on the way.
+        """
+        if level:
+            directory = posixpath.dirname(from_file)
+            for _ in range(level - 1):
+                directory = posixpath.dirname(directory)
+            target = self._under(directory, module.split(".") if module else [])
+            found = self._with_packages(target, directory)
+        else:
+            target, found = self._resolve_absolute(from_file, module)
+
+        # `from pkg import name` may import the submodule pkg/name.py
+        if target is not None and target.endswith("/__init__.py"):
+            package_dir = posixpath.dirname(target)
+            for name in names:
+                sub = self._under(package_dir, [name])
+                if sub is not None:
+                    found.add(sub)
+        return found
+
+    def _resolve_absolute(self, from_file: str, module: str) -> Tuple[Optional[str], Set[str]]:
+        """(module file, module file and its packages' __init__.py files)"""
+        parts = module.split(".")
+        basedir = self.basedir(from_file)
+        target = self._under(basedir, parts)
+        if target is not None:
+            return target, self._with_packages(target, basedir)
+
+        target = self.modules.get(module)
+        if target is None:
+            return None, set()
+        found = {target}
+        for i in range(1, len(parts)):
+            parent = self.modules.get(".".join(parts[:i]))
+            if parent is not None and parent.endswith("/__init__.py"):
+                found.add(parent)
+        return target, found
+
+    def _under(self, directory: str, parts: List[str]) -> Optional[str]:
+        base = "/".join([directory] + parts)
+        if parts and f"{base}.py" in self.files:
+            return f"{base}.py"
+        if f"{base}/__init__.py" in self.files:
+            return f"{base}/__init__.py"
+        return None
+
+    def _with_packages(self, target: Optional[str], top: str) -> Set[str]:
+        """`target` plus the __init__.py of each package between it and `top`."""
+        if target is None:
+            return set()
+        found = {target}
+        directory = posixpath.dirname(target)
+        while len(directory) > len(top):
+            init = f"{directory}/__init__.py"
+            if init in self.files:
+                found.add(init)
+            directory = posixpath.dirname(directory)
+        return found
+
+    # ----------------------------------------------------------
+    # pytest fixtures
+    # ----------------------------------------------------------
+
+    def conftest_chain(self, path: str) -> List[str]:
+        """conftest.py files visible to `path`, innermost first (its own excluded)."""
+        chain = []
+        directory = posixpath.dirname(path)
+        while True:
+            conftest = f"{directory}/conftest.py"
+            if conftest in self.files and conftest != path:
+                chain.append(conftest)
+            if directory == self.repo_root or len(directory) <= len(self.repo_root):
+                break
+            directory = posixpath.dirname(directory)
+        return chain
+
+    def fixture_dependencies(self, path: str, tree: ast.AST) -> Set[str]:
+        """
+        conftest.py files providing fixtures requested in `tree` (test and
+        fixture arguments, @pytest.mark.usefixtures), resolved innermost
+        first as pytest overrides them, plus every visible conftest with an
+        autouse fixture.
+        """
+        chain = self.conftest_chain(path)
+        if not chain:
+            return set()
+
+        requested = requested_fixtures(tree)
+        deps = set()
+        for conftest in chain:
+            defined, autouse = self._conftest_fixtures(conftest)
+            if autouse or requested & defined:
+                deps.add(conftest)
+            requested -= defined
+        return deps
+
+    def _conftest_fixtures(self, conftest: str) -> Tuple[Set[str], bool]:
+        if conftest not in self._fixtures:
+            try:
+                tree = self.parse_cache.parse(conftest, PYTHON_AST, parse_python)
+                self._fixtures[conftest] = defined_fixtures(tree)
+            except Exception:
+                self._fixtures[conftest] = (set(), False)
+        return self._fixtures[conftest]
+
+
+# ==========================================================
+# Fixture extraction
+# ==========================================================
+
+def _decorator_name(node: ast.AST) -> str:
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return ""
+
+
+def defined_fixtures(tree: ast.AST) -> Tuple[Set[str], bool]:
+    """(fixture names, any autouse) of the @pytest.fixture functions in `tree`."""
+    names, autouse = set(), False
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            if _decorator_name(decorator) != "fixture":
+                continue
+            name = node.name
+            if isinstance(decorator, ast.Call):
+                for kw in decorator.keywords:
+                    if kw.arg == "name" and isinstance(kw.value, ast.Constant) and isinstance(kw.value.value, str):
+                        name = kw.value.value
+                    elif kw.arg == "autouse" and isinstance(kw.value, ast.Constant) and kw.value.value:
+                        autouse = True
+            names.add(name)
+    return names, autouse
+
+
+def requested_fixtures(tree: ast.AST) -> Set[str]:
+    """Argument names of every function in `tree`, plus names given to usefixtures()."""
+    requested = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            args = node.args
+            requested.update(a.arg for a in args.posonlyargs + args.args + args.kwonlyargs)
+        elif isinstance(node, ast.Call) and _decorator_name(node) == "usefixtures":
+            requested.update(a.value for a in node.args if isinstance(a, ast.Constant) and isinstance(a.value, str))
+    requested.discard("self")
+    return requested
@@ -0,0 +1,265 @@
+import json
+import logging
+import posixpath
+import re
+from typing import Dict, List, Optional, Tuple
+
+from services.ast_parsing.parse_cache import ParseCache
+from services.discovery.repo_file_index import RepoFileIndex
+
+logger = logging.getLogger(__name__)
+
+
+# Candidate suffixes, in TypeScript's resolution order
+SOURCE_SUFFIXES = (".ts", ".tsx", ".d.ts", ".js", ".jsx")
+INDEX_FILES = tuple("index" + s for s in SOURCE_SUFFIXES)
+
+# ESM-style specifiers name the emitted file ("./login.js" for login.ts)
+_EMITTED_TO_SOURCE = {".js": (".ts", ".tsx"), ".jsx": (".tsx",), ".mjs": (".mts",), ".cjs": (".cts",)}
+
+# Comments and trailing commas (possibly followed by comments), which
+# tsconfig.json allows; strings are matched first so their content is kept as is
+_JSONC_NOISE = re.compile(
+    r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/|,(?=(?:\s|//[^\n]*|/\*.*?\*/)*[}\]])', re.S
+)
+
+
+def load_jsonc(text: str) -> dict:
+    """Parse JSON that may contain comments and trailing commas (tsconfig.json)."""
+    return json.loads(_JSONC_NOISE.sub(lambda m: m.group(1) or "", text))
+
+
+class _TSConfig:
+    """Resolution settings of one tsconfig.json, `extends` applied."""
+
+    __slots__ = ("base_url", "paths", "paths_base")
+
+    def __init__(self, base_url: Optional[str], paths: Dict[str, List[str]], paths_base: str):
+        self.base_url = base_url      # absolute, or None
+        self.paths = paths            # pattern -> substitutions
+        self.paths_base = paths_base  # directory `paths` substitutions are relative to
+
+
+class TSModuleResolver:
+    """
+    Resolves TypeScript/JavaScript import specifiers against the repository
+    file index instead of the filesystem.
+
+    Handles relative specifiers, tsconfig.json `paths` and `baseUrl` (nearest
+    tsconfig.json above the importing file, `extends` followed), and packages
+    of the repository itself (package.json `name`, `exports`, `types`, `main`,
+    `index.*`). Results are memoized per (directory, specifier); the only reads
+    are of tsconfig.json and package.json files, once each.
+    """
+
+    def __init__(self, file_index: RepoFileIndex, parse_cache: ParseCache = None):
+        self.file_index = file_index
+        self.parse_cache = parse_cache or ParseCache()
+        self.files = {e.path for e in file_index}
+        self.dirs = {posixpath.dirname(p) for p in self.files}
+        for d in list(self.dirs):
+            while d and d not in ("/", file_index.repo_root):
+                d = posixpath.dirname(d)
+                self.dirs.add(d)
+
+        self._memo: Dict[Tuple[str, str], Optional[str]] = {}
+        self._tsconfig_for_dir: Dict[str, Optional[_TSConfig]] = {}
+        self._tsconfigs: Dict[str, Optional[_TSConfig]] = {}
+        self._json: Dict[str, Optional[dict]] = {}
+        self._packages: Optional[Dict[str, str]] = None  # package name -> directory
+
+    # ----------------------------------------------------------
+    # Public API
+    # ----------------------------------------------------------
+
+    def resolve(self, from_file: str, specifier: str) -> Optional[str]:
+        """Absolute path of the repository file `specifier` imports from `from_file`, or None."""
+        from_dir = posixpath.dirname(from_file.replace("\\", "/"))
+        key = (from_dir, specifier)
+        if key not in self._memo:
+            self._memo[key] = self._resolve(from_dir, specifier)
+        return self._memo[key]
+
+    # ----------------------------------------------------------
+    # Resolution
+    # ----------------------------------------------------------
+
+    def _resolve(self, from_dir: str, specifier: str) -> Optional[str]:
+        specifier = specifier.replace("\\", "/")
+        if specifier.startswith("/"):
+            return self._file_or_directory(posixpath.normpath(specifier))
+        if specifier.startswith(("./", "../")) or specifier in (".", ".."):
+            return self._file_or_directory(posixpath.normpath(posixpath.join(from_dir, specifier)))
+
+        config = self._tsconfig(from_dir)
+        if config is not None:
+            resolved = self._resolve_paths(config, specifier)
+            if resolved is None and config.base_url is not None:
+                resolved = self._file_or_directory(posixpath.normpath(posixpath.join(config.base_url, specifier)))
+            if resolved is not None:
+                return resolved
+
+        return self._resolve_package(specifier)
+
+    def _resolve_paths(self, config: _TSConfig, specifier: str) -> Optional[str]:
+        # Exact patterns first, then the wildcard pattern with the longest prefix
+        best, best_prefix, capture = None, -1, ""
+        for pattern in config.paths:
+            if "*" not in pattern:
+                if pattern == specifier:
+                    best, capture = pattern, ""
+                    break
+                continue
+            prefix, _, suffix = pattern.partition("*")
+            if (len(prefix) > best_prefix and specifier.startswith(prefix) and specifier.endswith(suffix)
+                    and len(specifier) >= len(prefix) + len(suffix)):
+                best, best_prefix = pattern, len(prefix)
+                capture = specifier[len(prefix):len(specifier) - len(suffix)]
+        if best is None:
+            return None
+
+        for substitution in config.paths[best]:
+            target = posixpath.normpath(posixpath.join(config.paths_base, substitution.replace("*", capture)))
+            resolved = self._file_or_directory(target)
+            if resolved is not None:
+                return resolved
+        return None
+
+    def _resolve_package(self, specifier: str) -> Optional[str]:
+        """`name` or `name/sub/path` of a package.json inside the repository."""
+        packages = self._local_packages()
+        if not packages:
+            return None
+        parts = specifier.split("/")
+        name_len = 2 if specifier.startswith("@") else 1
+        directory = packages.get("/".join(parts[:name_len]))
+        if directory is None:
+            return None
+
+        subpath = "/".join(parts[name_len:])
+        if not subpath:
+            return self._directory(directory)
+        exported = self._export_target(self._read_json(f"{directory}/package.json"), "./" + subpath)
+        if exported is not None:
+            return self._file(posixpath.normpath(posixpath.join(directory, exported)))
+        return self._file_or_directory(f"{directory}/{subpath}")
+
+    def _file_or_directory(self, path: str) -> Optional[str]:
+        return self._file(path) or (self._directory(path) if path in self.dirs else None)
+
+    def _file(self, path: str) -> Optional[str]:
+        if path in self.files and path.endswith(SOURCE_SUFFIXES):
+            return path
+        for suffix in SOURCE_SUFFIXES:
+            if path + suffix in self.files:
+                return path + suffix
+        stem, ext = posixpath.splitext(path)
+        for source_ext in _EMITTED_TO_SOURCE.get(ext, ()):
+            if stem + source_ext in self.files:
+                return stem + source_ext
+        return None
+
+    def _directory(self, path: str) -> Optional[str]:
+        package = self._read_json(f"{path}/package.json") if f"{path}/package.json" in self.files else None
+        if package:
+            entries = [self._export_target(package, ".")] + [package.get(k) for k in ("types", "typings", "main")]
+            for entry in entries:
+                if isinstance(entry, str):
+                    resolved = self._file(posixpath.normpath(posixpath.join(path, entry)))
+                    if resolved is not None:
+                        return resolved
+        for index in INDEX_FILES:
+            if f"{path}/{index}" in self.files:
+                return f"{path}/{index}"
+        return None
+
+    @staticmethod
+    def _export_target(package: Optional[dict], subpath: str) -> Optional[str]:
+        """Target of `subpath` in package.json `exports` (string, subpath map or condition map)."""
+        exports = (package or {}).get("exports")
+        if isinstance(exports, dict) and not any(k.startswith(".") for k in exports):
+            exports = {".": exports}  # bare condition map
+        elif not isinstance(exports, dict):
+            exports = {".": exports} if exports is not None else {}
+
+        target = exports.get(subpath)
+        # Conditions: prefer type declarations, then ESM, then anything
+        while isinstance(target, dict):
+            target = next(
+                (target[c] for c in ("types", "import", "default", "require") if c in target),
+                next(iter(target.values()), None)
+            )
+        return target if isinstance(target, str) else None
+
+    # ----------------------------------------------------------
+    # Configuration (read once, memoized)
+    # ----------------------------------------------------------
+
+    def _tsconfig(self, directory: str) -> Optional[_TSConfig]:
+        """Settings of the nearest tsconfig.json at or above `directory`."""
+        if directory in self._tsconfig_for_dir:
+            return self._tsconfig_for_dir[directory]
+
+        candidate = f"{directory}/tsconfig.json"
+        if candidate in self.files:
+            config = self._load_tsconfig(candidate)
+        elif directory in ("", "/", self.file_index.repo_root) or "/" not in directory:
+            config = None
+        else:
+            config = self._tsconfig(posixpath.dirname(directory))
+        self._tsconfig_for_dir[directory] = config
+        return config
+
+    def _load_tsconfig(self, path: str, seen=()) -> Optional[_TSConfig]:
+        if path in self._tsconfigs:
+            return self._tsconfigs[path]
+        data = self._read_json(path) or {}
+        directory = posixpath.dirname(path)
+        options = data.get("compilerOptions") or {}
+
+        parent = None
+        extends = data.get("extends")
+        if isinstance(extends, str) and extends.startswith("."):
+            parent_path = posixpath.normpath(posixpath.join(directory, extends))
+            if not parent_path.endswith(".json"):
+                parent_path += ".json"
+            if parent_path in self.files and parent_path not in seen:
+                parent = self._load_tsconfig(parent_path, seen + (path,))
+
+        base_url = options.get("baseUrl")
+        base_url = posixpath.normpath(posixpath.join(directory, base_url)) if isinstance(base_url, str) else None
+        paths = options.get("paths")
+        if isinstance(paths, dict):
+            # `paths` are relative to baseUrl, or to the tsconfig defining them
+            paths_base = base_url or (parent.base_url if parent else None) or directory
+            paths = {k: [v] if isinstance(v, str) else list(v) for k, v in paths.items()}
+        elif parent is not None:
+            paths, paths_base = parent.paths, parent.paths_base
+        else:
+            paths, paths_base = {}, directory
+
+        if base_url is None and parent is not None:
+            base_url = parent.base_url
+        config = _TSConfig(base_url, paths, paths_base)
+        self._tsconfigs[path] = config
+        return config
+
+    def _local_packages(self) -> Dict[str, str]:
+        if self._packages is None:
+            self._packages = {}
+            for entry in self.file_index:
+                if entry.name == "package.json":
+                    name = (self._read_json(entry.path) or {}).get("name")
+                    if isinstance(name, str):
+                        self._packages.setdefault(name, posixpath.dirname(entry.path))
+        return self._packages
+
+    def _read_json(self, path: str) -> Optional[dict]:
+        if path not in self._json:
+            try:
+                data = load_jsonc(self.parse_cache.read(path).decode("utf-8", errors="ignore"))
+                self._json[path] = data if isinstance(data, dict) else None
+            except (OSError, ValueError) as e:
+                logger.debug(f"[TS Resolver] cannot read {path}: {e}")
+                self._json[path] = None
+        return self._json[path]
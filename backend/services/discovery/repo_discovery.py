@@ -1,24 +1,23 @@
 import os
 
+from .repo_file_index import RepoFileIndex
+
 
 class RepoDiscovery:
 
     @staticmethod
-    def detect_language(repo_root):
+    def detect_language(repo_root, file_index: RepoFileIndex = None):
         counts = {"java": 0, "typescript": 0, "python": 0}
-        skip_dirs = {".git", "node_modules", "venv", "target", "build", "dist", "bin", "obj"}
-
-        for root, dirs, files in os.walk(repo_root):
-            # Prune directories to skip in-place
-            dirs[:] = [d for d in dirs if d not in skip_dirs]
-
-            for file in files:
-                if file.endswith(".java"):
-                    counts["java"] += 1
-                elif file.endswith((".ts", ".js", ".tsx", ".jsx")):
-                    counts["typescript"] += 1
-                elif file.endswith(".py"):
-                    counts["python"] += 1
+        file_index = file_index if file_index is not None else RepoFileIndex.build(repo_root)
+
+        for entry in file_index:
+            file = entry.name
+            if file.endswith(".java"):
+                counts["java"] += 1
+            elif file.endswith((".ts", ".js", ".tsx", ".jsx")):
+                counts["typescript"] += 1
+            elif file.endswith(".py"):
+                counts["python"] += 1
 
         if not any(counts.values()):
             return "unknown"
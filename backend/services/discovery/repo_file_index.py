@@ -0,0 +1,119 @@
+import os
+from typing import Dict, Iterator, List, Optional
+
+
+# Directories never worth descending into during analysis
+SKIP_DIRS = {".git", "node_modules", "venv", "target", "build", "dist", "bin", "obj", ".gradle"}
+
+
+class FileEntry:
+    """A single file in the repository. Paths always use forward slashes."""
+
+    __slots__ = ("path", "rel_path", "name", "ext", "size", "mtime_ns", "inode")
+
+    def __init__(self, path: str, rel_path: str, name: str, size: int, mtime_ns: int, inode: int):
+        self.path = path
+        self.rel_path = rel_path
+        self.name = name
+        self.ext = os.path.splitext(name)[1].lower()
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.inode = inode
+
+    def __repr__(self):
+        return f"FileEntry({self.rel_path!r}, size={self.size})"
+
+
+class RepoFileIndex:
+    """
+    Snapshot of every file in a repository, built with a single directory walk.
+
+    Analysis stages take this index as input instead of walking the
+    filesystem themselves.
+    """
+
+    def __init__(self, repo_root: str, entries: List[FileEntry]):
+        self.repo_root = repo_root.replace("\\", "/").rstrip("/")
+        self.entries = entries
+        self._by_path: Dict[str, FileEntry] = {e.path: e for e in entries}
+        self._by_rel_path: Dict[str, FileEntry] = {e.rel_path: e for e in entries}
+
+    # ----------------------------------------------------------
+    # Construction
+    # ----------------------------------------------------------
+
+    @classmethod
+    def build(cls, repo_root: str, skip_dirs=SKIP_DIRS) -> "RepoFileIndex":
+        root = repo_root.replace("\\", "/").rstrip("/")
+        entries = []
+
+        # Depth-first, files before sub-directories (same order as os.walk)
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    dir_entries = list(it)
+            except OSError:
+                continue
+
+            sub_dirs = []
+            for de in dir_entries:
+                try:
+                    if de.is_dir():
+                        if not de.is_symlink() and de.name not in skip_dirs:
+                            sub_dirs.append(f"{current}/{de.name}")
+                        continue
+                    if not de.is_file():
+                        continue
+                    st = de.stat()
+                except OSError:
+                    continue
+
+                abs_path = f"{current}/{de.name}"
+                rel_path = abs_path[len(root) + 1:]
+                entries.append(FileEntry(abs_path, rel_path, de.name, st.st_size, st.st_mtime_ns, st.st_ino))
+
+            stack.extend(reversed(sub_dirs))
+
+        return cls(root, entries)
+
+    def subset(self, paths) -> "RepoFileIndex":
+        """A new index restricted to `paths` (absolute or repo-relative); unknown paths are ignored."""
+        wanted = {e.path for e in (self.get(p) for p in paths) if e is not None}
+        return RepoFileIndex(self.repo_root, [e for e in self.entries if e.path in wanted])
+
+    # ----------------------------------------------------------
+    # Queries
+    # ----------------------------------------------------------
+
+    def files(self, *suffixes: str) -> List[FileEntry]:
+        """Entries whose file name ends with any of the given suffixes (all entries if none)."""
+        if not suffixes:
+            return list(self.entries)
+        return [e for e in self.entries if e.name.endswith(suffixes)]
+
+    def paths(self, *suffixes: str) -> List[str]:
+        """Absolute paths of the files matching `suffixes`."""
+        return [e.path for e in self.files(*suffixes)]
+
+    def named(self, name: str) -> List[FileEntry]:
+        return [e for e in self.entries if e.name == name]
+
+    def get(self, path: str) -> Optional[FileEntry]:
+        """Look up an entry by absolute or repo-relative path."""
+        path = path.replace("\\", "/")
+        return self._by_path.get(path) or self._by_rel_path.get(path)
+
+    def abs_path(self, rel_path: str) -> str:
+        rel_path = rel_path.replace("\\", "/")
+        return f"{self.repo_root}/{rel_path}"
+
+    def __contains__(self, path: str) -> bool:
+        return self.get(path) is not None
+
+    def __iter__(self) -> Iterator[FileEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
 
+from services.discovery.repo_file_index import RepoFileIndex
+
 
 class AbstractDriverDetector(ABC):
 
-    def __init__(self, repo_root: str):
+    def __init__(self, repo_root: str, file_index: RepoFileIndex = None):
         self.repo_root = repo_root
+        self.file_index = file_index if file_index is not None else RepoFileIndex.build(repo_root)
 
     @abstractmethod
     def detect_driver(self):
@@ -1,20 +1,21 @@
 from .java_driver_detector import JavaDriverDetector
 from .ts_driver_detector import TSDriverDetector
 from .python_driver_detector import PythonDriverDetector
+from services.discovery.repo_file_index import RepoFileIndex
 
 
 class DriverDetectorFactory:
 
     @staticmethod
-    def get_detector(language, repo_root):
+    def get_detector(language, repo_root, file_index: RepoFileIndex = None):
 
         if language == "java":
-            return JavaDriverDetector(repo_root)
+            return JavaDriverDetector(repo_root, file_index)
 
         if language in ["typescript", "js", "javascript"]:
-            return TSDriverDetector(repo_root)
+            return TSDriverDetector(repo_root, file_index)
 
         if language == "python":
-            return PythonDriverDetector(repo_root)
+            return PythonDriverDetector(repo_root, file_index)
 
         raise ValueError("Unsupported language")
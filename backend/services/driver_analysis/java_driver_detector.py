@@ -1,4 +1,3 @@
-import os
 from pathlib import Path
 from .base_driver_detector import AbstractDriverDetector
 
@@ -10,36 +9,36 @@ class JavaDriverDetector(AbstractDriverDetector):
         pattern = "unknown"
         thread_model = "unknown"
 
-        for root, _, files in os.walk(self.repo_root):
-            for file in files:
-                if file.endswith(".java"):
-                    try:
-                        content = Path(root, file).read_text(errors='ignore')
-
-                        if "new ChromeDriver" in content or "new FirefoxDriver" in content:
-                            if pattern == "unknown":
-                                pattern = "inline"
-
-                        if "ThreadLocal<WebDriver>" in content or "ThreadLocal<RemoteWebDriver>" in content:
-                            thread_model = "ThreadLocal"
-
-                        if "extends Base" in content or "extends BaseTest" in content:
-                            pattern = "Base Class Inheritance"
-                            
-                        if "getDriver()" in content:
-                            pattern = "Driver Factory / Manager"
-
-                    except Exception:
-                        continue
-                
-                if file == "testng.xml":
-                    try:
-                        content = Path(root, file).read_text(errors='ignore')
-                        if 'parallel="' in content:
-                            if thread_model == "unknown":
-                                thread_model = "TestNG Parallel Execution"
-                    except Exception:
-                        pass
+        for entry in self.file_index:
+            file = entry.name
+            if file.endswith(".java"):
+                try:
+                    content = Path(entry.path).read_text(errors='ignore')
+
+                    if "new ChromeDriver" in content or "new FirefoxDriver" in content:
+                        if pattern == "unknown":
+                            pattern = "inline"
+
+                    if "ThreadLocal<WebDriver>" in content or "ThreadLocal<RemoteWebDriver>" in content:
+                        thread_model = "ThreadLocal"
+
+                    if "extends Base" in content or "extends BaseTest" in content:
+                        pattern = "Base Class Inheritance"
+                        
+                    if "getDriver()" in content:
+                        pattern = "Driver Factory / Manager"
+
+                except Exception:
+                    continue
+            
+            if file == "testng.xml":
+                try:
+                    content = Path(entry.path).read_text(errors='ignore')
+                    if 'parallel="' in content:
+                        if thread_model == "unknown":
+                            thread_model = "TestNG Parallel Execution"
+                except Exception:
+                    pass
 
         return {
             "driver_type": driver_type,
@@ -1,4 +1,3 @@
-import os
 from pathlib import Path
 from .base_driver_detector import AbstractDriverDetector
 
@@ -10,13 +9,11 @@ class PythonDriverDetector(AbstractDriverDetector):
         driver_type = "WebDriver"
         pattern = "unknown"
 
-        for root, _, files in os.walk(self.repo_root):
-            for file in files:
-                if file.endswith(".py"):
-                    content = Path(root, file).read_text()
+        for path in self.file_index.paths(".py"):
+            content = Path(path).read_text()
 
-                    if "webdriver.Chrome" in content:
-                        pattern = "inline"
+            if "webdriver.Chrome" in content:
+                pattern = "inline"
 
         return {
             "driver_type": driver_type,
@@ -1,4 +1,3 @@
-import os
 from pathlib import Path
 from .base_driver_detector import AbstractDriverDetector
 
@@ -10,16 +9,14 @@ class TSDriverDetector(AbstractDriverDetector):
         driver_type = "browser"
         pattern = "unknown"
 
-        for root, _, files in os.walk(self.repo_root):
-            for file in files:
-                if file.endswith((".ts", ".js")):
-                    content = Path(root, file).read_text()
+        for path in self.file_index.paths(".ts", ".js"):
+            content = Path(path).read_text()
 
-                    if "browser.newPage" in content:
-                        pattern = "factory"
+            if "browser.newPage" in content:
+                pattern = "factory"
 
-                    if "test.beforeEach" in content:
-                        pattern = "hook_based"
+            if "test.beforeEach" in content:
+                pattern = "hook_based"
 
         return {
             "driver_type": driver_type,
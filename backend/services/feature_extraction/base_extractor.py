@@ -1,19 +1,58 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from services.discovery.repo_file_index import RepoFileIndex
+from services.ast_parsing.parse_cache import ParseCache
+from services.ast_parsing.byte_prefilter import BytePrefilter
 
 
 class AbstractFeatureExtractor(ABC):
 
-    def __init__(self, repo_root: str):
+    # Language of the byte prefilter run before each parse
+    LANGUAGE = None
+
+    def __init__(self, repo_root: str, file_index: RepoFileIndex = None, parse_cache: ParseCache = None):
         self.repo_root = repo_root
+        self.file_index = file_index if file_index is not None else RepoFileIndex.build(repo_root)
+        self.parse_cache = parse_cache or ParseCache()
+        self.prefilter = BytePrefilter(self.LANGUAGE, "features")
 
     @abstractmethod
-    def extract_features(self) -> List[Dict]:
+    def scan_files(self) -> List[str]:
+        """
+        Candidate source files, in scan order.
+        """
+        pass
+
+    @abstractmethod
+    def extract_file_features(self, file_path: Path) -> List[Dict]:
         """
-        Must return standardized FeatureModel list.
+        Must return the standardized FeatureModels defined in one file.
         """
         pass
 
+    def iter_file_features(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Yield (file_path, features) for every scanned file as soon as it is parsed,
+        so callers can persist features and report progress while scanning.
+        """
+        for path in self.scan_files():
+            if not self.prefilter.admits_file(self.parse_cache, path):
+                yield path, []
+                continue
+            yield path, self.extract_file_features(Path(path))
+
+    def iter_features(self) -> Iterator[Dict]:
+        for _, features in self.iter_file_features():
+            yield from features
+
+    def extract_features(self) -> List[Dict]:
+        """
+        Standardized FeatureModel list of the whole repository.
+        """
+        return list(self.iter_features())
+
     def build_feature_model(
         self,
         feature_name: str,
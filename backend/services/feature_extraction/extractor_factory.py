@@ -1,20 +1,23 @@
 from .java_extractor import JavaFeatureExtractor
 from .ts_extractor import TSFeatureExtractor
 from .python_extractor import PythonFeatureExtractor
+from services.discovery.repo_file_index import RepoFileIndex
+from services.ast_parsing.parse_cache import ParseCache
 
 
 class FeatureExtractorFactory:
 
     @staticmethod
-    def get_extractor(language: str, repo_root: str):
+    def get_extractor(language: str, repo_root: str, file_index: RepoFileIndex = None,
+                      parse_cache: ParseCache = None):
 
         if language.lower() == "java":
-            return JavaFeatureExtractor(repo_root)
+            return JavaFeatureExtractor(repo_root, file_index, parse_cache)
 
         if language.lower() in ["ts", "typescript", "js", "javascript"]:
-            return TSFeatureExtractor(repo_root)
+            return TSFeatureExtractor(repo_root, file_index, parse_cache)
 
         if language.lower() == "python":
-            return PythonFeatureExtractor(repo_root)
+            return PythonFeatureExtractor(repo_root, file_index, parse_cache)
 
         raise ValueError("Unsupported language")
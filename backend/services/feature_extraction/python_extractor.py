@@ -1,28 +1,23 @@
-import os
 import ast
 from pathlib import Path
 from .base_extractor import AbstractFeatureExtractor
+from services.ast_parsing.parse_cache import PYTHON_AST, parse_python
 
 
 class PythonFeatureExtractor(AbstractFeatureExtractor):
 
-    def extract_features(self):
-        features = []
+    LANGUAGE = "python"
 
-        for root, _, files in os.walk(self.repo_root):
-            for file in files:
-                if file.endswith(".py"):
-                    file_path = Path(root) / file
-                    feature = self.parse_python_file(file_path)
-                    if feature:
-                        features.append(feature)
+    def scan_files(self):
+        return self.file_index.paths(".py")
 
-        return features
+    def extract_file_features(self, file_path: Path):
+        feature = self.parse_python_file(file_path)
+        return [feature] if feature else []
 
     def parse_python_file(self, file_path: Path):
         try:
-            code = file_path.read_text(encoding="utf-8", errors="ignore")
-            tree = ast.parse(code)
+            tree = self.parse_cache.parse(file_path, PYTHON_AST, parse_python)
         except:
             return None
 
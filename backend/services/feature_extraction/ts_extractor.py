@@ -1,33 +1,29 @@
-import os
 from pathlib import Path
 from tree_sitter import Language, Parser
 from tree_sitter_languages import get_language
 from .base_extractor import AbstractFeatureExtractor
+from services.ast_parsing.parse_cache import TREE_SITTER_TYPESCRIPT
 
 
 class TSFeatureExtractor(AbstractFeatureExtractor):
 
-    def __init__(self, repo_root: str):
-        super().__init__(repo_root)
+    LANGUAGE = "typescript"
+
+    def __init__(self, repo_root: str, file_index=None, parse_cache=None):
+        super().__init__(repo_root, file_index, parse_cache)
         self.parser = Parser()
         self.parser.set_language(get_language("typescript"))
 
-    def extract_features(self):
-        features = []
-
-        for root, _, files in os.walk(self.repo_root):
-            for file in files:
-                if file.endswith((".ts", ".js")):
-                    file_path = Path(root) / file
-                    feature = self.parse_ts_file(file_path)
-                    if feature:
-                        features.append(feature)
+    def scan_files(self):
+        return self.file_index.paths(".ts", ".js")
 
-        return features
+    def extract_file_features(self, file_path: Path):
+        feature = self.parse_ts_file(file_path)
+        return [feature] if feature else []
 
     def parse_ts_file(self, file_path: Path):
-        code = file_path.read_text(encoding="utf-8")
-        tree = self.parser.parse(bytes(code, "utf-8"))
+        code = self.parse_cache.read(file_path).decode("utf-8")
+        tree = self.parse_cache.parse(file_path, TREE_SITTER_TYPESCRIPT, self.parser.parse)
 
         root = tree.root_node
         tests = []
@@ -1,21 +1,15 @@
-from typing import Dict, Set
+from typing import Dict, FrozenSet, Set
+
+from services.dependency_graph.closure_engine import ClosureEngine
 
 
 class FeatureClosureBuilder:
 
     def __init__(self, graph: Dict[str, Set[str]]):
         self.graph = graph
+        # Condensed once; closures are shared between features
+        self.engine = ClosureEngine(graph)
 
-    def build_closure(self, test_file: str) -> Set[str]:
-        visited = set()
-        stack = [test_file]
-
-        while stack:
-            current = stack.pop()
-
-            for dep in self.graph.get(current, []):
-                if dep not in visited:
-                    visited.add(dep)
-                    stack.append(dep)
-
-        return visited
+    def build_closure(self, test_file: str) -> FrozenSet[str]:
+        """Files `test_file` depends on, transitively. Shared between callers: copy before modifying."""
+        return self.engine.reachable(test_file)
@@ -1,17 +1,28 @@
+import os
 from typing import Dict, List
 
 
 class FeatureHookMapper:
 
-    def __init__(self, ast_parser):
+    def __init__(self, ast_parser, prefilter=None):
         self.parser = ast_parser
+        # Optional BytePrefilter("hooks"): files it rejects are not parsed
+        self.prefilter = prefilter
+        # file_path -> hooks; closures overlap heavily between features
+        self._file_hooks: Dict[str, List[str]] = {}
 
     def collect_feature_hooks(self, file_paths: List[str]):
 
         hooks = []
 
         for file_path in file_paths:
-            parsed = self.parser.parse_file(file_path)
-            hooks.extend(parsed.get("hooks", []))
+            if file_path not in self._file_hooks:
+                full_path = os.path.join(self.parser.repo_root, file_path)
+                if self.prefilter is not None and not self.prefilter.admits_file(self.parser.parse_cache, full_path):
+                    self._file_hooks[file_path] = []
+                else:
+                    parsed = self.parser.parse_file(file_path)
+                    self._file_hooks[file_path] = parsed.get("hooks", [])
+            hooks.extend(self._file_hooks[file_path])
 
         return list(set(hooks))
@@ -0,0 +1,76 @@
+import hashlib
+from typing import Dict, Iterable, NamedTuple, Optional
+
+
+class SnapshotHashes(NamedTuple):
+    snapshot_hash: str
+    test_hash: str
+    deps_hash: str
+    config_hash: str
+
+
+class FeatureSnapshotHasher:
+    """
+    Merkle hash of a feature's closure, built from already-computed file hashes.
+
+    Each sub-tree (the test file, its dependencies, its config files) hashes
+    the sorted (repo-relative path, file hash) leaves under it; the snapshot
+    hash is the hash of the three sub-tree hashes. Comparing sub-tree hashes
+    tells which part of the feature changed.
+    """
+
+    SUBTREES = (("test_hash", "test"), ("deps_hash", "dependencies"), ("config_hash", "config"))
+
+    def __init__(self, repo_root: str):
+        self.root_prefix = repo_root.replace("\\", "/").rstrip("/") + "/"
+
+    def hash_feature(
+        self,
+        test_file: str,
+        test_file_hash: Optional[str],
+        closure: Iterable[str],
+        config_files: Iterable[str],
+        hashes: Dict[str, Optional[str]]
+    ) -> SnapshotHashes:
+        configs = set(config_files)
+        test_hash = self._subtree({test_file: test_file_hash})
+        deps_hash = self._subtree({p: hashes.get(p) for p in closure if p not in configs})
+        config_hash = self._subtree({p: hashes.get(p) for p in configs})
+        root = hashlib.sha256(f"{test_hash}{deps_hash}{config_hash}".encode()).hexdigest()
+        return SnapshotHashes(root, test_hash, deps_hash, config_hash)
+
+    @staticmethod
+    def legacy_hash(file_hashes: Iterable[Optional[str]]) -> str:
+        """
+        Snapshot hash as computed before sub-tree hashes: the sorted
+        concatenation of the test file, dependency and config file hashes
+        (empty ones skipped), or "" when there are none. Only used to compare
+        against snapshots stored without sub-tree hashes.
+        """
+        hashes = sorted(h for h in file_hashes if h)
+        if not hashes:
+            return ""
+        return hashlib.sha256("".join(hashes).encode()).hexdigest()
+
+    @classmethod
+    def changed_subtrees(cls, current, previous) -> Optional[str]:
+        """Comma-separated names of the sub-trees whose hashes differ, or None if unknown."""
+        changed = []
+        for column, name in cls.SUBTREES:
+            old = previous[column]
+            if old is None:
+                # Snapshot predates sub-tree hashes
+                return None
+            if current[column] != old:
+                changed.append(name)
+        return ",".join(changed) or None
+
+    def _subtree(self, leaves: Dict[str, Optional[str]]) -> str:
+        h = hashlib.sha256()
+        for rel, digest in sorted((self._relative(p), d or "") for p, d in leaves.items()):
+            h.update(f"{rel}\0{digest}\n".encode())
+        return h.hexdigest()
+
+    def _relative(self, path: str) -> str:
+        path = path.replace("\\", "/")
+        return path[len(self.root_prefix):] if path.startswith(self.root_prefix) else path
@@ -1,10 +1,34 @@
-from typing import List, Dict, Optional
+import os
+from collections import OrderedDict, defaultdict
+from typing import List, Dict, Optional, Tuple
 from database.db import Database
+from services.dependency_graph.impact_index import ImpactIndex
+from services.git_service import GitService
+
+
+# Sessions whose impact index is kept in memory, least recently queried first out
+IMPACT_INDEX_SESSIONS = int(os.getenv("IMPACT_INDEX_SESSIONS", "8"))
 
 
 class FeatureQueryService:
     def __init__(self, db: Database):
         self.db = db
+        # session_id -> (sessions.updated_at when built, index), least recently used first
+        self._impact_indexes: "OrderedDict[str, Tuple[Optional[str], ImpactIndex]]" = OrderedDict()
+
+    def _group_by_feature(self, table: str, path_column: str, session_id: str) -> Dict[str, List[Dict]]:
+        """
+        All {path, hash} rows of a per-feature table for the session, grouped by feature_id.
+        Rows keep their insertion order, as the former per-feature queries returned them.
+        """
+        rows = self.db.fetchall(
+            f"SELECT feature_id, {path_column} AS path, file_hash FROM {table} WHERE session_id = ? ORDER BY rowid",
+            (session_id,)
+        )
+        grouped = defaultdict(list)
+        for r in rows:
+            grouped[r["feature_id"]].append({"path": r["path"], "hash": r["file_hash"]})
+        return grouped
 
     def get_feature_summaries(self, session_id: str) -> List[Dict]:
         """
@@ -12,10 +36,15 @@ class FeatureQueryService:
         config_files, shared_modules), each as {path, hash} objects.
         """
         features = self.db.fetchall(
-            "SELECT id, feature_name, file_path, file_hash, status, last_migrated_commit FROM features WHERE session_id = ?",
+            "SELECT id, feature_name, file_path, file_hash, status, status_reason, last_migrated_commit FROM features WHERE session_id = ?",
             (session_id,)
         )
 
+        # One grouped query per table instead of three queries per feature
+        deps_by_feature = self._group_by_feature("feature_dependencies", "file_path", session_id)
+        configs_by_feature = self._group_by_feature("feature_config_dependencies", "config_file", session_id)
+        shared_by_feature = self._group_by_feature("feature_shared_modules", "file_path", session_id)
+
         result = []
         for f in features:
             feature_id = f["id"]
@@ -23,31 +52,15 @@ class FeatureQueryService:
             # Test files: the feature's own test file
             test_files = [{"path": f["file_path"], "hash": f["file_hash"]}]
 
-            # Dependent files
-            deps = self.db.fetchall(
-                "SELECT file_path, file_hash FROM feature_dependencies WHERE feature_id = ?",
-                (feature_id,)
-            )
-            dependent_files = [{"path": d["file_path"], "hash": d["file_hash"]} for d in deps]
-
-            # Config files
-            configs = self.db.fetchall(
-                "SELECT config_file, file_hash FROM feature_config_dependencies WHERE feature_id = ?",
-                (feature_id,)
-            )
-            config_files = [{"path": c["config_file"], "hash": c["file_hash"]} for c in configs]
-
-            # Shared modules
-            shared = self.db.fetchall(
-                "SELECT file_path, file_hash FROM feature_shared_modules WHERE feature_id = ?",
-                (feature_id,)
-            )
-            shared_modules = [{"path": s["file_path"], "hash": s["file_hash"]} for s in shared]
+            dependent_files = deps_by_feature.get(feature_id, [])
+            config_files = configs_by_feature.get(feature_id, [])
+            shared_modules = shared_by_feature.get(feature_id, [])
 
             result.append({
                 "feature_id": feature_id,
                 "name": f["feature_name"],
                 "status": f.get("status", "NOT_MIGRATED"),
+                "status_reason": f.get("status_reason"),
                 "last_migrated": f.get("last_migrated_commit"),
                 "dependent_count": len(dependent_files),
                 "config_count": len(config_files),
@@ -89,6 +102,7 @@ class FeatureQueryService:
             "file_path": feature["file_path"],
             "file_hash": feature["file_hash"],
             "status": feature.get("status"),
+            "status_reason": feature.get("status_reason"),
             "framework": feature["framework"],
             "language": feature["language"],
             "last_migrated_commit": feature.get("last_migrated_commit"),
@@ -99,6 +113,117 @@ class FeatureQueryService:
             "hooks": [h["hook_data"] for h in hooks]
         }
 
+    @staticmethod
+    def _build_dependency_graph(nodes: List[Dict], edges: List[Dict]) -> Dict[str, Dict]:
+        """Serialize nodes with their imports, grouping the edges in a single pass."""
+        imports_by_file = defaultdict(list)
+        for e in edges:
+            imports_by_file[e["from_file"]].append(e["to_file"])
+
+        dependency_graph = {}
+        for node in nodes:
+            file_path = node["file_path"]
+            dependency_graph[file_path] = {
+                "package": node["package_name"],
+                "imports": imports_by_file.get(file_path, []),
+                "class_name": file_path.split("/")[-1].split(".")[0],
+                "type": node["file_type"]
+            }
+        return dependency_graph
+
+    def get_dependency_graph_page(self, session_id: str, cursor: int = 0, limit: int = 500) -> Optional[Dict]:
+        """
+        One page of the dependency graph, for graphs too large for the full-analysis body.
+        Pages are keyed on the node row id: pass the returned `next_cursor` to get the
+        next page; it is None on the last page.
+        """
+        session = self.db.fetchone("SELECT id FROM sessions WHERE id = ?", (session_id,))
+        if not session:
+            return None
+
+        total = self.db.fetchone(
+            "SELECT COUNT(*) as cnt FROM dependency_nodes WHERE session_id = ?", (session_id,)
+        )["cnt"]
+        nodes = self.db.fetchall(
+            "SELECT id, file_path, file_type, package_name FROM dependency_nodes WHERE session_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (session_id, cursor, limit)
+        )
+
+        edges = []
+        if nodes:
+            placeholders = ",".join("?" * len(nodes))
+            edges = self.db.fetchall(
+                f"SELECT from_file, to_file FROM dependency_edges WHERE session_id = ? AND from_file IN ({placeholders}) ORDER BY id",
+                (session_id, *[n["file_path"] for n in nodes])
+            )
+
+        return {
+            "session_id": session_id,
+            "total_nodes": total,
+            "dependency_graph": self._build_dependency_graph(nodes, edges),
+            "next_cursor": nodes[-1]["id"] if len(nodes) == limit else None
+        }
+
+    def get_affected_features(
+        self,
+        session_id: str,
+        paths: Optional[List[str]] = None,
+        base_commit: Optional[str] = None,
+        head_commit: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Features whose test file or dependency closure contains any of `paths`
+        (absolute or repo-relative), or any file changed between `base_commit`
+        and `head_commit` (the working tree if omitted).
+        """
+        session = self.db.fetchone("SELECT repo_root, updated_at FROM sessions WHERE id = ?", (session_id,))
+        if not session:
+            self._impact_indexes.pop(session_id, None)
+            return None
+        root = (session["repo_root"] or "").replace("\\", "/").rstrip("/")
+
+        if base_commit:
+            changes = GitService.get_changed_files(root, base_commit, head_commit)
+            if changes is None:
+                raise ValueError(f"Cannot diff {base_commit}..{head_commit or 'working tree'} in the session repository.")
+            paths = list(changes)
+        elif paths is None:
+            raise ValueError("Either paths or base_commit is required.")
+
+        normalized = []
+        for path in paths:
+            path = path.replace("\\", "/")
+            if not os.path.isabs(path):
+                path = f"{root}/{path[2:] if path.startswith('./') else path}"
+            normalized.append(path)
+
+        feature_ids, unmatched = self._get_impact_index(session_id, session["updated_at"]).affected(normalized)
+        return {
+            "session_id": session_id,
+            "changed_files": len(normalized),
+            "affected_feature_ids": feature_ids,
+            "unmatched_paths": unmatched,
+        }
+
+    def _get_impact_index(self, session_id: str, stamp: Optional[str]) -> ImpactIndex:
+        """The session's impact index, rebuilt only when the session has been re-analysed."""
+        cached = self._impact_indexes.get(session_id)
+        if cached is not None and cached[0] == stamp:
+            self._impact_indexes.move_to_end(session_id)
+            return cached[1]
+
+        rows = self.db.fetchall(
+            "SELECT id AS feature_id, file_path FROM features WHERE session_id = ? "
+            "UNION ALL SELECT feature_id, file_path FROM feature_dependencies WHERE session_id = ?",
+            (session_id, session_id)
+        )
+        index = ImpactIndex((r["feature_id"], r["file_path"]) for r in rows)
+        self._impact_indexes[session_id] = (stamp, index)
+        self._impact_indexes.move_to_end(session_id)
+        while len(self._impact_indexes) > IMPACT_INDEX_SESSIONS:
+            self._impact_indexes.popitem(last=False)
+        return index
+
     def get_full_analysis(self, session_id: str) -> Optional[Dict]:
         """
         Retrieves existing full analysis results (dependency graph, build deps, driver, etc).
@@ -111,19 +236,9 @@ class FeatureQueryService:
         feature_summaries = self.get_feature_summaries(session_id)
         
         # 2. Dependency Graph
-        nodes = self.db.fetchall("SELECT file_path, file_type, package_name FROM dependency_nodes WHERE session_id = ?", (session_id,))
-        edges = self.db.fetchall("SELECT from_file, to_file FROM dependency_edges WHERE session_id = ?", (session_id,))
-        
-        dependency_graph = {}
-        for node in nodes:
-            file_path = node["file_path"]
-            imports = [e["to_file"] for e in edges if e["from_file"] == file_path]
-            dependency_graph[file_path] = {
-                "package": node["package_name"],
-                "imports": imports,
-                "class_name": file_path.split("/")[-1].split(".")[0],
-                "type": node["file_type"]
-            }
+        nodes = self.db.fetchall("SELECT file_path, file_type, package_name FROM dependency_nodes WHERE session_id = ? ORDER BY id", (session_id,))
+        edges = self.db.fetchall("SELECT from_file, to_file FROM dependency_edges WHERE session_id = ? ORDER BY id", (session_id,))
+        dependency_graph = self._build_dependency_graph(nodes, edges)
         
         # 3. Build Dependencies
         build_dependencies = self.db.fetchall("SELECT name, version, type FROM build_dependencies WHERE session_id = ?", (session_id,))
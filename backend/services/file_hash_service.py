@@ -0,0 +1,268 @@
+import os
+import stat
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from database.db import Database
+from services.git_service import GitService
+
+logger = logging.getLogger(__name__)
+
+
+# hashlib releases the GIL on large buffers, so threads hash files in parallel
+HASH_WORKERS = int(os.getenv("FILE_HASH_WORKERS", str(min(8, (os.cpu_count() or 1) * 2))))
+
+# "sha256": hash file contents (default). "git": use git blob IDs, so a whole
+# clean checkout is hashed by one `git ls-files -s` call. Switching modes
+# changes every stored hash, so pick one per deployment.
+HASH_MODE = os.getenv("FILE_HASH_MODE", "sha256").lower()
+
+# In-memory hashes kept, least recently used first out (the file_hashes table keeps them all)
+MEMO_MAX_ENTRIES = int(os.getenv("FILE_HASH_MEMO_ENTRIES", "200000"))
+
+# Repositories whose git index blob IDs are kept in memory
+INDEX_BLOB_REPOS = 4
+
+# SQLite caps the number of bound parameters per statement
+_SQL_CHUNK = 500
+
+
+class FileHashService:
+    """
+    SHA-256 content hashes of files, cached by (path, size, mtime_ns, inode).
+
+    Hashes are kept in memory and persisted in the `file_hashes` table, so
+    they survive across analysis runs and sessions. A file is only read again
+    when its stat signature changes; misses are hashed on a thread pool.
+
+    In "git" mode, files inside `repo_root` get their git blob ID instead:
+    clean files straight from the index, dirty/untracked/ignored ones from a
+    single `git hash-object --stdin-paths` call. Outside a git work tree it
+    falls back to SHA-256. Inside `analysis_run()` the dirty file list of a
+    repository is taken once instead of on every call.
+    """
+
+    def __init__(self, db: Database, max_workers: int = HASH_WORKERS, mode: str = HASH_MODE,
+                 memo_max_entries: int = MEMO_MAX_ENTRIES):
+        self.db = db
+        self.max_workers = max(1, max_workers)
+        self.mode = mode
+        self.memo_max_entries = memo_max_entries
+        # path -> (stat signature, hash), least recently used first
+        self._memo: "OrderedDict[str, Tuple[Tuple[int, int, int], str]]" = OrderedDict()
+        # repo_root -> (stat signature of .git/index, {relative_path: blob_id}), least recently used first
+        self._index_blobs: "OrderedDict[str, Tuple[Optional[Tuple[int, int]], Dict[str, str]]]" = OrderedDict()
+        # repo_root -> dirty relative paths, kept while an analysis run is open
+        self._dirty: Dict[str, Optional[Set[str]]] = {}
+        self._runs = 0
+        self._lock = threading.Lock()
+        self.hashed = 0
+
+    # ==========================================================
+    # PUBLIC API
+    # ==========================================================
+
+    @contextmanager
+    def analysis_run(self):
+        """
+        Treat working trees as unchanged until the block exits: in "git" mode,
+        `git status` is run once per repository for the whole run. Runs may
+        overlap; the dirty lists are dropped when the last one ends.
+        """
+        with self._lock:
+            self._runs += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._runs -= 1
+                if not self._runs:
+                    self._dirty.clear()
+
+    def hash_file(self, path: str, repo_root: str = None) -> Optional[str]:
+        return self.hash_files([path], repo_root).get(path)
+
+    def hash_files(self, paths: Iterable[str], repo_root: str = None) -> Dict[str, Optional[str]]:
+        """Return {path: hash}, or None for paths that are not readable files."""
+        if self.mode == "git" and repo_root:
+            paths = list(paths)
+            blob_ids = self._git_blob_ids(repo_root, paths)
+            if blob_ids is not None:
+                return blob_ids
+
+        result: Dict[str, Optional[str]] = {}
+        signatures = {}
+
+        for path in set(paths):
+            sig = self._signature(path)
+            if sig is None:
+                result[path] = None
+                continue
+            memo = self._memo_get(path)
+            if memo is not None and memo[0] == sig:
+                result[path] = memo[1]
+            else:
+                signatures[path] = sig
+
+        if not signatures:
+            return result
+
+        # Persisted hashes from earlier runs
+        missing = []
+        persisted = self._load(list(signatures))
+        for path, sig in signatures.items():
+            row = persisted.get(path)
+            if row is not None and row[0] == sig:
+                self._memo_put(path, sig, row[1])
+                result[path] = row[1]
+            else:
+                missing.append(path)
+
+        if missing:
+            hashed = self._hash_parallel(missing)
+            rows = []
+            for path, digest in hashed.items():
+                result[path] = digest
+                if digest is not None:
+                    sig = signatures[path]
+                    self._memo_put(path, sig, digest)
+                    rows.append((path, sig[0], sig[1], sig[2], digest))
+            self._store(rows)
+
+        return result
+
+    # ==========================================================
+    # INTERNALS
+    # ==========================================================
+
+    def _memo_get(self, path: str):
+        with self._lock:
+            memo = self._memo.get(path)
+            if memo is not None:
+                self._memo.move_to_end(path)
+            return memo
+
+    def _memo_put(self, path: str, sig: Tuple[int, int, int], digest: str):
+        with self._lock:
+            self._memo[path] = (sig, digest)
+            self._memo.move_to_end(path)
+            while len(self._memo) > self.memo_max_entries:
+                self._memo.popitem(last=False)
+
+    def _git_blob_ids(self, repo_root: str, paths) -> Optional[Dict[str, Optional[str]]]:
+        root = repo_root.replace("\\", "/").rstrip("/")
+        blobs = self._load_index_blobs(root)
+        dirty = self._dirty_files(root) if blobs is not None else None
+        if dirty is None:
+            return None
+
+        result: Dict[str, Optional[str]] = {}
+        fallback = []
+        for path in set(paths):
+            norm = path.replace("\\", "/")
+            rel = norm[len(root) + 1:] if norm.startswith(root + "/") else None
+            blob = blobs.get(rel) if rel is not None and rel not in dirty else None
+            if blob is None:
+                fallback.append(path)
+            else:
+                result[path] = blob
+
+        if fallback:
+            self.hashed += len(fallback)
+            hashed = GitService.hash_objects(root, fallback)
+            for path in fallback:
+                result[path] = hashed.get(path)
+        return result
+
+    def _dirty_files(self, root: str) -> Optional[Set[str]]:
+        with self._lock:
+            if self._runs and root in self._dirty:
+                return self._dirty[root]
+        dirty = GitService.get_dirty_files(root)
+        with self._lock:
+            if self._runs:
+                self._dirty[root] = dirty
+        return dirty
+
+    def _load_index_blobs(self, root: str) -> Optional[Dict[str, str]]:
+        """Index blob IDs, re-listed only when .git/index changes."""
+        try:
+            st = os.stat(f"{root}/.git/index")
+            index_sig = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            index_sig = None
+
+        with self._lock:
+            cached = self._index_blobs.get(root)
+            if cached is not None and index_sig is not None and cached[0] == index_sig:
+                self._index_blobs.move_to_end(root)
+                return cached[1]
+
+        blobs = GitService.get_index_blob_ids(root)
+        if blobs is not None:
+            with self._lock:
+                self._index_blobs[root] = (index_sig, blobs)
+                self._index_blobs.move_to_end(root)
+                while len(self._index_blobs) > INDEX_BLOB_REPOS:
+                    self._index_blobs.popitem(last=False)
+        return blobs
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+    @staticmethod
+    def _sha256(path: str) -> Optional[str]:
+        try:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+            return h.hexdigest()
+        except OSError:
+            return None
+
+    def _hash_parallel(self, paths) -> Dict[str, Optional[str]]:
+        self.hashed += len(paths)
+        if len(paths) == 1 or self.max_workers == 1:
+            return {p: self._sha256(p) for p in paths}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as pool:
+            return dict(zip(paths, pool.map(self._sha256, paths)))
+
+    def _load(self, paths) -> Dict[str, Tuple[Tuple[int, int, int], str]]:
+        found = {}
+        try:
+            for i in range(0, len(paths), _SQL_CHUNK):
+                chunk = paths[i:i + _SQL_CHUNK]
+                rows = self.db.fetchall(
+                    f"SELECT path, size, mtime_ns, inode, hash FROM file_hashes WHERE path IN ({','.join('?' * len(chunk))})",
+                    tuple(chunk)
+                )
+                for r in rows:
+                    found[r["path"]] = ((r["size"], r["mtime_ns"], r["inode"]), r["hash"])
+        except Exception as e:
+            logger.warning(f"Could not read persisted file hashes: {e}")
+        return found
+
+    def _store(self, rows):
+        if not rows:
+            return
+        try:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, inode, hash) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        except Exception as e:
+            # The cache is an optimization; never fail the analysis over it
+            logger.warning(f"Could not persist {len(rows)} file hashes: {e}")
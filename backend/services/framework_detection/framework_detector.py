@@ -1,38 +1,37 @@
 import os
 
+from services.discovery.repo_file_index import RepoFileIndex
+
 
 class FrameworkDetector:
 
     @staticmethod
-    def detect(repo_root, language):
+    def detect(repo_root, language, file_index: RepoFileIndex = None):
 
         if language == "java":
-            return FrameworkDetector._detect_java(repo_root)
+            return FrameworkDetector._detect_java(repo_root, file_index)
 
         if language == "typescript":
             return FrameworkDetector._detect_ts(repo_root)
 
         if language == "python":
-            return FrameworkDetector._detect_python(repo_root)
+            return FrameworkDetector._detect_python(repo_root, file_index)
 
         return "unknown"
 
     @staticmethod
-    def _detect_java(repo_root):
-        skip_dirs = {".git", "node_modules", "venv", "target", "build", "dist", "bin", "obj"}
-        for root, dirs, files in os.walk(repo_root):
-            dirs[:] = [d for d in dirs if d not in skip_dirs]
-            for file in files:
-                if file.endswith(".java"):
-                    try:
-                        with open(os.path.join(root, file), encoding="utf-8", errors="ignore") as f:
-                            content = f.read(16384) # Read first 16KB only for detection
-                            if "org.junit" in content:
-                                return "JUnit"
-                            if "org.testng" in content:
-                                return "TestNG"
-                    except Exception:
-                        continue
+    def _detect_java(repo_root, file_index: RepoFileIndex = None):
+        file_index = file_index if file_index is not None else RepoFileIndex.build(repo_root)
+        for path in file_index.paths(".java"):
+            try:
+                with open(path, encoding="utf-8", errors="ignore") as f:
+                    content = f.read(16384) # Read first 16KB only for detection
+                    if "org.junit" in content:
+                        return "JUnit"
+                    if "org.testng" in content:
+                        return "TestNG"
+            except Exception:
+                continue
         return "unknown"
 
     @staticmethod
@@ -51,17 +50,14 @@ class FrameworkDetector:
         return "unknown"
 
     @staticmethod
-    def _detect_python(repo_root):
-        skip_dirs = {".git", "node_modules", "venv", "target", "build", "dist", "bin", "obj"}
-        for root, dirs, files in os.walk(repo_root):
-            dirs[:] = [d for d in dirs if d not in skip_dirs]
-            for file in files:
-                if file.endswith(".py"):
-                    try:
-                        with open(os.path.join(root, file), encoding="utf-8", errors="ignore") as f:
-                            content = f.read(16384)
-                            if "pytest" in content:
-                                return "PyTest"
-                    except Exception:
-                        continue
+    def _detect_python(repo_root, file_index: RepoFileIndex = None):
+        file_index = file_index if file_index is not None else RepoFileIndex.build(repo_root)
+        for path in file_index.paths(".py"):
+            try:
+                with open(path, encoding="utf-8", errors="ignore") as f:
+                    content = f.read(16384)
+                    if "pytest" in content:
+                        return "PyTest"
+            except Exception:
+                continue
         return "unknown"
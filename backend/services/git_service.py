@@ -2,6 +2,7 @@ import os
 import subprocess
 import tempfile
 import logging
+from typing import Dict, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
@@ -169,6 +170,144 @@ class GitService:
             logger.error(f"Failed to get HEAD commit for {repo_path}: {str(e)}")
             return ""
 
+    @staticmethod
+    def get_changed_files(repo_path: str, base_commit: str, head_commit: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Returns {relative_path: status} for files that differ between `base_commit`
+        and the working tree (or `head_commit` if given), where status is 'A' (added),
+        'M' (modified) or 'D' (deleted). Without `head_commit`, untracked files are
+        reported as added. Returns None if git cannot compute the diff.
+        """
+        try:
+            revisions = [base_commit, head_commit] if head_commit else [base_commit]
+            result = subprocess.run(
+                ["git", "diff", "--name-status", "--no-renames", "--relative", "-z", *revisions, "--"],
+                cwd=repo_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=60
+            )
+            if result.returncode != 0:
+                logger.warning(f"git diff from {base_commit} failed in {repo_path}: {result.stderr.strip()}")
+                return None
+
+            changes = {}
+            parts = result.stdout.split("\0")
+            for status, path in zip(parts[0::2], parts[1::2]):
+                if not path:
+                    continue
+                # Type changes and the like are treated as modifications
+                changes[path] = status[:1] if status[:1] in ("A", "D") else "M"
+
+            if head_commit:
+                return changes
+
+            untracked = subprocess.run(
+                ["git", "ls-files", "--others", "--exclude-standard", "-z"],
+                cwd=repo_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=60
+            )
+            if untracked.returncode == 0:
+                for path in untracked.stdout.split("\0"):
+                    if path:
+                        changes[path] = "A"
+
+            return changes
+        except Exception as e:
+            logger.error(f"Failed to diff {repo_path} against {base_commit}: {str(e)}")
+            return None
+
+    @staticmethod
+    def get_index_blob_ids(repo_path: str) -> Optional[Dict[str, str]]:
+        """
+        Returns {relative_path: blob_id} for every file staged in the index
+        (one `git ls-files -s` call). Returns None if repo_path is not a git work tree.
+        """
+        try:
+            result = subprocess.run(
+                ["git", "ls-files", "-s", "-z"],
+                cwd=repo_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=120
+            )
+            if result.returncode != 0:
+                return None
+
+            blobs = {}
+            for record in result.stdout.split("\0"):
+                if not record:
+                    continue
+                # "<mode> <blob> <stage>\t<path>"
+                info, _, path = record.partition("\t")
+                mode, blob, stage = info.split(" ")
+                # Skip submodules (gitlinks) and unmerged entries
+                if mode == "160000" or stage != "0":
+                    continue
+                blobs[path] = blob
+            return blobs
+        except Exception as e:
+            logger.error(f"Failed to list index blobs for {repo_path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def get_dirty_files(repo_path: str) -> Optional[Set[str]]:
+        """
+        Returns relative paths whose working-tree content may differ from the index:
+        modified tracked files plus untracked, non-ignored files.
+        """
+        try:
+            dirty = set()
+            for cmd in (["git", "diff-files", "--name-only", "--relative", "-z"],
+                        ["git", "ls-files", "--others", "--exclude-standard", "-z"]):
+                result = subprocess.run(
+                    cmd,
+                    cwd=repo_path,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    timeout=120
+                )
+                if result.returncode != 0:
+                    return None
+                dirty.update(p for p in result.stdout.split("\0") if p)
+            return dirty
+        except Exception as e:
+            logger.error(f"Failed to list dirty files for {repo_path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def hash_objects(repo_path: str, paths: List[str]) -> Dict[str, str]:
+        """
+        Returns {path: blob_id} computed from the working-tree content of `paths`
+        with a single `git hash-object --stdin-paths` call. Unreadable paths are omitted.
+        """
+        readable = [p for p in paths if os.path.isfile(p) and "\n" not in p]
+        if not readable:
+            return {}
+        try:
+            result = subprocess.run(
+                ["git", "hash-object", "--stdin-paths"],
+                cwd=repo_path,
+                input="\n".join(readable) + "\n",
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=300
+            )
+            if result.returncode != 0:
+                logger.warning(f"git hash-object failed in {repo_path}: {result.stderr.strip()}")
+                return {}
+            return dict(zip(readable, result.stdout.split()))
+        except Exception as e:
+            logger.error(f"Failed to hash objects in {repo_path}: {str(e)}")
+            return {}
+
     @staticmethod
     def init_repo(repo_path: str) -> bool:
         """
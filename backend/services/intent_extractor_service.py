@@ -3,7 +3,9 @@ import ast
 import json
 import glob
 import hashlib
+import threading
 import requests
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 
@@ -11,6 +13,9 @@ from openai import OpenAI
 
 from database.db import Database
 from services.llm_enrichment_service import LLMEnrichmentService
+from services.ast_parsing.parse_cache import ParseCache, TREE_SITTER_JAVA
+from services.ast_parsing.tree_sitter_queries import capture_nodes
+from services.file_hash_service import FileHashService
 
 
 # ===============================
@@ -21,6 +26,13 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 MODEL = "gpt-4o-mini"  # Small deterministic model
 USE_LLM = True         # LLM enrichment enabled
 
+# Sessions whose workspace index is kept in memory between intent runs
+WORKSPACE_INDEX_SESSIONS = int(os.getenv("WORKSPACE_INDEX_SESSIONS", "4"))
+
+# Cap of the extractor's source/tree cache. It only holds files being expanded
+# (features, Page Objects), so it stays small however large the workspace is.
+INTENT_PARSE_CACHE_BYTES = int(os.getenv("INTENT_PARSE_CACHE_MB", "32")) * 1024 * 1024
+
 VOLATILE_FIELDS = {
     "extraction_version",
     "generated_at",
@@ -198,29 +210,227 @@ LIFECYCLE_ORDER = ['beforeAll', 'beforeClass', 'beforeEach', 'test', 'afterEach'
 # LAYER 1 — AST EXTRACTION
 # ===============================
 
+class MethodSpan:
+    """
+    Where an indexed method is declared. Its tree-sitter node is re-parsed on
+    demand (ASTExtractor.materialize_method), so the index does not keep
+    parsed trees or source buffers alive.
+    """
+
+    __slots__ = ("file_path", "start_byte", "end_byte")
+
+    def __init__(self, file_path: str, start_byte: int, end_byte: int):
+        self.file_path = file_path
+        self.start_byte = start_byte
+        self.end_byte = end_byte
+
+
+class MethodSymbols:
+    """
+    Declared types of the names visible in one method. Locals are kept per
+    declaration with the byte range of the scope that declares them, so sibling
+    blocks may reuse a name with different types; parameters and the indexed
+    fields of the enclosing classes answer for everything else.
+    """
+
+    __slots__ = ("members", "locals")
+
+    def __init__(self):
+        # name -> type for parameters and fields (parameters shadow fields)
+        self.members: Dict[str, str] = {}
+        # name -> [(scope_start, scope_end, declared_at, type)]
+        self.locals: Dict[str, List[Tuple[int, int, int, str]]] = {}
+
+    def declare_local(self, name: str, scope, declared_at: int, type_name: str):
+        self.locals.setdefault(name, []).append((scope.start_byte, scope.end_byte, declared_at, type_name))
+
+    def lookup(self, name: str, position: int) -> Optional[str]:
+        """Type of `name` as seen at byte `position`: the nearest local
+        declared before it in an enclosing scope, else a parameter or field."""
+        nearest = None
+        for scope_start, scope_end, declared_at, type_name in self.locals.get(name, ()):
+            if scope_start <= position < scope_end and declared_at <= position:
+                if nearest is None or declared_at > nearest[0]:
+                    nearest = (declared_at, type_name)
+        if nearest is not None:
+            return nearest[1]
+        return self.members.get(name)
+
+
 class WorkspaceIndex:
     """Index of all classes, fields, and methods in the workspace for cross-file resolution."""
 
+    __slots__ = ("class_to_file", "class_locators", "class_methods", "class_fields", "class_parents", "_lower_names")
+
     def __init__(self):
         # class_name -> file_path
         self.class_to_file: Dict[str, str] = {}
         # class_name -> {field_name -> {strategy, value}}
         self.class_locators: Dict[str, Dict[str, Dict[str, str]]] = {}
-        # class_name -> {method_name -> tree-sitter node}
-        self.class_methods: Dict[str, Dict[str, Any]] = {}
-        # class_name -> source code bytes
-        self.class_sources: Dict[str, bytes] = {}
+        # class_name -> {method_name -> MethodSpan}
+        self.class_methods: Dict[str, Dict[str, MethodSpan]] = {}
+        # class_name -> {field_name -> declared type}
+        self.class_fields: Dict[str, Dict[str, str]] = {}
         # class_name -> parent_class_name
         self.class_parents: Dict[str, str] = {}
+        # lowercased class_name -> class_name, built on first lookup
+        self._lower_names: Optional[Dict[str, str]] = None
+
+    def class_by_lower_name(self, name: str) -> Optional[str]:
+        """Indexed class whose name matches `name` case-insensitively (the first indexed wins)."""
+        if self._lower_names is None:
+            self._lower_names = {}
+            for class_name in self.class_to_file:
+                self._lower_names.setdefault(class_name.lower(), class_name)
+        return self._lower_names.get(name.lower())
+
+    def merge(self, other: "WorkspaceIndex"):
+        """Add the entries of `other`, as if its files had been indexed after this index's."""
+        self.class_to_file.update(other.class_to_file)
+        self._lower_names = None
+        for class_name, locators in other.class_locators.items():
+            self.class_locators.setdefault(class_name, {}).update(locators)
+        for class_name, methods in other.class_methods.items():
+            self.class_methods.setdefault(class_name, {}).update(methods)
+        for class_name, fields in other.class_fields.items():
+            self.class_fields.setdefault(class_name, {}).update(fields)
+        self.class_parents.update(other.class_parents)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "class_to_file": self.class_to_file,
+            "class_locators": self.class_locators,
+            "class_methods": {
+                c: {m: [s.file_path, s.start_byte, s.end_byte] for m, s in methods.items()}
+                for c, methods in self.class_methods.items()
+            },
+            "class_fields": self.class_fields,
+            "class_parents": self.class_parents,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkspaceIndex":
+        index = cls()
+        index.class_to_file = data["class_to_file"]
+        index.class_locators = data["class_locators"]
+        index.class_methods = {
+            c: {m: MethodSpan(*span) for m, span in methods.items()}
+            for c, methods in data["class_methods"].items()
+        }
+        index.class_fields = data.get("class_fields", {})
+        index.class_parents = data["class_parents"]
+        return index
+
+
+class WorkspaceIndexCache:
+    """
+    WorkspaceIndex per session, kept between intent runs.
+
+    Each file's part of the index is stored with the content hash it was
+    built from (FileHashService, so unchanged files are not even re-read).
+    A refresh re-parses only new or changed files, drops deleted ones and
+    re-merges the parts, so the whole workspace is parsed once per session
+    instead of once per feature. The least recently used session is dropped
+    beyond `max_sessions`.
+
+    With a `db`, parts are also persisted in `workspace_index_parts`, so a
+    session evicted from memory or a restarted server re-parses nothing
+    that is unchanged.
+    """
+
+    def __init__(self, file_hashes: FileHashService, max_sessions: int = WORKSPACE_INDEX_SESSIONS,
+                 db: Optional[Database] = None):
+        self.file_hashes = file_hashes
+        self.max_sessions = max(1, max_sessions)
+        self.db = db
+        # session_id -> {file_path: (content hash, file's part of the index)}
+        self._parts: "OrderedDict[str, Dict[str, Tuple[Optional[str], Optional[WorkspaceIndex]]]]" = OrderedDict()
+        self._indexes: Dict[str, WorkspaceIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, workspace_files: List[str], extractor: "ASTExtractor",
+            workspace_root: str = None) -> WorkspaceIndex:
+        java_files = [f for f in workspace_files if f.endswith('.java')]
+        hashes = self.file_hashes.hash_files(java_files, workspace_root)
+
+        with self._lock:
+            previous = self._parts.pop(session_id, None)
+            if previous is None:
+                previous = self._load(session_id)
+            parts = {}
+            reindexed = []
+            for path in java_files:
+                cached = previous.get(path)
+                digest = hashes.get(path)
+                if cached is not None and digest is not None and cached[0] == digest:
+                    parts[path] = cached
+                else:
+                    parts[path] = (digest, extractor.index_java_file(path))
+                    reindexed.append(path)
+
+            index = self._indexes.get(session_id)
+            if index is None or reindexed or list(parts) != list(previous):
+                index = WorkspaceIndex()
+                for _, part in parts.values():
+                    if part is not None:
+                        index.merge(part)
+                self._indexes[session_id] = index
+
+            self._parts[session_id] = parts
+            while len(self._parts) > self.max_sessions:
+                evicted, _ = self._parts.popitem(last=False)
+                self._indexes.pop(evicted, None)
+
+            self._save(session_id, parts, reindexed, set(previous) - set(parts))
+
+        logger.info(f"[Workspace Index] session {session_id}: {len(reindexed)}/{len(java_files)} files re-indexed")
+        return index
+
+    def invalidate(self, session_id: str):
+        with self._lock:
+            self._parts.pop(session_id, None)
+            self._indexes.pop(session_id, None)
+            if self.db is not None:
+                self.db.execute("DELETE FROM workspace_index_parts WHERE session_id = ?", (session_id,))
+
+    def _load(self, session_id: str) -> Dict[str, Tuple[Optional[str], Optional[WorkspaceIndex]]]:
+        if self.db is None:
+            return {}
+        rows = self.db.fetchall(
+            "SELECT file_path, file_hash, data FROM workspace_index_parts WHERE session_id = ?", (session_id,)
+        )
+        return {
+            r["file_path"]: (r["file_hash"], WorkspaceIndex.from_dict(json.loads(r["data"])) if r["data"] else None)
+            for r in rows
+        }
+
+    def _save(self, session_id: str, parts, reindexed: List[str], removed: set):
+        if self.db is None or not (reindexed or removed):
+            return
+        with self.db.transaction():
+            self.db.executemany(
+                "DELETE FROM workspace_index_parts WHERE session_id = ? AND file_path = ?",
+                [(session_id, p) for p in removed]
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO workspace_index_parts (session_id, file_path, file_hash, data) VALUES (?, ?, ?, ?)",
+                [
+                    (session_id, p, parts[p][0], json.dumps(parts[p][1].to_dict()) if parts[p][1] is not None else None)
+                    for p in reindexed if parts[p][0] is not None
+                ]
+            )
 
 
 class ASTExtractor:
     """Deterministic AST extraction for Python and Java with deep Selenium analysis."""
 
-    def __init__(self):
+    def __init__(self, parse_cache: Optional[ParseCache] = None):
         self._java_parser = None
         self._java_lang = None
         self._workspace_index: Optional[WorkspaceIndex] = None
+        self._parse_cache = parse_cache or ParseCache(INTENT_PARSE_CACHE_BYTES)
+        # (path, method span, class) -> {variable name -> declared type}, per parse_files call
+        self._method_symbols: Dict[Tuple[str, int, int, Optional[str]], MethodSymbols] = {}
 
     def _init_java_parser(self):
         if not self._java_parser:
@@ -241,74 +451,116 @@ class ASTExtractor:
         if not self._java_parser:
             return
 
-        self._workspace_index = WorkspaceIndex()
+        # Fresh cache per index build
+        self._parse_cache.clear()
 
+        index = WorkspaceIndex()
         for file_path in workspace_files:
-            if not file_path.endswith('.java'):
-                continue
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    src = f.read()
-            except Exception:
-                continue
+            part = self.index_java_file(file_path)
+            if part is not None:
+                index.merge(part)
+        self._workspace_index = index
+
+    def use_workspace_index(self, index: WorkspaceIndex):
+        """Resolve cross-file references against an index built elsewhere (see WorkspaceIndexCache)."""
+        self._workspace_index = index
+
+    def index_java_file(self, file_path: str) -> Optional[WorkspaceIndex]:
+        """WorkspaceIndex of the classes declared in one Java file, or None if it cannot be read."""
+        if not file_path.endswith('.java'):
+            return None
+        self._init_java_parser()
+        if not self._java_parser:
+            return None
+        # Read and parsed outside the parse cache: indexing visits every
+        # workspace file once, and the index keeps only spans
+        try:
+            with open(file_path, 'rb') as f:
+                src_bytes = f.read()
+            src = src_bytes.decode('utf-8')
+        except Exception:
+            return None
+
+        tree = self._java_parser.parse(src_bytes)
+        index = WorkspaceIndex()
+        self._index_java_file(index, file_path, src, tree.root_node)
+        return index
 
-            src_bytes = src.encode('utf-8')
-            tree = self._java_parser.parse(src_bytes)
-            root = tree.root_node
+    def materialize_method(self, span: MethodSpan) -> Optional[Tuple[str, Any]]:
+        """
+        (source text, method_declaration node) of an indexed method. The tree
+        comes from the parse cache, which bounds how many stay in memory.
+        None if the file is gone or no longer has a method at that span.
+        """
+        self._init_java_parser()
+        if not self._java_parser:
+            return None
+        try:
+            src = self._parse_cache.read(span.file_path).decode('utf-8')
+        except Exception:
+            return None
+        tree = self._parse_cache.parse(span.file_path, TREE_SITTER_JAVA, self._java_parser.parse)
 
-            self._index_java_file(file_path, src, src_bytes, root)
+        node = tree.root_node.descendant_for_byte_range(span.start_byte, span.end_byte)
+        while node is not None and not (
+            node.type == 'method_declaration'
+            and node.start_byte == span.start_byte and node.end_byte == span.end_byte
+        ):
+            node = node.parent
+        return (src, node) if node is not None else None
 
-    def _index_java_file(self, file_path: str, src: str, src_bytes: bytes, root):
+    def _index_java_file(self, index: WorkspaceIndex, file_path: str, src: str, root):
         """Index a single Java file for classes, locator fields, and methods."""
-        for node in self._walk_nodes(root):
-            if node.type == 'class_declaration':
-                name_node = node.child_by_field_name('name')
-                if not name_node:
-                    continue
-                class_name = src[name_node.start_byte:name_node.end_byte]
-
-                self._workspace_index.class_to_file[class_name] = file_path
-                self._workspace_index.class_sources[class_name] = src_bytes
-                self._workspace_index.class_locators.setdefault(class_name, {})
-                self._workspace_index.class_methods.setdefault(class_name, {})
-
-                # Check for superclass
-                superclass_node = node.child_by_field_name('superclass')
-                if superclass_node:
-                    # superclass is a "type_identifier" or "superclass" node
-                    super_text = src[superclass_node.start_byte:superclass_node.end_byte]
-                    # Remove "extends " prefix if present
-                    if super_text.startswith('extends '):
-                        super_text = super_text[8:].strip()
-                    # Handle generic types like "extends BasePage"
-                    if '<' in super_text:
-                        super_text = super_text[:super_text.index('<')]
-                    self._workspace_index.class_parents[class_name] = super_text.strip()
-
-                # Index fields and methods within the class body
-                body_node = node.child_by_field_name('body')
-                if body_node:
-                    self._index_class_body(class_name, src, src_bytes, body_node)
-
-    def _index_class_body(self, class_name: str, src: str, src_bytes: bytes, body_node):
+        for node in capture_nodes('java', root, 'classes', 'class'):
+            name_node = node.child_by_field_name('name')
+            if not name_node:
+                continue
+            class_name = src[name_node.start_byte:name_node.end_byte]
+
+            index.class_to_file[class_name] = file_path
+            index.class_locators.setdefault(class_name, {})
+            index.class_methods.setdefault(class_name, {})
+            index.class_fields.setdefault(class_name, {})
+
+            # Check for superclass
+            superclass_node = node.child_by_field_name('superclass')
+            if superclass_node:
+                # superclass is a "type_identifier" or "superclass" node
+                super_text = src[superclass_node.start_byte:superclass_node.end_byte]
+                # Remove "extends " prefix if present
+                if super_text.startswith('extends '):
+                    super_text = super_text[8:].strip()
+                # Handle generic types like "extends BasePage"
+                if '<' in super_text:
+                    super_text = super_text[:super_text.index('<')]
+                index.class_parents[class_name] = super_text.strip()
+
+            # Index fields and methods within the class body
+            body_node = node.child_by_field_name('body')
+            if body_node:
+                self._index_class_body(index, file_path, class_name, src, body_node)
+
+    def _index_class_body(self, index: WorkspaceIndex, file_path: str, class_name: str, src: str, body_node):
         """Index fields and methods within a class body."""
         for child in body_node.children:
             # Index field declarations with By.xxx(...) locators
             if child.type == 'field_declaration':
-                self._index_locator_field(class_name, src, child)
+                self._index_locator_field(index, class_name, src, child)
+                type_node = child.child_by_field_name('type')
+                if type_node:
+                    for name, _ in self._declared_names(src, child):
+                        index.class_fields[class_name][name] = self._type_name(src, type_node)
 
             # Index method declarations
             if child.type == 'method_declaration':
                 name_node = child.child_by_field_name('name')
                 if name_node:
                     method_name = src[name_node.start_byte:name_node.end_byte]
-                    self._workspace_index.class_methods[class_name][method_name] = {
-                        'node': child,
-                        'src': src,
-                        'src_bytes': src_bytes,
-                    }
+                    index.class_methods[class_name][method_name] = MethodSpan(
+                        file_path, child.start_byte, child.end_byte
+                    )
 
-    def _index_locator_field(self, class_name: str, src: str, field_node):
+    def _index_locator_field(self, index: WorkspaceIndex, class_name: str, src: str, field_node):
         """Extract By.xpath/id/css locator from a field declaration."""
         # Look for pattern: By.xpath("...") or By.id("..."), etc.
         declarators = [c for c in field_node.children if c.type == 'variable_declarator']
@@ -321,7 +573,7 @@ class ASTExtractor:
             field_name = src[name_node.start_byte:name_node.end_byte]
             locator = self._extract_by_locator(src, value_node)
             if locator:
-                self._workspace_index.class_locators[class_name][field_name] = locator
+                index.class_locators[class_name][field_name] = locator
 
     def _extract_by_locator(self, src: str, node) -> Optional[Dict[str, str]]:
         """Extract a By.xxx("value") locator from an expression node."""
@@ -369,17 +621,12 @@ class ASTExtractor:
                         return self._extract_first_string_arg(src, inner_args)
         return None
 
-    def _walk_nodes(self, node):
-        """Generator to walk all nodes in a tree-sitter tree."""
-        yield node
-        for child in node.children:
-            yield from self._walk_nodes(child)
-
     # ----------------------------------------------------------
     # Main entry point
     # ----------------------------------------------------------
 
     def parse_files(self, file_paths):
+        self._method_symbols = {}
         raw_model = {
             'raw_steps': [],
             'assertions': [],
@@ -392,8 +639,7 @@ class ASTExtractor:
 
         for path in file_paths:
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    src = f.read()
+                src = self._parse_cache.read(path).decode('utf-8')
             except Exception:
                 continue
 
@@ -485,17 +731,16 @@ class ASTExtractor:
             return
 
         src_bytes = src.encode('utf-8')
-        tree = self._java_parser.parse(src_bytes)
+        tree = self._parse_cache.parse(path, TREE_SITTER_JAVA, self._java_parser.parse)
         root = tree.root_node
 
         # Find the class in this file
         current_class = None
-        for node in self._walk_nodes(root):
-            if node.type == 'class_declaration':
-                name_node = node.child_by_field_name('name')
-                if name_node:
-                    current_class = src[name_node.start_byte:name_node.end_byte]
-                break
+        for node in capture_nodes('java', root, 'classes', 'class'):
+            name_node = node.child_by_field_name('name')
+            if name_node:
+                current_class = src[name_node.start_byte:name_node.end_byte]
+            break
 
         # Collect lifecycle hooks from annotations
         self._extract_lifecycle_hooks_from_tree(path, src, root, result)
@@ -511,64 +756,66 @@ class ASTExtractor:
             parent = self._workspace_index.class_parents.get(current_class)
             if parent and parent in self._workspace_index.class_methods:
                 parent_file = self._workspace_index.class_to_file.get(parent, '')
-                parent_src = self._workspace_index.class_sources.get(parent, b'').decode('utf-8', errors='replace')
-                # Parse parent for lifecycle hooks
-                parent_tree = self._java_parser.parse(self._workspace_index.class_sources.get(parent, b''))
-                self._extract_lifecycle_hooks_from_tree(parent_file, parent_src, parent_tree.root_node, result)
+                # Parse parent for lifecycle hooks (often still in the parse cache from the index build)
+                try:
+                    parent_src = self._parse_cache.read(parent_file).decode('utf-8', errors='replace')
+                    parent_tree = self._parse_cache.parse(parent_file, TREE_SITTER_JAVA, self._java_parser.parse)
+                except OSError:
+                    parent_tree = None
+                if parent_tree is not None:
+                    self._extract_lifecycle_hooks_from_tree(parent_file, parent_src, parent_tree.root_node, result)
 
         # Find @Test methods and extract their bodies
         self._extract_test_methods(path, src, src_bytes, root, result, current_class)
 
     def _extract_locator_fields_from_tree(self, path: str, src: str, root, result):
         """Extract By.xxx(...) locator field declarations from the file."""
-        for node in self._walk_nodes(root):
-            if node.type == 'field_declaration':
-                declarators = [c for c in node.children if c.type == 'variable_declarator']
-                for decl in declarators:
-                    name_node = decl.child_by_field_name('name')
-                    value_node = decl.child_by_field_name('value')
-                    if not name_node or not value_node:
-                        continue
+        for node in capture_nodes('java', root, 'fields', 'field'):
+            declarators = [c for c in node.children if c.type == 'variable_declarator']
+            for decl in declarators:
+                name_node = decl.child_by_field_name('name')
+                value_node = decl.child_by_field_name('value')
+                if not name_node or not value_node:
+                    continue
 
-                    field_name = src[name_node.start_byte:name_node.end_byte]
-                    locator = self._extract_by_locator(src, value_node)
-                    if locator:
-                        result['locators'].append({
-                            'field_name': field_name,
-                            'strategy': locator['strategy'],
-                            'value': locator['value'],
-                            'file': path,
-                        })
+                field_name = src[name_node.start_byte:name_node.end_byte]
+                locator = self._extract_by_locator(src, value_node)
+                if locator:
+                    result['locators'].append({
+                        'field_name': field_name,
+                        'strategy': locator['strategy'],
+                        'value': locator['value'],
+                        'file': path,
+                    })
 
     def _extract_lifecycle_hooks_from_tree(self, path: str, src: str, root, result):
         """Extract lifecycle hooks by finding annotated methods."""
-        for node in self._walk_nodes(root):
-            if node.type == 'method_declaration':
-                # Check annotations above this method
-                annotations = self._get_method_annotations(src, node)
-                for annot_text in annotations:
-                    # Normalize: strip parameters like @BeforeSuite(alwaysRun = true)
-                    annot_base = annot_text.split('(')[0].strip()
-                    if annot_base in LIFECYCLE_ANNOTATIONS:
-                        hook_type = LIFECYCLE_ANNOTATIONS[annot_base]
-                        method_name_node = node.child_by_field_name('name')
-                        method_name = src[method_name_node.start_byte:method_name_node.end_byte] if method_name_node else 'unknown'
-
-                        # Infer what the hook does from method body
-                        hook_action = self._infer_lifecycle_action(src, node, method_name, hook_type)
-
-                        # Avoid duplicate hooks (compound key)
-                        hook_key = (hook_type, method_name, hook_action)
-                        if any((h['type'], h['method'], h['action']) == hook_key for h in result['lifecycle_hooks']):
-                            continue
-
-                        hook_entry = {
-                            'type': hook_type,
-                            'method': method_name,
-                            'action': hook_action,
-                            'file': path,
-                        }
-                        result['lifecycle_hooks'].append(hook_entry)
+        for node in capture_nodes('java', root, 'methods', 'method'):
+            # Check annotations above this method
+            annotations = self._get_method_annotations(src, node)
+            for annot_text in annotations:
+                # Normalize: strip parameters like @BeforeSuite(alwaysRun = true)
+                annot_base = annot_text.split('(')[0].strip()
+                if annot_base in LIFECYCLE_ANNOTATIONS:
+                    hook_type = LIFECYCLE_ANNOTATIONS[annot_base]
+                    method_name_node = node.child_by_field_name('name')
+                    method_name = src[method_name_node.start_byte:method_name_node.end_byte] if method_name_node else 'unknown'
+
+                    # Infer what the hook does from method body
+                    hook_action = self._infer_lifecycle_action(src, node, method_name, hook_type)
+
+                    # Avoid duplicate hooks (compound key)
+                    hook_key = (hook_type, method_name, hook_action)
+                    if any((h['type'], h['method'], h['action']) == hook_key for h in result['lifecycle_hooks']):
+                        continue
+
+                    hook_entry = {
+                        'type': hook_type,
+                        'method': method_name,
+                        'action': hook_action,
+                        'file': path,
+                    }
+                    result['lifecycle_hooks'].append(hook_entry)
 
     def _get_method_annotations(self, src: str, method_node) -> List[str]:
         """Get annotation strings for a method declaration."""
@@ -612,21 +859,20 @@ class ASTExtractor:
 
     def _extract_test_methods(self, path: str, src: str, src_bytes: bytes, root, result, current_class: str):
         """Find @Test methods and deeply extract their actions."""
-        for node in self._walk_nodes(root):
-            if node.type == 'method_declaration':
-                annotations = self._get_method_annotations(src, node)
-                is_test = any('@Test' in a for a in annotations)
-                if not is_test:
-                    continue
+        for node in capture_nodes('java', root, 'methods', 'method'):
+            annotations = self._get_method_annotations(src, node)
+            is_test = any('@Test' in a for a in annotations)
+            if not is_test:
+                continue
 
-                # Extract all actions from this test method body
-                body = node.child_by_field_name('body')
-                if body:
-                    self._extract_actions_from_body(
-                        path, src, body, result,
-                        current_class=current_class,
-                        depth=0
-                    )
+            # Extract all actions from this test method body
+            body = node.child_by_field_name('body')
+            if body:
+                self._extract_actions_from_body(
+                    path, src, body, result,
+                    current_class=current_class,
+                    depth=0
+                )
 
     def _extract_actions_from_body(self, path: str, src: str, body_node,
                                     result, current_class: str = None,
@@ -640,7 +886,7 @@ class ASTExtractor:
             return
 
         # Use a list of statements/nodes to process in order
-        # We don't use _walk_nodes flat here because we want to control the recursion order
+        # We don't use a flat query capture here because we want to control the recursion order
         # to preserve AST execution order (e.g. for fluent APIs and sequential statements)
         
         for node in body_node.children:
@@ -891,18 +1137,19 @@ class ASTExtractor:
         if self._workspace_index and depth < 5:
             resolved_class = None
             if obj_node:
-                resolved_class = self._resolve_object_class(src, obj_node, body_node, current_class)
+                resolved_class = self._resolve_object_class(path, src, obj_node, body_node, current_class)
             else:
                 if current_class and method_name in self._workspace_index.class_methods.get(current_class, {}):
                     resolved_class = current_class
             
             if resolved_class and resolved_class in self._workspace_index.class_methods:
-                method_info = self._workspace_index.class_methods[resolved_class].get(method_name)
+                span = self._workspace_index.class_methods[resolved_class].get(method_name)
+                method_info = self.materialize_method(span) if span else None
                 if method_info:
-                    po_src = method_info['src']
-                    po_node = method_info['node']
+                    po_src, po_node = method_info
                     po_body = po_node.child_by_field_name('body')
-                    po_file = self._workspace_index.class_to_file.get(resolved_class, path)
+                    # The file the method body came from, which class_to_file may not name
+                    po_file = span.file_path
                     if po_body:
                         self._extract_actions_from_body(
                             po_file, po_src, po_body, result,
@@ -915,12 +1162,12 @@ class ASTExtractor:
                 # Also check parent class methods
                 parent_class = self._workspace_index.class_parents.get(resolved_class)
                 if parent_class and parent_class in self._workspace_index.class_methods:
-                    method_info = self._workspace_index.class_methods[parent_class].get(method_name)
+                    span = self._workspace_index.class_methods[parent_class].get(method_name)
+                    method_info = self.materialize_method(span) if span else None
                     if method_info:
-                        po_src = method_info['src']
-                        po_node = method_info['node']
+                        po_src, po_node = method_info
                         po_body = po_node.child_by_field_name('body')
-                        po_file = self._workspace_index.class_to_file.get(parent_class, path)
+                        po_file = span.file_path
                         if po_body:
                             self._extract_actions_from_body(
                                 po_file, po_src, po_body, result,
@@ -1004,13 +1251,14 @@ class ASTExtractor:
 
         return None
 
-    def _resolve_object_class(self, src: str, obj_node, body_node, current_class: str = None) -> Optional[str]:
+    def _resolve_object_class(self, path: str, src: str, obj_node, body_node, current_class: str = None) -> Optional[str]:
         """
         Resolve the class of an object reference.
         For example, in `loginPage.loginToApplication(...)`, resolve loginPage → LoginPage.
 
         Strategy:
-        1. Look for local variable declarations like `LoginPage loginPage = new LoginPage(...)`
+        1. Look up the declared type in the method's symbol table (locals like
+           `LoginPage loginPage = new LoginPage(...)`, parameters, class fields)
         2. Check if the variable name matches a known class (case-insensitive)
         """
         if not self._workspace_index:
@@ -1020,7 +1268,7 @@ class ASTExtractor:
             # Fluent API / Method chaining: resolve the object of the inner call
             inner_obj = obj_node.child_by_field_name('object')
             if inner_obj:
-                return self._resolve_object_class(src, inner_obj, body_node, current_class)
+                return self._resolve_object_class(path, src, inner_obj, body_node, current_class)
             else:
                 # Implicit 'this' in the inner call
                 return current_class
@@ -1033,33 +1281,76 @@ class ASTExtractor:
         if '.' in obj_text:
             obj_text = obj_text.split('.')[0]
 
-        # Search for a local variable declaration with this name
-        for node in self._walk_nodes(body_node):
-            if node.type == 'local_variable_declaration':
-                for child in node.children:
-                    if child.type == 'variable_declarator':
-                        var_name_node = child.child_by_field_name('name')
-                        if var_name_node:
-                            var_name = src[var_name_node.start_byte:var_name_node.end_byte]
-                            if var_name == obj_text:
-                                # Get the type
-                                type_node = None
-                                # Check siblings in parent node (local_variable_declaration)
-                                for sibling in child.parent.children:
-                                    if sibling.type in ('type_identifier', 'generic_type', 'scoped_type_identifier'):
-                                        type_node = sibling
-                                        break
-                                if type_node:
-                                    type_text = src[type_node.start_byte:type_node.end_byte]
-                                    if type_text in self._workspace_index.class_to_file:
-                                        return type_text
+        # Declared type of a local, parameter or field with this name
+        symbols = self._method_symbol_table(path, src, body_node, current_class)
+        type_name = symbols.lookup(obj_text, obj_node.start_byte)
+        if type_name in self._workspace_index.class_to_file:
+            return type_name
 
         # Fallback: try matching variable name to known classes case-insensitively
-        for class_name in self._workspace_index.class_to_file:
-            if class_name.lower() == obj_text.lower():
-                return class_name
+        return self._workspace_index.class_by_lower_name(obj_text)
 
-        return None
+    def _method_symbol_table(self, path: str, src: str, body_node, current_class: str = None) -> MethodSymbols:
+        """
+        Symbols of the method enclosing `body_node`, built in one pass and
+        memoized: each local is recorded with its declaring scope, and
+        parameters shadow the indexed fields of `current_class` and then of
+        its parent.
+        """
+        method = body_node
+        while method.parent is not None and method.type not in ('method_declaration', 'constructor_declaration'):
+            method = method.parent
+        if method.type not in ('method_declaration', 'constructor_declaration'):
+            method = body_node
+
+        key = (path, method.start_byte, method.end_byte, current_class)
+        symbols = self._method_symbols.get(key)
+        if symbols is not None:
+            return symbols
+
+        symbols = MethodSymbols()
+        index = self._workspace_index
+        parent = index.class_parents.get(current_class) if current_class else None
+        for owner in (parent, current_class):
+            if owner:
+                symbols.members.update(index.class_fields.get(owner, {}))
+
+        params = method.child_by_field_name('parameters')
+        if params:
+            for param in params.children:
+                type_node = param.child_by_field_name('type')
+                name_node = param.child_by_field_name('name')
+                if param.type == 'formal_parameter' and type_node and name_node:
+                    symbols.members[src[name_node.start_byte:name_node.end_byte]] = self._type_name(src, type_node)
+
+        # A local is visible from its declaration to the end of the enclosing
+        # block (or of the for statement that declares it)
+        for node in capture_nodes('java', method, 'local_variables', 'local_variable'):
+            type_node = node.child_by_field_name('type')
+            if not type_node:
+                continue
+            scope = node.parent if node.parent is not None else method
+            type_name = self._type_name(src, type_node)
+            for name, _ in self._declared_names(src, node):
+                symbols.declare_local(name, scope, node.start_byte, type_name)
+
+        self._method_symbols[key] = symbols
+        return symbols
+
+    @staticmethod
+    def _declared_names(src: str, declaration):
+        """(name, declarator node) of each variable declared by a field or local variable declaration."""
+        for child in declaration.children:
+            if child.type == 'variable_declarator':
+                name_node = child.child_by_field_name('name')
+                if name_node:
+                    yield src[name_node.start_byte:name_node.end_byte], child
+
+    @staticmethod
+    def _type_name(src: str, type_node) -> str:
+        """Simple class name of a declared type: `LoginPage` for `com.acme.LoginPage` or `LoginPage<T>`."""
+        text = src[type_node.start_byte:type_node.end_byte]
+        return text.split('<')[0].rsplit('.', 1)[-1].strip()
 
     def _extract_arg_text(self, src: str, args_node) -> Optional[str]:
         """Extract full text of the first argument."""
@@ -1361,10 +1652,11 @@ class IntentExtractorService:
     # ----------------------------------------------------------
 
     def process_feature(self, session_id: str, feature_id: str, file_paths: List[str],
-                        workspace_files: List[str] = None):
+                        workspace_files: List[str] = None, workspace_index: Optional[WorkspaceIndex] = None):
         """
         Full Step 9 pipeline:
-          0. Build workspace index  (cross-file resolution)
+          0. Workspace index        (cross-file resolution; pass `workspace_index`
+                                     from WorkspaceIndexCache to skip the rebuild)
           1. AST Extraction         (deterministic, deep Selenium analysis)
           2. Normalization           (canonical schema)
           3. Intent Hashing          (SHA-256)
@@ -1372,8 +1664,10 @@ class IntentExtractorService:
           5. Persist to SQLite
         """
 
-        # STEP 0 — Build workspace index for cross-file resolution
-        if workspace_files:
+        # STEP 0 — Workspace index for cross-file resolution
+        if workspace_index is not None:
+            self.ast_extractor.use_workspace_index(workspace_index)
+        elif workspace_files:
             self.ast_extractor.build_workspace_index(workspace_files)
 
         # STEP 1 — AST Extraction
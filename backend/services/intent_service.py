@@ -2,7 +2,9 @@ from typing import List, Dict, Any
 import logging
 import os
 import glob
-from services.intent_extractor_service import IntentExtractorService
+from services.intent_extractor_service import IntentExtractorService, WorkspaceIndexCache
+from services.discovery.repo_file_index import RepoFileIndex
+from services.file_hash_service import FileHashService
 from database.db import Database
 
 logger = logging.getLogger(__name__)
@@ -11,17 +13,26 @@ class IntentService:
     def __init__(self, db: Database):
         self.db = db
         self.extractor_service = IntentExtractorService(db_path=db.db_path)
+        # Built once per session, refreshed by file hash on later runs
+        self.workspace_indexes = WorkspaceIndexCache(FileHashService(db), db=db)
 
     def process_features(self, session_id: str, feature_ids: List[str]) -> List[Dict[str, Any]]:
         """
         Processes intent extraction for a list of features.
-        Discovers all workspace .java files for cross-file Page Object resolution.
+        Discovers all workspace .java files for cross-file Page Object resolution;
+        their index is built once per session and shared by every feature.
         """
         # Discover workspace root and all Java files for cross-file resolution
         workspace_root = self._find_workspace_root(session_id)
         workspace_files = self._discover_java_files(workspace_root) if workspace_root else []
         logger.info(f"Discovered {len(workspace_files)} Java files in workspace for cross-file resolution")
 
+        workspace_index = None
+        if workspace_files:
+            workspace_index = self.workspace_indexes.get(
+                session_id, workspace_files, self.extractor_service.ast_extractor, workspace_root
+            )
+
         results = []
         for feature_id in feature_ids:
             try:
@@ -42,7 +53,7 @@ class IntentService:
                     session_id=session_id,
                     feature_id=feature_id,
                     file_paths=[file_path],
-                    workspace_files=workspace_files
+                    workspace_index=workspace_index
                 )
                 results.append(result)
 
@@ -80,15 +91,7 @@ class IntentService:
         if not workspace_root:
             return []
 
-        java_files = []
-        for root, dirs, files in os.walk(workspace_root):
-            # Skip common non-source directories
-            dirs[:] = [d for d in dirs if d not in ('.git', 'node_modules', 'target', 'build', '.gradle')]
-            for f in files:
-                if f.endswith('.java'):
-                    java_files.append(os.path.join(root, f))
-
-        return java_files
+        return RepoFileIndex.build(workspace_root).paths('.java')
 
     def get_session_intents(self, session_id: str) -> List[Dict[str, Any]]:
         """
@@ -1,13 +1,15 @@
 import uuid
 import traceback
 import asyncio
-import hashlib
 import os
+import re
+import time
 from datetime import datetime
 from typing import Optional, Dict, Set, List
 
 from database.db import Database
 from services.discovery.repo_discovery import RepoDiscovery
+from services.discovery.repo_file_index import RepoFileIndex
 from services.framework_detection.framework_detector import FrameworkDetector
 from services.build_metadata.build_extractor import BuildMetadataExtractor
 
@@ -24,8 +26,14 @@ from services.feature_modeling.feature_closure_builder import FeatureClosureBuil
 from services.feature_modeling.feature_shared_mapper import FeatureSharedMapper
 from services.feature_modeling.feature_config_mapper import FeatureConfigMapper
 from services.feature_modeling.feature_hook_mapper import FeatureHookMapper
+from services.ast_parsing.byte_prefilter import BytePrefilter
+from services.dependency_analysis.config_reference_scanner import ConfigReferenceScanner
+from services.feature_modeling.feature_snapshot_hasher import FeatureSnapshotHasher
 
 from services.ast_parsing.parser_factory import ASTParserFactory
+from services.ast_parsing.parse_cache import ParseCache
+from services.git_service import GitService
+from services.file_hash_service import FileHashService
 
 
 import logging
@@ -33,29 +41,43 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Above this share of changed files an incremental run is no cheaper than a full one
+INCREMENTAL_MAX_CHANGE_RATIO = 0.3
+
+# SQLite caps the number of bound parameters per statement
+_SQL_CHUNK = 500
+
+# Features are written as they are extracted, this many per transaction
+FEATURE_BATCH_SIZE = 200
+
+# Minimum seconds between two extraction progress events
+PROGRESS_INTERVAL = 1.0
+
+
 class RepositoryAnalyzerService:
 
     def __init__(self, db: Database, ws_manager=None):
         self.db = db
         self.ws_manager = ws_manager
+        # Content hashes cached by stat signature, persisted across runs
+        self.file_hashes = FileHashService(db)
 
     # ==========================================================
     # UTILITY
     # ==========================================================
 
+    def _abs_path(self, repo_root: str, relative_path: str) -> str:
+        return os.path.join(repo_root, relative_path.replace("/", os.sep))
+
     def _compute_file_hash(self, repo_root: str, relative_path: str) -> Optional[str]:
-        """Compute SHA-256 hash of a file given its relative path within the repo."""
-        try:
-            abs_path = os.path.join(repo_root, relative_path.replace("/", os.sep))
-            if not os.path.isfile(abs_path):
-                return None
-            h = hashlib.sha256()
-            with open(abs_path, "rb") as f:
-                for chunk in iter(lambda: f.read(8192), b""):
-                    h.update(chunk)
-            return h.hexdigest()
-        except Exception:
-            return None
+        """Content hash (SHA-256 or git blob ID, see FileHashService) of a file in the repo."""
+        return self.file_hashes.hash_file(self._abs_path(repo_root, relative_path), repo_root)
+
+    def _compute_file_hashes(self, repo_root: str, relative_paths) -> Dict[str, Optional[str]]:
+        """Batch version of _compute_file_hash: {relative_path: hash}."""
+        abs_paths = {p: self._abs_path(repo_root, p) for p in set(relative_paths)}
+        hashes = self.file_hashes.hash_files(abs_paths.values(), repo_root)
+        return {p: hashes.get(a) for p, a in abs_paths.items()}
 
     # ==========================================================
     # PROGRESS EMISSION
@@ -124,29 +146,56 @@ class RepositoryAnalyzerService:
                 "data": data
             })
 
+    async def _log_prefilter(self, session_id: str, step: str, prefilter: BytePrefilter):
+        """Log how many files a stage's byte prefilter kept from being parsed."""
+        stats = prefilter.stats()
+        logger.info(f"[Prefilter] {step}: {stats}")
+        if stats["skipped"]:
+            await self._emit_log(
+                session_id,
+                f"{step}: skipped parsing {stats['skipped']}/{stats['scanned']} files ({stats['skip_rate']:.0%})"
+            )
+
     # ==========================================================
     # PUBLIC ENTRY POINT
     # ==========================================================
 
-    async def analyze(self, repo_root: str, session_id: Optional[str] = None) -> str:
+    async def analyze(self, repo_root: str, session_id: Optional[str] = None, incremental: bool = False) -> str:
+        # File hashes of this run may reuse one listing of the working tree's dirty files
+        with self.file_hashes.analysis_run():
+            return await self._analyze(repo_root, session_id, incremental)
+
+    async def _analyze(self, repo_root: str, session_id: Optional[str] = None, incremental: bool = False) -> str:
         session_id = session_id or str(uuid.uuid4())
         
         try:
+            # Must be decided before the session is flagged ANALYZING
+            changes = self._get_incremental_changes(repo_root, session_id) if incremental else None
+
             # 0. Set status to ANALYZING
             self.db.execute("UPDATE sessions SET status = 'ANALYZING' WHERE id = ?", (session_id,))
             
             # Tiny sleep to ensure WS connection from frontend is ready
             await asyncio.sleep(0.5)
-            
+
+            if changes is not None:
+                await self._analyze_incremental(repo_root, session_id, changes)
+                return session_id
+
             self._clear_old_data(session_id)
 
             # --------------------------
             # 1. Discovery
             # --------------------------
             await self._emit_progress(session_id, "Discovery", 5, "Detecting language, build system, and framework")
-            language = RepoDiscovery.detect_language(repo_root)
+            # Single walk of the repository, shared by every later stage
+            file_index = RepoFileIndex.build(repo_root)
+            # Parsed trees shared by the feature, dependency, hook and assertion stages
+            parse_cache = ParseCache()
+            await self._emit_log(session_id, f"Indexed {len(file_index)} files")
+            language = RepoDiscovery.detect_language(repo_root, file_index)
             build_system = RepoDiscovery.detect_build_system(repo_root)
-            framework = FrameworkDetector.detect(repo_root, language)
+            framework = FrameworkDetector.detect(repo_root, language, file_index)
             await self._emit_log(session_id, f"Detected: {language} / {framework} / {build_system}")
             await self._emit_step_result(session_id, "Discovery", {
                 "language": language,
@@ -172,20 +221,21 @@ class RepositoryAnalyzerService:
             # 3. Feature Extraction
             # --------------------------
             await self._emit_progress(session_id, "Feature Extraction", 25, "Scanning for test features")
-            self._process_features(session_id, language, repo_root)
+            feature_prefilter = await self._process_features(session_id, language, repo_root, file_index, parse_cache)
             feature_rows = self.db.fetchall(
                 "SELECT feature_name, file_path FROM features WHERE session_id = ?", (session_id,)
             )
             await self._emit_step_result(session_id, "Feature Extraction", {
                 "feature_count": len(feature_rows),
-                "features": [{"name": f["feature_name"], "file": f["file_path"].split("/")[-1]} for f in feature_rows]
+                "features": [{"name": f["feature_name"], "file": f["file_path"].split("/")[-1]} for f in feature_rows],
+                "prefilter": feature_prefilter
             })
 
             # --------------------------
             # 4. Dependency Analysis
             # --------------------------
             await self._emit_progress(session_id, "Dependency Analysis", 40, "Analyzing import dependencies")
-            self._process_dependencies(session_id, language, repo_root)
+            await self._process_dependencies(session_id, language, repo_root, file_index, parse_cache)
             edge_count = self.db.fetchone(
                 "SELECT COUNT(*) as cnt FROM dependency_edges WHERE session_id = ?", (session_id,)
             )["cnt"]
@@ -221,7 +271,7 @@ class RepositoryAnalyzerService:
             # 7. Config Files
             # --------------------------
             await self._emit_progress(session_id, "Config Files", 70, "Scanning configuration files")
-            config_files = self._process_config_files(session_id, repo_root)
+            config_files = self._process_config_files(session_id, repo_root, file_index)
             await self._emit_step_result(session_id, "Config Files", {
                 "config_file_count": len(config_files),
                 "config_files": [c.split("/")[-1] for c in config_files]
@@ -231,57 +281,52 @@ class RepositoryAnalyzerService:
             # 8. Feature Modeling
             # --------------------------
             await self._emit_progress(session_id, "Feature Modeling", 80, "Building feature dependency models")
-            self._build_feature_models(
+            hook_prefilter = self._build_feature_models(
                 session_id=session_id,
                 repo_root=repo_root,
                 language=language,
                 graph=graph,
                 shared_modules=shared_modules,
-                config_files=config_files
+                config_files=config_files,
+                parse_cache=parse_cache
             )
-            # Query per-feature modeling results
+            # Query per-feature modeling results (one grouped count per table)
+            dep_counts = self._count_by_feature_name("feature_dependencies", session_id)
+            shared_counts = self._count_by_feature_name("feature_shared_modules", session_id)
+            config_counts = self._count_by_feature_name("feature_config_dependencies", session_id)
             feature_model_summary = []
             for fr in feature_rows:
                 fname = fr["feature_name"]
-                dep_cnt = self.db.fetchone(
-                    "SELECT COUNT(*) as cnt FROM feature_dependencies fd JOIN features f ON fd.feature_id = f.id WHERE f.feature_name = ? AND f.session_id = ?",
-                    (fname, session_id)
-                )["cnt"]
-                shared_cnt = self.db.fetchone(
-                    "SELECT COUNT(*) as cnt FROM feature_shared_modules fsm JOIN features f ON fsm.feature_id = f.id WHERE f.feature_name = ? AND f.session_id = ?",
-                    (fname, session_id)
-                )["cnt"]
-                config_cnt = self.db.fetchone(
-                    "SELECT COUNT(*) as cnt FROM feature_config_dependencies fcd JOIN features f ON fcd.feature_id = f.id WHERE f.feature_name = ? AND f.session_id = ?",
-                    (fname, session_id)
-                )["cnt"]
                 feature_model_summary.append({
                     "feature": fname,
-                    "dependencies": dep_cnt,
-                    "shared_modules": shared_cnt,
-                    "config_deps": config_cnt
+                    "dependencies": dep_counts.get(fname, 0),
+                    "shared_modules": shared_counts.get(fname, 0),
+                    "config_deps": config_counts.get(fname, 0)
                 })
             await self._emit_step_result(session_id, "Feature Modeling", {
-                "feature_models": feature_model_summary
+                "feature_models": feature_model_summary,
+                "hook_prefilter": hook_prefilter
             })
 
             # --------------------------
             # 9. Assertions
             # --------------------------
             await self._emit_progress(session_id, "Assertions", 90, "Detecting assertion patterns")
-            self._process_assertions(session_id, language, repo_root)
+            assertion_prefilter = self._process_assertions(session_id, language, repo_root, file_index, parse_cache)
             assertion_count = self.db.fetchone(
                 "SELECT COUNT(*) as cnt FROM assertions WHERE session_id = ?", (session_id,)
             )["cnt"]
             await self._emit_step_result(session_id, "Assertions", {
-                "assertion_count": assertion_count
+                "assertion_count": assertion_count,
+                "prefilter": assertion_prefilter
             })
+            logger.info(f"[Parse Cache] {parse_cache.stats()}")
 
             # --------------------------
             # 10. Driver Model
             # --------------------------
             await self._emit_progress(session_id, "Driver Model", 95, "Detecting driver patterns")
-            self._process_driver_model(session_id, language, repo_root)
+            self._process_driver_model(session_id, language, repo_root, file_index)
             driver_row = self.db.fetchone(
                 "SELECT driver_type, initialization_pattern, thread_model FROM driver_model WHERE session_id = ?", (session_id,)
             )
@@ -297,7 +342,10 @@ class RepositoryAnalyzerService:
             await self._update_feature_statuses(session_id, repo_root)
 
             # FINAL: Set status to ANALYZED
-            self.db.execute("UPDATE sessions SET status = 'ANALYZED', progress = 100 WHERE id = ?", (session_id,))
+            self.db.execute(
+                "UPDATE sessions SET status = 'ANALYZED', progress = 100, updated_at = ? WHERE id = ?",
+                (datetime.utcnow().isoformat(), session_id)
+            )
             await self._emit_complete(session_id)
 
         except Exception as e:
@@ -310,33 +358,353 @@ class RepositoryAnalyzerService:
         return session_id
 
     # ==========================================================
-    # CLEAR
+    # INCREMENTAL ANALYSIS
     # ==========================================================
 
-    def _clear_old_data(self, session_id):
-        # Delete tests first (via feature_id, since tests table has no session_id)
-        self.db.execute(
-            "DELETE FROM tests WHERE feature_id IN (SELECT id FROM features WHERE session_id = ?)",
+    def _get_incremental_changes(self, repo_root: str, session_id: str) -> Optional[Dict[str, str]]:
+        """
+        Files changed since the commit of the last completed analysis, as returned by
+        GitService.get_changed_files, or None when a full analysis is required.
+        """
+        session = self.db.fetchone("SELECT status FROM sessions WHERE id = ?", (session_id,))
+        if not session or session["status"] != "ANALYZED":
+            return None
+
+        row = self.db.fetchone(
+            "SELECT source_commit FROM features WHERE session_id = ? AND source_commit IS NOT NULL AND source_commit != '' LIMIT 1",
+            (session_id,)
+        )
+        if not row:
+            return None
+
+        changes = GitService.get_changed_files(repo_root, row["source_commit"])
+        if changes is None:
+            return None
+
+        tracked = self.db.fetchone(
+            "SELECT COUNT(*) as cnt FROM dependency_nodes WHERE session_id = ?", (session_id,)
+        )["cnt"]
+        if len(changes) > max(tracked, 1) * INCREMENTAL_MAX_CHANGE_RATIO:
+            logger.info(f"[Incremental] {len(changes)} changed files for {tracked} tracked, running a full analysis")
+            return None
+
+        return changes
+
+    async def _analyze_incremental(self, repo_root: str, session_id: str, changes: Dict[str, str]):
+        """
+        Re-analyse only what `changes` can have affected: changed files are re-parsed,
+        their dependency nodes/edges patched in place, and feature closures rebuilt
+        only for features whose closure touches a changed file.
+        """
+        session = self.db.fetchone(
+            "SELECT language, framework, build_system FROM sessions WHERE id = ?", (session_id,)
+        )
+        language, build_system = session["language"], session["build_system"]
+
+        # --------------------------
+        # 1. Discovery
+        # --------------------------
+        await self._emit_progress(session_id, "Discovery", 5, "Collecting changes since the last analysis")
+        file_index = RepoFileIndex.build(repo_root)
+        parse_cache = ParseCache()
+        root = file_index.repo_root
+
+        # Files under skipped directories (build output, node_modules, ...) are ignored
+        changed = {f"{root}/{p}" for p, status in changes.items() if status != "D"}
+        changed = {p for p in changed if p in file_index}
+        deleted = {f"{root}/{p}" for p, status in changes.items() if status == "D"}
+        added = {f"{root}/{p}" for p, status in changes.items() if status == "A"} & changed
+
+        await self._emit_log(session_id, f"Incremental analysis: {len(changed)} changed, {len(deleted)} deleted files")
+        await self._emit_step_result(session_id, "Discovery", {
+            "language": language,
+            "framework": session["framework"],
+            "build_system": build_system,
+            "changed_files": len(changed),
+            "deleted_files": len(deleted)
+        })
+
+        # --------------------------
+        # 2. Build Metadata (a single build file, always cheap)
+        # --------------------------
+        await self._emit_progress(session_id, "Build Metadata", 15, "Extracting build dependencies")
+        self._process_build_metadata(session_id, repo_root, build_system, clear=lambda: self.db.execute(
+            "DELETE FROM build_dependencies WHERE session_id = ?", (session_id,)
+        ))
+
+        # --------------------------
+        # 3. Features in changed files
+        # --------------------------
+        await self._emit_progress(session_id, "Feature Extraction", 25, "Re-scanning changed test files")
+        stale_features = self._fetch_in(
+            "SELECT id, feature_name, file_path FROM features WHERE session_id = ? AND file_path IN ({})",
+            session_id, changed | deleted
+        )
+        with self.db.transaction():
+            self._delete_features(session_id, [f["id"] for f in stale_features])
+        # Batches commit on their own; a failure here fails the session, forcing a full re-run
+        await self._process_features(
+            session_id, language, repo_root, file_index.subset(changed), parse_cache,
+            existing_ids={(f["file_path"], f["feature_name"]): f["id"] for f in stale_features}
+        )
+
+        # --------------------------
+        # 4. Dependency Analysis
+        # --------------------------
+        await self._emit_progress(session_id, "Dependency Analysis", 40, "Re-analyzing changed files")
+        analyzer = DependencyAnalyzerFactory.get_analyzer(language, repo_root, file_index, parse_cache)
+
+        # Files importing a deleted file must drop the edge; files that may import an
+        # added file can now resolve it
+        reparse = set(changed)
+        reparse |= {r["from_file"] for r in self._fetch_in(
+            "SELECT DISTINCT from_file FROM dependency_edges WHERE session_id = ? AND to_file IN ({})",
+            session_id, deleted
+        )}
+        reparse |= self._files_mentioning(file_index, analyzer.SOURCE_EXTENSIONS, added, parse_cache)
+        reparse |= self._files_referencing_configs(file_index, analyzer.SOURCE_EXTENSIONS, added, parse_cache)
+        if any(analyzer.affects_resolution(p) for p in changed | deleted):
+            reparse |= set(file_index.paths(*analyzer.SOURCE_EXTENSIONS))
+        reparse = {p for p in reparse if p in file_index}
+
+        # Files not re-parsed are known from the previous analysis (e.g. Java packages)
+        previous_nodes = self.db.fetchall(
+            "SELECT file_path, file_type, package_name, declared_types FROM dependency_nodes WHERE session_id = ?",
             (session_id,)
         )
+        analyzer.use_previous_analysis(previous_nodes)
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, analyzer.analyze_files, sorted(reparse))
+
+        # A modified file that now declares another package or other types changes
+        # what its importers resolve to: re-parse those as well
+        previous = {n["file_path"]: n for n in previous_nodes}
+        redeclared = {
+            p for p in changed - added
+            if p in results and p in previous and (
+                results[p]["package"] != previous[p]["package_name"]
+                or self._declared_types(results[p]) != previous[p]["declared_types"]
+            )
+        }
+        if redeclared:
+            dependents = {r["from_file"] for r in self._fetch_in(
+                "SELECT DISTINCT from_file FROM dependency_edges WHERE session_id = ? AND to_file IN ({})",
+                session_id, redeclared
+            )}
+            names = set()
+            for p in redeclared:
+                names.update((self._declared_types(results[p]) or "").split(","))
+                names.update((previous[p]["declared_types"] or "").split(","))
+            dependents |= self._files_mentioning(file_index, analyzer.SOURCE_EXTENSIONS, redeclared, parse_cache,
+                                                 names=names - {""})
+            dependents = {p for p in dependents - reparse if p in file_index}
+            if dependents:
+                results.update(await loop.run_in_executor(None, analyzer.analyze_files, sorted(dependents)))
+                reparse |= dependents
+        with self.db.transaction():
+            self._delete_in("dependency_nodes", "file_path", session_id, reparse | deleted)
+            self._delete_in("dependency_edges", "from_file", session_id, reparse | deleted)
+            self._insert_dependency_results(session_id, results)
+        await self._emit_step_result(session_id, "Dependency Analysis", {"reparsed_files": len(reparse)})
+
+        # --------------------------
+        # 5-7. Graph, Shared Modules, Config Files (cheap, recomputed from the DB)
+        # --------------------------
+        await self._emit_progress(session_id, "Build Graph", 50, "Building dependency graph")
+        graph, reverse_graph = self._build_dependency_graph(session_id)
+
+        await self._emit_progress(session_id, "Shared Modules", 60, "Detecting shared modules")
+        old_shared = {r["file_path"] for r in self.db.fetchall(
+            "SELECT file_path FROM shared_modules WHERE session_id = ?", (session_id,)
+        )}
+        shared_modules = self._persist_shared_modules(session_id, reverse_graph, clear=lambda: self.db.execute(
+            "DELETE FROM shared_modules WHERE session_id = ?", (session_id,)
+        ))
+
+        await self._emit_progress(session_id, "Config Files", 70, "Scanning configuration files")
+        old_configs = {r["file_path"] for r in self.db.fetchall(
+            "SELECT file_path FROM config_files WHERE session_id = ?", (session_id,)
+        )}
+        config_files = self._process_config_files(session_id, repo_root, file_index, clear=lambda: self.db.execute(
+            "DELETE FROM config_files WHERE session_id = ?", (session_id,)
+        ))
+
+        # --------------------------
+        # 8. Feature Modeling for affected features only
+        # --------------------------
+        await self._emit_progress(session_id, "Feature Modeling", 80, "Rebuilding affected feature models")
+        touched = changed | deleted | reparse | (old_shared ^ shared_modules) | (old_configs ^ set(config_files))
+        affected = {r["id"] for r in self._fetch_in(
+            "SELECT id FROM features WHERE session_id = ? AND file_path IN ({})", session_id, changed
+        )}
+        affected |= {r["feature_id"] for r in self._fetch_in(
+            "SELECT DISTINCT feature_id FROM feature_dependencies WHERE session_id = ? AND file_path IN ({})",
+            session_id, touched
+        )}
+
+        def clear_models():
+            for table in ("feature_dependencies", "feature_shared_modules", "feature_config_dependencies", "feature_hooks"):
+                self._delete_in(table, "feature_id", session_id, affected)
+
+        hook_prefilter = self._build_feature_models(
+            session_id=session_id,
+            repo_root=repo_root,
+            language=language,
+            graph=graph,
+            shared_modules=shared_modules,
+            config_files=config_files,
+            parse_cache=parse_cache,
+            feature_ids=affected,
+            clear=clear_models
+        )
+        await self._emit_step_result(session_id, "Feature Modeling", {
+            "affected_features": len(affected),
+            "hook_prefilter": hook_prefilter
+        })
+
+        # --------------------------
+        # 9. Assertions in changed files
+        # --------------------------
+        await self._emit_progress(session_id, "Assertions", 90, "Detecting assertion patterns")
+        # Detectors store str(Path), which uses the OS separator
+        self._process_assertions(
+            session_id, language, repo_root, file_index.subset(changed), parse_cache,
+            clear=lambda: self._delete_in("assertions", "file_path", session_id,
+                                          (changed | deleted) | {os.path.normpath(p) for p in changed | deleted})
+        )
 
-        tables = [
-            "features",
-            "dependency_nodes",
-            "dependency_edges",
-            "build_dependencies",
-            "driver_model",
-            "assertions",
-            "config_files",
-            "shared_modules",
-            "feature_dependencies",
-            "feature_shared_modules",
-            "feature_config_dependencies",
-            "feature_hooks"
-        ]
-
-        for table in tables:
-            self.db.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
+        # --------------------------
+        # 10. Driver Model
+        # --------------------------
+        await self._emit_progress(session_id, "Driver Model", 95, "Detecting driver patterns")
+        self._process_driver_model(session_id, language, repo_root, file_index, clear=lambda: self.db.execute(
+            "DELETE FROM driver_model WHERE session_id = ?", (session_id,)
+        ))
+
+        # --------------------------
+        # 11. Feature Status
+        # --------------------------
+        await self._emit_progress(session_id, "Status Detection", 98, "Determining feature migration status")
+        await self._update_feature_statuses(session_id, repo_root)
+
+        self.db.execute(
+            "UPDATE sessions SET status = 'ANALYZED', progress = 100, updated_at = ? WHERE id = ?",
+            (datetime.utcnow().isoformat(), session_id)
+        )
+        await self._emit_complete(session_id)
+
+    def _files_mentioning(self, file_index: RepoFileIndex, extensions, added: Set[str], parse_cache: ParseCache,
+                          names: Set[str] = frozenset()) -> Set[str]:
+        """Source files whose text mentions the module name of any added file, or any of `names`."""
+        stems = {os.path.splitext(os.path.basename(p))[0] for p in added if p.endswith(extensions)} | set(names)
+        if not stems:
+            return set()
+
+        pattern = re.compile(rb"\b(?:" + b"|".join(re.escape(s.encode()) for s in sorted(stems)) + rb")\b")
+        mentioning = set()
+        for path in file_index.paths(*extensions):
+            try:
+                if pattern.search(parse_cache.read(path)):
+                    mentioning.add(path)
+            except OSError:
+                continue
+        return mentioning
+
+    def _files_referencing_configs(self, file_index: RepoFileIndex, extensions, added: Set[str],
+                                   parse_cache: ParseCache) -> Set[str]:
+        """Source files with a string literal naming any added config file."""
+        scanner = ConfigReferenceScanner.from_file_index(file_index, added)
+        if not scanner.max_key_length:
+            return set()
+
+        referencing = set()
+        for path in file_index.paths(*extensions):
+            try:
+                if scanner.scan(parse_cache.read(path)):
+                    referencing.add(path)
+            except OSError:
+                continue
+        return referencing
+
+    def _legacy_snapshot_hashes(self, session_id: str, feature_ids: List[str]) -> Dict[str, str]:
+        """{feature_id: legacy snapshot hash} from the hashes stored with each feature's modeling rows."""
+        if not feature_ids:
+            return {}
+        hashes: Dict[str, List[Optional[str]]] = {f: [] for f in feature_ids}
+        for query in (
+            "SELECT id AS feature_id, file_hash FROM features WHERE session_id = ? AND id IN ({})",
+            "SELECT feature_id, file_hash FROM feature_dependencies WHERE session_id = ? AND feature_id IN ({})",
+            "SELECT feature_id, file_hash FROM feature_config_dependencies WHERE session_id = ? AND feature_id IN ({})",
+        ):
+            for r in self._fetch_in(query, session_id, feature_ids):
+                hashes[r["feature_id"]].append(r["file_hash"])
+        return {f: FeatureSnapshotHasher.legacy_hash(h) for f, h in hashes.items()}
+
+    @staticmethod
+    def _declared_types(data: dict) -> Optional[str]:
+        """The type names a dependency result declares, as stored in dependency_nodes.declared_types."""
+        declares = data.get("declares")
+        return ",".join(declares) if declares else None
+
+    def _fetch_in(self, query: str, session_id: str, values) -> List[dict]:
+        """Run `query` (with one `IN ({})` placeholder) over `values` in chunks."""
+        values = list(values)
+        rows = []
+        for i in range(0, len(values), _SQL_CHUNK):
+            chunk = values[i:i + _SQL_CHUNK]
+            rows.extend(self.db.fetchall(
+                query.format(",".join("?" * len(chunk))), (session_id, *chunk)
+            ))
+        return rows
+
+    def _delete_in(self, table: str, column: str, session_id: str, values):
+        values = list(values)
+        for i in range(0, len(values), _SQL_CHUNK):
+            chunk = values[i:i + _SQL_CHUNK]
+            self.db.execute(
+                f"DELETE FROM {table} WHERE session_id = ? AND {column} IN ({','.join('?' * len(chunk))})",
+                (session_id, *chunk)
+            )
+
+    def _delete_features(self, session_id: str, feature_ids: List[str]):
+        """Delete features and every per-feature row derived from them (snapshots are kept)."""
+        for i in range(0, len(feature_ids), _SQL_CHUNK):
+            chunk = feature_ids[i:i + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            self.db.execute(f"DELETE FROM tests WHERE feature_id IN ({placeholders})", tuple(chunk))
+        for table in ("feature_dependencies", "feature_shared_modules", "feature_config_dependencies",
+                      "feature_hooks", "features"):
+            self._delete_in(table, "id" if table == "features" else "feature_id", session_id, feature_ids)
+
+    # ==========================================================
+    # CLEAR
+    # ==========================================================
+
+    def _clear_old_data(self, session_id):
+        with self.db.transaction():
+            # Delete tests first (via feature_id, since tests table has no session_id)
+            self.db.execute(
+                "DELETE FROM tests WHERE feature_id IN (SELECT id FROM features WHERE session_id = ?)",
+                (session_id,)
+            )
+
+            tables = [
+                "features",
+                "dependency_nodes",
+                "dependency_edges",
+                "build_dependencies",
+                "driver_model",
+                "assertions",
+                "config_files",
+                "shared_modules",
+                "feature_dependencies",
+                "feature_shared_modules",
+                "feature_config_dependencies",
+                "feature_hooks"
+            ]
+
+            for table in tables:
+                self.db.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
 
     # ==========================================================
     # SESSION
@@ -352,94 +720,146 @@ class RepositoryAnalyzerService:
     # BUILD METADATA
     # ==========================================================
 
-    def _process_build_metadata(self, session_id, repo_root, build_system):
+    def _process_build_metadata(self, session_id, repo_root, build_system, clear=None):
         deps = BuildMetadataExtractor.extract(repo_root, build_system)
 
-        for dep in deps:
-            self.db.execute(
+        # `clear` deletes the rows being replaced, in the same short write transaction
+        with self.db.transaction():
+            if clear:
+                clear()
+            self.db.executemany(
                 """
                 INSERT INTO build_dependencies
                 (session_id, name, version, type)
                 VALUES (?, ?, ?, ?)
                 """,
-                (session_id, dep.get("name"), dep.get("version"), dep.get("type"))
+                [(session_id, dep.get("name"), dep.get("version"), dep.get("type")) for dep in deps]
             )
 
     # ==========================================================
     # FEATURES
     # ==========================================================
 
-    def _process_features(self, session_id, language, repo_root):
+    async def _process_features(self, session_id, language, repo_root, file_index=None, parse_cache=None,
+                                existing_ids: Optional[Dict[tuple, str]] = None):
+        """
+        Stream features out of the extractor and persist them in batches of
+        FEATURE_BATCH_SIZE, emitting a progress step_result (files scanned/total,
+        ETA) at most every PROGRESS_INTERVAL seconds.
 
-        extractor = FeatureExtractorFactory.get_extractor(language, repo_root)
-        features = extractor.extract_features()
+        Returns the skip statistics of the extractor's byte prefilter.
 
+        `existing_ids` maps (file_path, feature_name) to the id a feature had in a
+        previous run, so re-extracted features keep their id (and snapshots).
+        """
+
+        extractor = FeatureExtractorFactory.get_extractor(language, repo_root, file_index, parse_cache)
+        existing_ids = existing_ids or {}
+
+        total = len(extractor.scan_files())
+        scanned = found = 0
+        started = last_report = time.monotonic()
+        batch = []
+
+        for _, features in extractor.iter_file_features():
+            scanned += 1
+            batch.extend(features)
+
+            if len(batch) >= FEATURE_BATCH_SIZE:
+                self._insert_features(session_id, repo_root, batch, existing_ids)
+                found += len(batch)
+                batch = []
+
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_INTERVAL and scanned < total:
+                last_report = now
+                elapsed = now - started
+                await self._emit_step_result(session_id, "Feature Extraction", {
+                    "files_scanned": scanned,
+                    "files_total": total,
+                    "features_found": found + len(batch),
+                    "eta_seconds": round(elapsed / scanned * (total - scanned), 1)
+                })
+                await self._emit_log(session_id, f"Scanned {scanned}/{total} files, {found + len(batch)} features so far")
+
+        if batch:
+            self._insert_features(session_id, repo_root, batch, existing_ids)
+
+        await self._log_prefilter(session_id, "Feature Extraction", extractor.prefilter)
+        return extractor.prefilter.stats()
+
+    def _insert_features(self, session_id, repo_root, features: List[Dict], existing_ids: Dict[tuple, str]):
+        hashes = self._compute_file_hashes(repo_root, [f["file_path"].replace("\\", "/") for f in features])
+
+        feature_rows, test_rows = [], []
         for feature in features:
-            feature_id = str(uuid.uuid4())
             # Normalize path separators for consistency
             norm_path = feature["file_path"].replace("\\", "/")
+            feature_id = existing_ids.get((norm_path, feature["feature_name"])) or str(uuid.uuid4())
 
-            self.db.execute(
+            feature_rows.append((
+                feature_id,
+                session_id,
+                feature["feature_name"],
+                norm_path,
+                hashes[norm_path],
+                feature["framework"],
+                feature["language"],
+                str(feature.get("lifecycle_hooks", []))
+            ))
+
+            for test in feature.get("tests", []):
+                test_rows.append((
+                    str(uuid.uuid4()),
+                    feature_id,
+                    test["name"],
+                    str(test.get("annotations", []))
+                ))
+
+        with self.db.transaction():
+            self.db.executemany(
                 """
                 INSERT INTO features
                 (id, session_id, feature_name, file_path, file_hash, framework, language, hooks)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    feature_id,
-                    session_id,
-                    feature["feature_name"],
-                    norm_path,
-                    self._compute_file_hash(repo_root, norm_path),
-                    feature["framework"],
-                    feature["language"],
-                    str(feature.get("lifecycle_hooks", []))
-                )
+                feature_rows
+            )
+            self.db.executemany(
+                """
+                INSERT INTO tests
+                (id, feature_id, test_name, annotations)
+                VALUES (?, ?, ?, ?)
+                """,
+                test_rows
             )
-
-            for test in feature.get("tests", []):
-                self.db.execute(
-                    """
-                    INSERT INTO tests
-                    (id, feature_id, test_name, annotations)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (
-                        str(uuid.uuid4()),
-                        feature_id,
-                        test["name"],
-                        str(test.get("annotations", []))
-                    )
-                )
 
     # ==========================================================
     # DEPENDENCIES (WITH IMPORT NORMALIZER)
     # ==========================================================
 
-    def _process_dependencies(self, session_id, language, repo_root):
+    async def _process_dependencies(self, session_id, language, repo_root, file_index=None, parse_cache=None):
 
-        analyzer = DependencyAnalyzerFactory.get_analyzer(language, repo_root)
-        results = analyzer.analyze()
+        analyzer = DependencyAnalyzerFactory.get_analyzer(language, repo_root, file_index, parse_cache)
+        # Parsing every source file is the longest step; the event loop keeps serving meanwhile
+        results = await asyncio.get_running_loop().run_in_executor(None, analyzer.analyze)
 
+        self._insert_dependency_results(session_id, results)
 
+    def _insert_dependency_results(self, session_id, results: Dict[str, dict]):
 
+        node_rows, edge_rows = [], []
         for file_path, data in results.items():
             # Normalize file_path separators
             norm_file_path = file_path.replace("\\", "/")
 
-            self.db.execute(
-                """
-                INSERT INTO dependency_nodes
-                (session_id, file_path, file_type, package_name)
-                VALUES (?, ?, ?, ?)
-                """,
-                (
-                    session_id,
-                    norm_file_path,
-                    data.get("type", "unknown"),
-                    data.get("package")
-                )
-            )
+            node_rows.append((
+                session_id,
+                norm_file_path,
+                data.get("type", "unknown"),
+                data.get("package"),
+                self._declared_types(data)
+            ))
 
             raw_imports = data.get("imports", [])
 
@@ -448,14 +868,25 @@ class RepositoryAnalyzerService:
             resolved_imports = [imp.replace("\\", "/") for imp in raw_imports]
 
             for dep in resolved_imports:
-                self.db.execute(
-                    """
-                    INSERT INTO dependency_edges
-                    (session_id, from_file, to_file)
-                    VALUES (?, ?, ?)
-                    """,
-                    (session_id, norm_file_path, dep)
-                )
+                edge_rows.append((session_id, norm_file_path, dep))
+
+        with self.db.transaction():
+            self.db.executemany(
+                """
+                INSERT INTO dependency_nodes
+                (session_id, file_path, file_type, package_name, declared_types)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                node_rows
+            )
+            self.db.executemany(
+                """
+                INSERT INTO dependency_edges
+                (session_id, from_file, to_file)
+                VALUES (?, ?, ?)
+                """,
+                edge_rows
+            )
 
     # ==========================================================
     # GRAPH
@@ -478,15 +909,17 @@ class RepositoryAnalyzerService:
     # SHARED MODULES
     # ==========================================================
 
-    def _persist_shared_modules(self, session_id, reverse_graph):
+    def _persist_shared_modules(self, session_id, reverse_graph, clear=None):
 
         detector = SharedModuleDetector(reverse_graph)
         shared = detector.detect_shared_modules()
 
-        for file_path in shared:
-            self.db.execute(
+        with self.db.transaction():
+            if clear:
+                clear()
+            self.db.executemany(
                 "INSERT INTO shared_modules VALUES (?, ?)",
-                (session_id, file_path)
+                [(session_id, file_path) for file_path in shared]
             )
 
         return set(shared)
@@ -495,23 +928,29 @@ class RepositoryAnalyzerService:
     # CONFIG FILES
     # ==========================================================
 
-    def _process_config_files(self, session_id, repo_root):
+    def _process_config_files(self, session_id, repo_root, file_index=None, clear=None):
 
-        configs = ConfigScanner.scan(repo_root)
+        configs = ConfigScanner.scan(repo_root, file_index)
         config_files = []
 
+        rows = []
         for c in configs:
             # Normalize path separators for consistency
             norm_path = c["file_path"].replace("\\", "/")
-            self.db.execute(
+            rows.append((session_id, norm_path, c["type"]))
+            config_files.append(norm_path)
+
+        with self.db.transaction():
+            if clear:
+                clear()
+            self.db.executemany(
                 """
                 INSERT INTO config_files
                 (session_id, file_path, type)
                 VALUES (?, ?, ?)
                 """,
-                (session_id, norm_path, c["type"])
+                rows
             )
-            config_files.append(norm_path)
 
         return config_files
 
@@ -526,13 +965,19 @@ class RepositoryAnalyzerService:
         language: str,
         graph: Dict[str, Set[str]],
         shared_modules: Set[str],
-        config_files: List[str]
+        config_files: List[str],
+        parse_cache: Optional[ParseCache] = None,
+        feature_ids: Optional[Set[str]] = None,
+        clear=None
     ):
 
         feature_rows = self.db.fetchall(
-            "SELECT id, file_path FROM features WHERE session_id = ?",
+            "SELECT id, file_path, file_hash FROM features WHERE session_id = ?",
             (session_id,)
         )
+        if feature_ids is not None:
+            # Incremental run: only re-model the affected features
+            feature_rows = [r for r in feature_rows if r["id"] in feature_ids]
 
         logger.info(f"[Feature Modeling] graph size={len(graph)}, features={len(feature_rows)}, shared_modules={len(shared_modules)}, config_files={len(config_files)}")
 
@@ -540,9 +985,11 @@ class RepositoryAnalyzerService:
         shared_mapper = FeatureSharedMapper(shared_modules)
         config_mapper = FeatureConfigMapper(config_files)
 
-        ast_parser = ASTParserFactory.get_parser(language, repo_root)
-        hook_mapper = FeatureHookMapper(ast_parser)
+        ast_parser = ASTParserFactory.get_parser(language, repo_root, parse_cache)
+        hook_mapper = FeatureHookMapper(ast_parser, BytePrefilter(language, "hooks"))
 
+        dep_rows, shared_rows, config_rows, hook_rows = [], [], [], []
+        closures = []
         for row in feature_rows:
             feature_id = row["id"]
             test_file = row["file_path"]
@@ -550,122 +997,132 @@ class RepositoryAnalyzerService:
             closure = closure_builder.build_closure(test_file)
 
             for dep in closure:
-                self.db.execute(
-                    "INSERT INTO feature_dependencies (session_id, feature_id, file_path, file_hash) VALUES (?, ?, ?, ?)",
-                    (session_id, feature_id, dep, self._compute_file_hash(repo_root, dep))
-                )
+                dep_rows.append((session_id, feature_id, dep))
 
             shared_for_feature = shared_mapper.map_feature_shared(closure)
             for s in shared_for_feature:
-                self.db.execute(
-                    "INSERT INTO feature_shared_modules (session_id, feature_id, file_path, file_hash) VALUES (?, ?, ?, ?)",
-                    (session_id, feature_id, s, self._compute_file_hash(repo_root, s))
-                )
+                shared_rows.append((session_id, feature_id, s))
 
             config_for_feature = config_mapper.map_feature_configs(closure)
             for c in config_for_feature:
-                self.db.execute(
-                    "INSERT INTO feature_config_dependencies (session_id, feature_id, config_file, file_hash) VALUES (?, ?, ?, ?)",
-                    (session_id, feature_id, c, self._compute_file_hash(repo_root, c))
-                )
+                config_rows.append((session_id, feature_id, c))
+            closures.append((row, closure, config_for_feature))
 
             hooks = hook_mapper.collect_feature_hooks(
                 [test_file] + list(closure)
             )
 
             for h in hooks:
-                self.db.execute(
-                    "INSERT INTO feature_hooks (session_id, feature_id, hook_data) VALUES (?, ?, ?)",
-                    (session_id, feature_id, h)
-                )
+                hook_rows.append((session_id, feature_id, h))
+
+        # Every distinct file is hashed once, however many closures it appears in
+        hashes = self._compute_file_hashes(repo_root, {r[2] for r in dep_rows})
+
+        # Snapshot hashes come from the closures and hashes already in memory
+        hasher = FeatureSnapshotHasher(repo_root)
+        snapshot_rows = []
+        for row, closure, config_for_feature in closures:
+            h = hasher.hash_feature(row["file_path"], row["file_hash"], closure, config_for_feature, hashes)
+            snapshot_rows.append((h.snapshot_hash, h.test_hash, h.deps_hash, h.config_hash, row["id"]))
+
+        # Closures, hooks and hashes are computed above, so the write lock is
+        # only held for the inserts
+        with self.db.transaction():
+            if clear:
+                clear()
+            self.db.executemany(
+                "INSERT INTO feature_dependencies (session_id, feature_id, file_path, file_hash) VALUES (?, ?, ?, ?)",
+                [r + (hashes[r[2]],) for r in dep_rows]
+            )
+            self.db.executemany(
+                "INSERT INTO feature_shared_modules (session_id, feature_id, file_path, file_hash) VALUES (?, ?, ?, ?)",
+                [r + (hashes[r[2]],) for r in shared_rows]
+            )
+            self.db.executemany(
+                "INSERT INTO feature_config_dependencies (session_id, feature_id, config_file, file_hash) VALUES (?, ?, ?, ?)",
+                [r + (hashes[r[2]],) for r in config_rows]
+            )
+            self.db.executemany(
+                "INSERT INTO feature_hooks (session_id, feature_id, hook_data) VALUES (?, ?, ?)",
+                hook_rows
+            )
+            self.db.executemany(
+                "UPDATE features SET snapshot_hash = ?, test_hash = ?, deps_hash = ?, config_hash = ? WHERE id = ?",
+                snapshot_rows
+            )
+
+        logger.info(f"[Prefilter] Feature Modeling hooks: {hook_mapper.prefilter.stats()}")
+        return hook_mapper.prefilter.stats()
+
+    def _count_by_feature_name(self, table: str, session_id: str) -> Dict[str, int]:
+        """Row counts of a per-feature table, summed per feature name."""
+        rows = self.db.fetchall(
+            f"SELECT f.feature_name, COUNT(*) as cnt FROM {table} t JOIN features f ON t.feature_id = f.id "
+            f"WHERE f.session_id = ? GROUP BY f.feature_name",
+            (session_id,)
+        )
+        return {r["feature_name"]: r["cnt"] for r in rows}
 
     # ==========================================================
     # ASSERTIONS
     # ==========================================================
 
-    def _process_assertions(self, session_id, language, repo_root):
+    def _process_assertions(self, session_id, language, repo_root, file_index=None, parse_cache=None, clear=None):
 
-        detector = AssertionDetectorFactory.get_detector(language, repo_root)
+        detector = AssertionDetectorFactory.get_detector(language, repo_root, file_index, parse_cache)
         assertions = detector.detect_assertions()
 
-        for a in assertions:
-            self.db.execute(
+        with self.db.transaction():
+            if clear:
+                clear()
+            self.db.executemany(
                 """
                 INSERT INTO assertions
                 (session_id, file_path, assertion_type, library)
                 VALUES (?, ?, ?, ?)
                 """,
-                (
-                    session_id,
-                    a["file_path"],
-                    a["assertion_type"],
-                    a["library"]
-                )
+                [(session_id, a["file_path"], a["assertion_type"], a["library"]) for a in assertions]
             )
 
+        if detector.prefilter is None:
+            return None
+        logger.info(f"[Prefilter] Assertions: {detector.prefilter.stats()}")
+        return detector.prefilter.stats()
+
     # ==========================================================
     # DRIVER
     # ==========================================================
 
-    def _process_driver_model(self, session_id, language, repo_root):
+    def _process_driver_model(self, session_id, language, repo_root, file_index=None, clear=None):
 
-        detector = DriverDetectorFactory.get_detector(language, repo_root)
+        detector = DriverDetectorFactory.get_detector(language, repo_root, file_index)
         driver_info = detector.detect_driver()
 
-        self.db.execute(
-            """
-            INSERT INTO driver_model
-            (session_id, driver_type, initialization_pattern, thread_model)
-            VALUES (?, ?, ?, ?)
-            """,
-            (
-                session_id,
-                driver_info.get("driver_type"),
-                driver_info.get("initialization_pattern"),
-                driver_info.get("thread_model")
+        with self.db.transaction():
+            if clear:
+                clear()
+            self.db.execute(
+                """
+                INSERT INTO driver_model
+                (session_id, driver_type, initialization_pattern, thread_model)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    session_id,
+                    driver_info.get("driver_type"),
+                    driver_info.get("initialization_pattern"),
+                    driver_info.get("thread_model")
+                )
             )
-        )
 
     # ==========================================================
     # STEP 6: STATUS DETECTION
     # ==========================================================
 
-    def _compute_feature_snapshot_hash(self, feature_id: str) -> str:
-        """
-        Compute a deterministic hash for a feature based on its test file,
-        dependencies, and config files.
-        """
-        hashes = []
-
-        # 1. Main test file hash
-        feat = self.db.fetchone("SELECT file_hash FROM features WHERE id = ?", (feature_id,))
-        if feat and feat["file_hash"]:
-            hashes.append(feat["file_hash"])
-
-        # 2. Dependency hashes
-        deps = self.db.fetchall("SELECT file_hash FROM feature_dependencies WHERE feature_id = ?", (feature_id,))
-        for d in deps:
-            if d["file_hash"]:
-                hashes.append(d["file_hash"])
-
-        # 3. Config hashes
-        configs = self.db.fetchall("SELECT file_hash FROM feature_config_dependencies WHERE feature_id = ?", (feature_id,))
-        for c in configs:
-            if c["file_hash"]:
-                hashes.append(c["file_hash"])
-
-        if not hashes:
-            return ""
-
-        hashes.sort()
-        combined = "".join(hashes)
-        return hashlib.sha256(combined.encode()).hexdigest()
-
     async def _update_feature_statuses(self, session_id: str, repo_root: str):
         """
         Update the migration status of features based on structural snapshots.
         """
-        from services.git_service import GitService
         from services.workspace_service import WorkspaceService
         
         current_commit = GitService.get_head_commit(repo_root)
@@ -674,29 +1131,55 @@ class RepositoryAnalyzerService:
         session_path = WorkspaceService.get_session_path(session_id)
         target_root = os.path.join(session_path, "target")
 
-        features = self.db.fetchall("SELECT id, feature_name, file_path FROM features WHERE session_id = ?", (session_id,))
-
-        for feat in features:
-            f_id = feat["id"]
-            new_hash = self._compute_feature_snapshot_hash(f_id)
-            
-            # Fetch previous snapshot
-            prev = self.db.fetchone(
-                "SELECT snapshot_hash, source_commit FROM feature_snapshots WHERE feature_id = ? ORDER BY created_at DESC LIMIT 1",
-                (f_id,)
-            )
+        # Snapshot hashes were built during feature modeling; join each feature
+        # with its latest snapshot in one query
+        rows = self.db.fetchall(
+            """
+            SELECT f.id, f.snapshot_hash, f.test_hash, f.deps_hash, f.config_hash,
+                   s.snapshot_hash AS prev_snapshot_hash, s.test_hash AS prev_test_hash,
+                   s.deps_hash AS prev_deps_hash, s.config_hash AS prev_config_hash
+            FROM features f
+            LEFT JOIN (
+                SELECT feature_id, snapshot_hash, test_hash, deps_hash, config_hash,
+                       ROW_NUMBER() OVER (PARTITION BY feature_id ORDER BY created_at DESC, rowid DESC) AS rn
+                FROM feature_snapshots
+                WHERE feature_id IN (SELECT id FROM features WHERE session_id = ?)
+            ) s ON s.feature_id = f.id AND s.rn = 1
+            WHERE f.session_id = ?
+            """,
+            (session_id, session_id)
+        )
 
-            status = "NOT_MIGRATED"
-            if prev:
-                if new_hash == prev["snapshot_hash"]:
+        # Snapshots stored before sub-tree hashes existed hold the legacy hash
+        legacy = self._legacy_snapshot_hashes(session_id, [
+            r["id"] for r in rows if r["prev_snapshot_hash"] is not None and r["prev_test_hash"] is None
+        ])
+
+        updates = []
+        counts = {"MIGRATED": 0, "NEEDS_UPDATE": 0, "NOT_MIGRATED": 0}
+        for r in rows:
+            status, reason = "NOT_MIGRATED", None
+            if r["id"] in legacy:
+                status = "MIGRATED" if legacy[r["id"]] == r["prev_snapshot_hash"] else "NEEDS_UPDATE"
+            elif r["prev_snapshot_hash"] is not None:
+                if r["snapshot_hash"] == r["prev_snapshot_hash"]:
                     status = "MIGRATED"
                 else:
                     status = "NEEDS_UPDATE"
+                    reason = FeatureSnapshotHasher.changed_subtrees(
+                        r, {column: r[f"prev_{column}"] for column, _ in FeatureSnapshotHasher.SUBTREES}
+                    )
+            counts[status] += 1
+            updates.append((current_commit, status, reason, r["id"]))
 
-            # Update features table
-            self.db.execute(
-                "UPDATE features SET snapshot_hash = ?, source_commit = ?, status = ? WHERE id = ?",
-                (new_hash, current_commit, status, f_id)
+        with self.db.transaction():
+            self.db.executemany(
+                "UPDATE features SET source_commit = ?, status = ?, status_reason = ? WHERE id = ?",
+                updates
             )
 
-            await self._emit_log(session_id, f"Feature '{feat['feature_name']}' status: {status}")
+        await self._emit_log(
+            session_id,
+            f"Feature statuses: {counts['MIGRATED']} migrated, {counts['NEEDS_UPDATE']} need update, "
+            f"{counts['NOT_MIGRATED']} not migrated"
+        )
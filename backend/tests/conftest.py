@@ -0,0 +1,106 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_files(root, files):
+    """Create `files` ({relative path: text}) under `root`; returns root with forward slashes."""
+    for rel_path, text in files.items():
+        path = os.path.join(str(root), rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return str(root).replace("\\", "/")
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh, fully migrated database in a temporary working directory."""
+    from database import init_db
+    from database.db import Database
+
+    monkeypatch.chdir(tmp_path)
+    init_db()
+    return Database()
+
+
+def git(root, *args):
+    subprocess.run(["git", "-c", "user.email=dev@example.com", "-c", "user.name=dev", *args],
+                   cwd=root, check=True, capture_output=True)
+
+
+# A small TestNG project: two tests, two pages, two utilities and a config file
+JAVA_REPO = {
+    "pom.xml": "<project><dependencies><dependency><groupId>org.testng</groupId>"
+               "<artifactId>testng</artifactId><version>7.8.0</version></dependency></dependencies></project>\n",
+    "src/main/java/com/acme/pages/BasePage.java": """package com.acme.pages;
+
+import org.openqa.selenium.WebDriver;
+import com.acme.utils.*;
+
+public class BasePage {
+    protected WebDriver driver;
+    public BasePage(WebDriver driver) { this.driver = driver; }
+    public void settle() { Waits.pause(); }
+}
+""",
+    "src/main/java/com/acme/pages/LoginPage.java": """package com.acme.pages;
+
+import org.openqa.selenium.By;
+import org.openqa.selenium.WebDriver;
+
+public class LoginPage extends BasePage {
+    private By txtUser = By.id("user");
+    public LoginPage(WebDriver driver) { super(driver); }
+    public void login(String user) { driver.findElement(txtUser).sendKeys(user); }
+}
+""",
+    "src/main/java/com/acme/utils/Config.java": """package com.acme.utils;
+
+public class Config {
+    public static String load() { return "config.properties"; }
+}
+""",
+    "src/main/java/com/acme/utils/Waits.java": """package com.acme.utils;
+
+public class Waits {
+    public static void pause() { Config.load(); }
+}
+""",
+    "src/test/java/com/acme/tests/LoginTest.java": """package com.acme.tests;
+
+import com.acme.pages.LoginPage;
+import org.testng.Assert;
+import org.testng.annotations.Test;
+
+public class LoginTest {
+    @Test
+    public void validLogin() { new LoginPage(null).login("bob"); Assert.assertTrue(true); }
+}
+""",
+    "src/test/java/com/acme/tests/SearchTest.java": """package com.acme.tests;
+
+import org.testng.annotations.Test;
+import com.acme.utils.Config;
+
+public class SearchTest {
+    @Test
+    public void search() { Config.load(); }
+}
+""",
+    "src/test/resources/config.properties": "url=https://example.com\n",
+}
+
+
+@pytest.fixture
+def java_repo(tmp_path):
+    """JAVA_REPO committed to a fresh git repository; returns its root."""
+    root = write_files(tmp_path / "repo", JAVA_REPO)
+    git(root, "init", "-q")
+    git(root, "add", "-A")
+    git(root, "commit", "-qm", "initial")
+    return root
@@ -0,0 +1,49 @@
+import asyncio
+import shutil
+import sqlite3
+
+import pytest
+
+from conftest import git
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="incremental analysis diffs git commits")
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_no_write_lock_is_held_while_files_are_hashed_or_scanned(db, java_repo, monkeypatch, incremental):
+    import services.repository_analyzer_service as analyzer_module
+    from services.repository_analyzer_service import RepositoryAnalyzerService
+
+    writes = []
+
+    def write_from_another_session():
+        # Fails at once with "database is locked" if the analysis holds the write lock
+        conn = sqlite3.connect("migration_system.db", timeout=0)
+        try:
+            conn.execute("UPDATE sessions SET progress = progress WHERE id = 'other'")
+            conn.commit()
+            writes.append(True)
+        finally:
+            conn.close()
+
+    def during(fn):
+        def wrapper(*args, **kwargs):
+            write_from_another_session()
+            return fn(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(analyzer_module, "INCREMENTAL_MAX_CHANGE_RATIO", 1)
+    service = RepositoryAnalyzerService(db)
+    if incremental:
+        asyncio.run(service.analyze(java_repo, "s"))
+        with open(f"{java_repo}/src/main/java/com/acme/utils/Config.java", "a") as f:
+            f.write("// changed\n")
+        git(java_repo, "commit", "-qam", "change")
+
+    monkeypatch.setattr(service, "_compute_file_hashes", during(service._compute_file_hashes))
+    monkeypatch.setattr(analyzer_module.BuildMetadataExtractor, "extract", staticmethod(
+        during(analyzer_module.BuildMetadataExtractor.extract)))
+    asyncio.run(service.analyze(java_repo, "s", incremental=incremental))
+
+    assert db.fetchone("SELECT status FROM sessions WHERE id = 's'")["status"] == "ANALYZED"
+    assert len(writes) >= 2
@@ -0,0 +1,107 @@
+import functools
+
+import pytest
+
+from conftest import write_files
+
+pytest.importorskip("tree_sitter_languages")
+
+from services.ast_parsing.parser_factory import ASTParserFactory  # noqa: E402
+from services.ast_parsing.byte_prefilter import BytePrefilter, PREFILTER_PATTERNS  # noqa: E402
+from services.feature_extraction.java_extractor import JavaFeatureExtractor  # noqa: E402
+from services.feature_extraction.python_extractor import PythonFeatureExtractor  # noqa: E402
+from services.feature_extraction.ts_extractor import TSFeatureExtractor  # noqa: E402
+from services.feature_modeling.feature_hook_mapper import FeatureHookMapper  # noqa: E402
+import services.assertion_analysis.java_assertion_detector as java_assertions  # noqa: E402
+
+# Files on the edge of each prefilter pattern: whatever a stage finds in them
+# with the prefilter off, it must still find with the prefilter on
+EDGE_CASES = {
+    "java": {
+        "Commented.java": """public class Commented {
+    @/* flaky */Test
+    public void a() { }
+    @ // keep
+    Test public void b() { }
+}
+""",
+        "Spaced.java": "public class Spaced {\n    @ Test\n    public void a() { }\n}\n",
+        "Qualified.java": "public class Qualified {\n    @org.testng.annotations.Test\n    public void a() { }\n}\n",
+        "Hooks.java": """public class Hooks {
+    @BeforeMethod public void up() { }
+    @BeforeClass public void once() { }
+    @AfterMethod(alwaysRun = true) public void down() { }
+}
+""",
+        "Asserts.java": """public class Asserts {
+    @Test public void a() {
+        Assert.assertEquals(1, 1);
+        org.junit.Assert.assertTrue(true);
+        assertThat(1).isEqualTo(1);
+        softly.assertAll();
+    }
+}
+""",
+        "Plain.java": "public class Plain {\n    public void Test() { }\n}\n",
+    },
+    "python": {
+        "test_continued.py": "def \\\n    test_continued():\n    pass\n",
+        "test_forms.py": (
+            "async def test_async():\n    pass\n"
+            "class TestCart:\n    def test_method(self):\n        pass\n"
+            "def\ttest_tab():\n    pass\n"
+        ),
+        "helpers.py": "def make_test_data():\n    return 'def test_'\n",
+    },
+    "typescript": {
+        "login.spec.ts": "test('logs in', async () => {});\nit('works', () => {});\n",
+        "only.spec.ts": "test.only('focused', () => {});\nit ('spaced', () => {});\n",
+        "hooks.spec.ts": "beforeEach(() => {});\ntest.afterAll(async () => {});\ndescribe('x', () => {});\n",
+        "util.ts": "export const submit = () => 1;\n",
+    },
+}
+
+EXTRACTORS = {"java": JavaFeatureExtractor, "python": PythonFeatureExtractor, "typescript": TSFeatureExtractor}
+
+
+def test_every_pattern_has_edge_cases():
+    assert {language for language, _ in PREFILTER_PATTERNS} == set(EDGE_CASES)
+
+
+@pytest.mark.parametrize("language", sorted(EDGE_CASES))
+def test_features_are_the_same_with_and_without_the_prefilter(tmp_path, language):
+    root = write_files(tmp_path, EDGE_CASES[language])
+
+    def features(enabled):
+        extractor = EXTRACTORS[language](root)
+        extractor.prefilter = BytePrefilter(language, "features", enabled=enabled)
+        return sorted((f["feature_name"], [t["name"] for t in f["tests"]]) for f in extractor.extract_features())
+
+    expected = features(enabled=False)
+    assert expected
+    assert features(enabled=True) == expected
+
+
+@pytest.mark.parametrize("language", sorted(EDGE_CASES))
+def test_hooks_are_the_same_with_and_without_the_prefilter(tmp_path, language):
+    root = write_files(tmp_path, EDGE_CASES[language])
+
+    def hooks(enabled):
+        mapper = FeatureHookMapper(ASTParserFactory.get_parser(language, root),
+                                   BytePrefilter(language, "hooks", enabled=enabled))
+        return {path: sorted(mapper.collect_feature_hooks([path])) for path in sorted(EDGE_CASES[language])}
+
+    assert hooks(enabled=True) == hooks(enabled=False)
+
+
+def test_java_assertions_are_the_same_with_and_without_the_prefilter(tmp_path, monkeypatch):
+    root = write_files(tmp_path, EDGE_CASES["java"])
+
+    def assertions():
+        return sorted((a["file_path"], a["assertion_type"]) for a in java_assertions.JavaAssertionDetector(root).detect_assertions())
+
+    filtered = assertions()
+    monkeypatch.setattr(java_assertions, "BytePrefilter", functools.partial(BytePrefilter, enabled=False))
+    expected = assertions()
+    assert len(expected) == 4
+    assert filtered == expected
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from services.dependency_graph.closure_engine import ClosureEngine
+
+
+def dfs_reachable(graph, start):
+    """The former FeatureClosureBuilder/DependencyResolver closure: an explicit-stack DFS."""
+    visited = set()
+    stack = [start]
+    while stack:
+        current = stack.pop()
+        for dep in graph.get(current, []):
+            if dep not in visited:
+                visited.add(dep)
+                stack.append(dep)
+    return visited
+
+
+def random_graph(rng, nodes, edges):
+    names = [f"f{i}" for i in range(nodes)]
+    graph = {name: set() for name in names if rng.random() < 0.8}
+    for _ in range(edges):
+        graph.setdefault(rng.choice(names), set()).add(rng.choice(names))
+    return graph
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_dfs_on_random_cyclic_graphs(seed):
+    rng = random.Random(seed)
+    graph = random_graph(rng, nodes=rng.randint(1, 60), edges=rng.randint(0, 150))
+    engine = ClosureEngine(graph)
+
+    nodes = set(graph) | {d for deps in graph.values() for d in deps} | {"missing"}
+    for node in nodes:
+        assert engine.reachable(node) == dfs_reachable(graph, node)
+
+    for _ in range(10):
+        start = set(rng.sample(sorted(nodes), rng.randint(1, min(5, len(nodes)))))
+        expected = set(start)
+        for node in start:
+            expected |= dfs_reachable(graph, node)
+        assert engine.closure(start) == expected
+
+
+def test_cycles_and_self_loops():
+    graph = {"a": {"b"}, "b": {"c"}, "c": {"a", "d"}, "d": set(), "e": {"e"}}
+    engine = ClosureEngine(graph)
+
+    assert engine.reachable("a") == {"a", "b", "c", "d"}
+    assert engine.reachable("d") == frozenset()
+    assert engine.reachable("e") == {"e"}
+    assert engine.closure(["d"]) == {"d"}
+    assert engine.component_count() == 3
+
+
+def test_deep_chain_does_not_hit_the_recursion_limit():
+    graph = {f"f{i}": {f"f{i + 1}"} for i in range(5000)}
+    engine = ClosureEngine(graph)
+    assert len(engine.reachable("f0")) == 5000
+
+
+def test_closure_results_are_not_shared_between_calls():
+    engine = ClosureEngine({"t1": {"page"}, "page": {"util"}})
+    first = engine.closure(["t1"])
+    first.add("mutated")
+    assert engine.closure(["t1"]) == {"t1", "page", "util"}
@@ -0,0 +1,69 @@
+import re
+
+from conftest import write_files
+from services.dependency_analysis.config_reference_scanner import CONFIG_EXTENSIONS, ConfigReferenceScanner
+from services.discovery.repo_file_index import RepoFileIndex
+
+
+CONFIGS = {
+    "src/test/resources/app.properties": "",
+    "src/test/resources/config/app.properties": "",
+    "src/test/resources/testng.xml": "",
+    "config/settings.yaml": "",
+    "env/.env": "",
+}
+
+
+def index_of(tmp_path):
+    root = write_files(tmp_path, CONFIGS)
+    return RepoFileIndex.build(root)
+
+
+def old_references(file_index, source: str):
+    """The former lookup: a string literal equal to a config file name (last indexed file wins)."""
+    config_map = {e.name: e.path for e in file_index if e.name.endswith(CONFIG_EXTENSIONS)}
+    literals = re.findall(r"\"([^\"]*)\"|'([^']*)'|`([^`]*)`", source)
+    return {config_map[v] for groups in literals for v in groups if v in config_map}
+
+
+def test_plain_file_names_resolve_like_the_old_lookup(tmp_path):
+    file_index = index_of(tmp_path)
+    scanner = ConfigReferenceScanner.from_file_index(file_index)
+    sources = [
+        'String p = "app.properties"; String x = "testng.xml";',
+        "cfg = load('settings.yaml')",
+        "const env = `.env`;",
+        'log("nothing to see"); int n = 3;',
+        '"app.properties" + "settings.yaml" + "unknown.properties"',
+    ]
+    for source in sources:
+        assert scanner.scan(source.encode()) == old_references(file_index, source), source
+
+
+def test_paths_resolve_to_the_file_they_name(tmp_path):
+    file_index = index_of(tmp_path)
+    root = file_index.repo_root
+    scanner = ConfigReferenceScanner.from_file_index(file_index)
+
+    # The old lookup only knew bare names, so these resolved to nothing or to the wrong file
+    assert scanner.scan(b'read("config/app.properties")') == {f"{root}/src/test/resources/config/app.properties"}
+    assert scanner.scan(b'read("classpath:testng.xml")') == {f"{root}/src/test/resources/testng.xml"}
+    assert scanner.scan(b"open('./config/settings.yaml')") == {f"{root}/config/settings.yaml"}
+
+
+def test_partial_names_do_not_match(tmp_path):
+    scanner = ConfigReferenceScanner.from_file_index(index_of(tmp_path))
+    assert scanner.scan(b'"myapp.properties"') == set()
+    assert scanner.scan(b'"app.properties.bak"') == set()
+    assert scanner.scan(b"// see app.properties for details") == set()
+
+
+def test_scan_is_limited_to_the_given_paths(tmp_path):
+    file_index = index_of(tmp_path)
+    only = {f"{file_index.repo_root}/config/settings.yaml"}
+    scanner = ConfigReferenceScanner.from_file_index(file_index, only)
+    assert scanner.scan(b'"settings.yaml" "testng.xml"') == only
+
+
+def test_no_configs_finds_nothing():
+    assert ConfigReferenceScanner([]).scan(b'"app.properties"') == set()
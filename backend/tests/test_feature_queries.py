@@ -0,0 +1,92 @@
+import asyncio
+import shutil
+
+import pytest
+
+from conftest import git
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="the analyzed repository is a git checkout")
+
+CONFIG = "src/main/java/com/acme/utils/Config.java"
+LOGIN_PAGE = "src/main/java/com/acme/pages/LoginPage.java"
+
+
+@pytest.fixture
+def analyzed(db, java_repo):
+    from services.repository_analyzer_service import RepositoryAnalyzerService
+
+    asyncio.run(RepositoryAnalyzerService(db).analyze(java_repo, "s"))
+    features = {r["feature_name"]: r["id"] for r in db.fetchall("SELECT id, feature_name FROM features")}
+    return java_repo, features
+
+
+def test_dependency_graph_pages_cover_the_graph_once(db, analyzed):
+    from services.feature_query_service import FeatureQueryService
+
+    queries = FeatureQueryService(db)
+    full = queries.get_full_analysis("s")["dependency_graph"]
+
+    pages, cursor = [], 0
+    while cursor is not None:
+        page = queries.get_dependency_graph_page("s", cursor, limit=4)
+        assert page["total_nodes"] == len(full)
+        pages.append(page["dependency_graph"])
+        cursor = page["next_cursor"]
+
+    assert [len(p) for p in pages] == [4, 2]
+    assert sum(len(p) for p in pages) == len({path for p in pages for path in p})
+    assert {path: node for p in pages for path, node in p.items()} == full
+    assert queries.get_dependency_graph_page("missing") is None
+
+
+def test_impact_endpoint_maps_paths_and_commit_ranges_to_features(db, analyzed, monkeypatch):
+    import routes.analysis as analysis_routes
+    from fastapi import HTTPException
+    from models import ImpactRequest
+    from services.feature_query_service import FeatureQueryService
+
+    root, features = analyzed
+    monkeypatch.setattr(analysis_routes, "query_service", FeatureQueryService(db))
+
+    def impact(session_id="s", **request):
+        return asyncio.run(analysis_routes.get_impact(session_id, ImpactRequest(**request)))
+
+    both = sorted(features.values())
+    assert impact(paths=[CONFIG, "README.md"]) == {
+        "session_id": "s", "changed_files": 2, "affected_feature_ids": both, "unmatched_paths": [f"{root}/README.md"]}
+    assert impact(paths=[f"./{LOGIN_PAGE}"])["affected_feature_ids"] == [features["LoginTest"]]
+    assert impact(paths=[f"{root}/{LOGIN_PAGE}"])["affected_feature_ids"] == [features["LoginTest"]]
+
+    with open(f"{root}/{LOGIN_PAGE}", "a") as f:
+        f.write("// changed\n")
+    # The working tree against HEAD, then the same change once committed
+    assert impact(base_commit="HEAD")["affected_feature_ids"] == [features["LoginTest"]]
+    git(root, "commit", "-qam", "change")
+    assert impact(base_commit="HEAD~1", head_commit="HEAD")["affected_feature_ids"] == [features["LoginTest"]]
+
+    for request, status in [({}, 400), ({"base_commit": "no-such-commit"}, 400)]:
+        with pytest.raises(HTTPException) as error:
+            impact(**request)
+        assert error.value.status_code == status
+    with pytest.raises(HTTPException) as error:
+        impact("missing", paths=[CONFIG])
+    assert error.value.status_code == 404
+
+
+def test_impact_indexes_are_kept_for_the_most_recent_sessions_only(db, analyzed, monkeypatch):
+    import services.feature_query_service as query_module
+    from services.feature_query_service import FeatureQueryService
+
+    root, _ = analyzed
+    db.execute("INSERT INTO sessions (id, repo_root, status) VALUES ('t', ?, 'ANALYZED')", (root,))
+    monkeypatch.setattr(query_module, "IMPACT_INDEX_SESSIONS", 1)
+    queries = FeatureQueryService(db)
+
+    queries.get_affected_features("s", [CONFIG])
+    queries.get_affected_features("t", [CONFIG])
+    assert list(queries._impact_indexes) == ["t"]
+
+    # A deleted session drops its index
+    db.execute("DELETE FROM sessions WHERE id = 't'")
+    assert queries.get_affected_features("t", [CONFIG]) is None
+    assert not queries._impact_indexes
@@ -0,0 +1,83 @@
+import asyncio
+import hashlib
+import shutil
+import uuid
+
+import pytest
+
+from conftest import git
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="statuses record the analyzed git commit")
+
+
+def statuses(db, session_id):
+    return {r["feature_name"]: (r["status"], r["status_reason"]) for r in db.fetchall(
+        "SELECT feature_name, status, status_reason FROM features WHERE session_id = ?", (session_id,))}
+
+
+def snapshot_current_hashes(db, session_id, feature_name):
+    """A snapshot with sub-tree hashes, of the feature as the last analysis modeled it."""
+    f = db.fetchone("SELECT * FROM features WHERE session_id = ? AND feature_name = ?", (session_id, feature_name))
+    db.execute(
+        "INSERT INTO feature_snapshots (id, feature_id, session_id, source_commit, snapshot_hash, "
+        "test_hash, deps_hash, config_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (str(uuid.uuid4()), f["id"], session_id, "c0", f["snapshot_hash"], f["test_hash"], f["deps_hash"], f["config_hash"]))
+
+
+def snapshot_legacy_hash(db, session_id, feature_name):
+    """A snapshot as stored before sub-tree hashes: sha256 of the sorted file hashes, no sub-tree columns."""
+    f = db.fetchone("SELECT id, file_hash FROM features WHERE session_id = ? AND feature_name = ?", (session_id, feature_name))
+    hashes = [f["file_hash"]]
+    for table in ("feature_dependencies", "feature_config_dependencies"):
+        hashes += [r["file_hash"] for r in db.fetchall(f"SELECT file_hash FROM {table} WHERE feature_id = ?", (f["id"],))]
+    legacy = hashlib.sha256("".join(sorted(h for h in hashes if h)).encode()).hexdigest()
+    db.execute(
+        "INSERT INTO feature_snapshots (id, feature_id, session_id, source_commit, snapshot_hash) VALUES (?, ?, ?, ?, ?)",
+        (str(uuid.uuid4()), f["id"], session_id, "c0", legacy))
+
+
+def test_statuses_compare_against_the_latest_snapshot(db, java_repo, monkeypatch):
+    import services.repository_analyzer_service as analyzer_module
+    from services.repository_analyzer_service import RepositoryAnalyzerService
+
+    monkeypatch.setattr(analyzer_module, "INCREMENTAL_MAX_CHANGE_RATIO", 1)
+    service = RepositoryAnalyzerService(db)
+    asyncio.run(service.analyze(java_repo, "s"))
+    assert statuses(db, "s") == {"LoginTest": ("NOT_MIGRATED", None), "SearchTest": ("NOT_MIGRATED", None)}
+
+    snapshot_current_hashes(db, "s", "LoginTest")
+    snapshot_legacy_hash(db, "s", "SearchTest")
+    asyncio.run(service._update_feature_statuses("s", java_repo))
+    # A legacy snapshot is compared with the legacy formula, not the Merkle root
+    assert statuses(db, "s") == {"LoginTest": ("MIGRATED", None), "SearchTest": ("MIGRATED", None)}
+
+    # Both features reach Config; only LoginTest's own file changes as well
+    with open(f"{java_repo}/src/main/java/com/acme/utils/Config.java", "a") as f:
+        f.write("// changed\n")
+    with open(f"{java_repo}/src/test/java/com/acme/tests/LoginTest.java", "a") as f:
+        f.write("// changed\n")
+    git(java_repo, "commit", "-qam", "change")
+    asyncio.run(service.analyze(java_repo, "s", incremental=True))
+
+    # Sub-tree reasons need sub-tree hashes in the snapshot
+    assert statuses(db, "s") == {
+        "LoginTest": ("NEEDS_UPDATE", "test,dependencies"),
+        "SearchTest": ("NEEDS_UPDATE", None),
+    }
+
+
+def test_a_config_change_is_reported_as_such(db, java_repo, monkeypatch):
+    import services.repository_analyzer_service as analyzer_module
+    from services.repository_analyzer_service import RepositoryAnalyzerService
+
+    monkeypatch.setattr(analyzer_module, "INCREMENTAL_MAX_CHANGE_RATIO", 1)
+    service = RepositoryAnalyzerService(db)
+    asyncio.run(service.analyze(java_repo, "s"))
+    snapshot_current_hashes(db, "s", "SearchTest")
+
+    with open(f"{java_repo}/src/test/resources/config.properties", "a") as f:
+        f.write("timeout=30\n")
+    git(java_repo, "commit", "-qam", "config")
+    asyncio.run(service.analyze(java_repo, "s", incremental=True))
+
+    assert statuses(db, "s")["SearchTest"] == ("NEEDS_UPDATE", "config")
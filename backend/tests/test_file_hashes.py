@@ -0,0 +1,114 @@
+import hashlib
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import git, write_files
+from services.file_hash_service import FileHashService
+from services.git_service import GitService
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def git_blob(root, path) -> str:
+    return subprocess.run(["git", "hash-object", path], cwd=root, capture_output=True, text=True).stdout.strip()
+
+
+def test_unchanged_signatures_are_not_hashed_again(db, tmp_path):
+    root = write_files(tmp_path / "files", {"a.txt": "alpha", "b.txt": "beta"})
+    a, b = f"{root}/a.txt", f"{root}/b.txt"
+    hashes = FileHashService(db, max_workers=1)
+
+    assert hashes.hash_files([a, b, f"{root}/missing.txt"]) == {
+        a: sha256(b"alpha"), b: sha256(b"beta"), f"{root}/missing.txt": None}
+    assert hashes.hashed == 2
+    assert hashes.hash_files([a, b]) == {a: sha256(b"alpha"), b: sha256(b"beta")}
+    assert hashes.hashed == 2
+
+    # Persisted in file_hashes: a new service (e.g. after a restart) reads them back
+    restarted = FileHashService(db, max_workers=1)
+    assert restarted.hash_file(a) == sha256(b"alpha")
+    assert restarted.hashed == 0
+
+    with open(a, "w") as f:
+        f.write("alpha, edited")
+    assert hashes.hash_file(a) == sha256(b"alpha, edited")
+    assert hashes.hashed == 3
+
+
+def test_a_replaced_file_with_the_same_size_and_mtime_is_hashed_again(db, tmp_path):
+    root = write_files(tmp_path / "files", {"a.txt": "alpha"})
+    a = f"{root}/a.txt"
+    hashes = FileHashService(db, max_workers=1)
+    assert hashes.hash_file(a) == sha256(b"alpha")
+
+    # An editor saving through a temporary file and a rename: same size and
+    # mtime, another inode
+    st = os.stat(a)
+    write_files(root, {"a.txt.tmp": "ALPHA"})
+    os.utime(f"{root}/a.txt.tmp", ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(f"{root}/a.txt.tmp", a)
+    assert os.stat(a).st_ino != st.st_ino
+
+    assert hashes.hash_file(a) == sha256(b"ALPHA")
+    assert FileHashService(db, max_workers=1).hash_file(a) == sha256(b"ALPHA")
+
+
+def test_the_memo_keeps_the_most_recently_used_hashes(db, tmp_path):
+    root = write_files(tmp_path / "files", {f"{n}.txt": n for n in "abc"})
+    paths = [f"{root}/{n}.txt" for n in "abc"]
+    hashes = FileHashService(db, max_workers=1, memo_max_entries=2)
+
+    for path in paths:
+        hashes.hash_file(path)
+    assert list(hashes._memo) == paths[1:]
+
+    # Evicted hashes come back from the table, not from the file
+    assert hashes.hash_file(paths[0]) == sha256(b"a")
+    assert hashes.hashed == 3
+    assert list(hashes._memo) == [paths[2], paths[0]]
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git blob IDs need git")
+def test_git_mode_uses_index_blobs_for_clean_files_and_hashes_dirty_ones(db, java_repo, monkeypatch):
+    root = java_repo
+    config = f"{root}/src/main/java/com/acme/utils/Config.java"
+    waits = f"{root}/src/main/java/com/acme/utils/Waits.java"
+    hashes = FileHashService(db, max_workers=1, mode="git")
+
+    clean = git_blob(root, config)
+    assert hashes.hash_files([config, waits], root) == {config: clean, waits: git_blob(root, waits)}
+    assert hashes.hashed == 0
+
+    # Modified and untracked files are hashed from the working tree
+    with open(config, "a") as f:
+        f.write("// dirty\n")
+    write_files(root, {"notes.txt": "untracked"})
+    dirty = hashes.hash_files([config, f"{root}/notes.txt"], root)
+    assert dirty == {config: git_blob(root, config), f"{root}/notes.txt": git_blob(root, "notes.txt")}
+    assert dirty[config] != clean
+    assert hashes.hashed == 2
+
+    # Staging the change refreshes the index blobs; the file is clean again
+    git(root, "add", config)
+    assert hashes.hash_file(config, root) == dirty[config]
+    assert hashes.hashed == 2
+
+    # Inside a run the dirty list is taken once
+    calls = []
+    monkeypatch.setattr(GitService, "get_dirty_files", staticmethod(
+        lambda repo_path, real=GitService.get_dirty_files: calls.append(repo_path) or real(repo_path)))
+    with hashes.analysis_run():
+        hashes.hash_file(config, root)
+        hashes.hash_file(waits, root)
+    assert calls == [root]
+
+
+def test_git_mode_falls_back_to_sha256_outside_a_work_tree(db, tmp_path):
+    root = write_files(tmp_path / "plain", {"a.txt": "alpha"})
+    hashes = FileHashService(db, max_workers=1, mode="git")
+    assert hashes.hash_file(f"{root}/a.txt", root) == sha256(b"alpha")
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import shutil
+
+import pytest
+
+from conftest import git, write_files
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="incremental analysis diffs git commits")
+
+
+# Adds a page and a test, modifies a test to import the new page, deletes a utility
+JAVA_CHANGES = {
+    "src/main/java/com/acme/pages/SearchPage.java": """package com.acme.pages;
+
+public class SearchPage extends BasePage {
+    public SearchPage() { super(null); }
+}
+""",
+    "src/test/java/com/acme/tests/SearchTest.java": """package com.acme.tests;
+
+import org.testng.annotations.Test;
+import com.acme.pages.SearchPage;
+import com.acme.utils.Config;
+
+public class SearchTest {
+    @Test
+    public void search() { new SearchPage(); Config.load(); }
+}
+""",
+    "src/test/java/com/acme/tests/NewTest.java": """package com.acme.tests;
+
+import org.testng.Assert;
+import org.testng.annotations.Test;
+
+public class NewTest {
+    @Test
+    public void t() { Assert.assertTrue(true); }
+}
+""",
+}
+JAVA_DELETED = ["src/main/java/com/acme/utils/Waits.java"]
+
+
+def snapshot(db, session_id, root):
+    """Everything an analysis stores for a session, with paths relative to `root`."""
+    from services.feature_query_service import FeatureQueryService
+
+    full = FeatureQueryService(db).get_full_analysis(session_id)
+
+    def rel(path):
+        return path.replace(root + "/", "")
+
+    return {
+        "graph": {rel(k): sorted(rel(i) for i in v["imports"]) for k, v in full["dependency_graph"].items()},
+        "types": {rel(k): (v["type"], v["package"]) for k, v in full["dependency_graph"].items()},
+        "features": sorted(
+            (f["name"],
+             sorted(rel(d["path"]) for d in f["dependent_files"]),
+             sorted(rel(d["path"]) for d in f["config_files"]),
+             sorted(rel(d["path"]) for d in f["shared_modules"]))
+            for f in full["features"]
+        ),
+        "assertions": sorted((rel(a["file_path"]), a["assertion_type"]) for a in full["assertions"]),
+        "configs": sorted(rel(c["file_path"]) for c in full["config_files"]),
+        "shared": sorted(rel(s) for s in full["shared_modules"]),
+        "tests": sorted(r["test_name"] for r in db.fetchall(
+            "SELECT t.test_name FROM tests t JOIN features f ON t.feature_id = f.id WHERE f.session_id = ?",
+            (session_id,))),
+    }
+
+
+def feature_ids(db, session_id):
+    return {r["feature_name"]: r["id"] for r in db.fetchall(
+        "SELECT id, feature_name FROM features WHERE session_id = ?", (session_id,))}
+
+
+def test_incremental_add_modify_delete_matches_full_analysis(db, java_repo, monkeypatch):
+    import services.repository_analyzer_service as analyzer_module
+    from services.repository_analyzer_service import RepositoryAnalyzerService
+
+    monkeypatch.setattr(analyzer_module, "INCREMENTAL_MAX_CHANGE_RATIO", 1)
+    root = java_repo
+
+    service = RepositoryAnalyzerService(db)
+    asyncio.run(service.analyze(root, "incremental"))
+    before = feature_ids(db, "incremental")
+
+    write_files(root, JAVA_CHANGES)
+    for rel_path in JAVA_DELETED:
+        os.remove(os.path.join(root, rel_path))
+    git(root, "add", "-A")
+    git(root, "commit", "-qm", "change")
+
+    assert service._get_incremental_changes(root, "incremental") is not None
+    asyncio.run(service.analyze(root, "incremental", incremental=True))
+    asyncio.run(service.analyze(root, "full"))
+
+    incremental, full = snapshot(db, "incremental", root), snapshot(db, "full", root)
+    assert incremental == full
+    assert "src/main/java/com/acme/utils/Waits.java" not in incremental["graph"]
+    assert "src/main/java/com/acme/pages/SearchPage.java" in incremental["graph"]["src/test/java/com/acme/tests/SearchTest.java"]
+
+    # Features of unchanged and modified tests keep their ids
+    after = feature_ids(db, "incremental")
+    assert {name: after.get(name) for name in before} == before
+
+
+def test_moving_a_class_to_another_package_re_resolves_its_importers(db, java_repo, monkeypatch):
+    import services.repository_analyzer_service as analyzer_module
+    from services.repository_analyzer_service import RepositoryAnalyzerService
+
+    monkeypatch.setattr(analyzer_module, "INCREMENTAL_MAX_CHANGE_RATIO", 1)
+    root = java_repo
+    config = "src/main/java/com/acme/utils/Config.java"
+
+    service = RepositoryAnalyzerService(db)
+    asyncio.run(service.analyze(root, "incremental"))
+
+    # Only Config.java changes: Waits' same-package reference no longer reaches it,
+    # SearchTest's `Config` now resolves through its own package
+    write_files(root, {config: """package com.acme.tests;
+
+public class Config {
+    public static String load() { return "config.properties"; }
+}
+"""})
+    git(root, "commit", "-qam", "move Config")
+
+    asyncio.run(service.analyze(root, "incremental", incremental=True))
+    asyncio.run(service.analyze(root, "full"))
+
+    incremental, full = snapshot(db, "incremental", root), snapshot(db, "full", root)
+    assert incremental == full
+    assert config not in incremental["graph"]["src/main/java/com/acme/utils/Waits.java"]
+    assert incremental["types"][config] == ("source", "com.acme.tests")
@@ -0,0 +1,111 @@
+import pytest
+
+from conftest import write_files
+
+pytest.importorskip("tree_sitter_languages")
+
+from services.intent_extractor_service import ASTExtractor  # noqa: E402
+
+
+def page(name, method, field, locator):
+    return (f"public class {name} {{\n"
+            f"    By {field} = By.id(\"{locator}\");\n"
+            f"    public void {method}(String u) {{ driver.findElement({field}).sendKeys(u); }}\n"
+            f"}}\n")
+
+
+def extract(root, paths, test_file):
+    extractor = ASTExtractor()
+    extractor.build_workspace_index([f"{root}/{p}" for p in paths])
+    return extractor.parse_files([f"{root}/{test_file}"])
+
+
+def steps(model):
+    return [(s["source_method"], s["locator"]["value"], s["detail"]["file"]) for s in model["raw_steps"]]
+
+
+def test_sibling_blocks_resolve_a_reused_name_to_their_own_type(tmp_path):
+    files = {
+        "LoginPage.java": page("LoginPage", "login", "txtUser", "user"),
+        "HomePage.java": page("HomePage", "logout", "btnOut", "out"),
+        "ScopeTest.java": """public class ScopeTest {
+    @Test
+    public void siblings() {
+        if (a) { LoginPage page = new LoginPage(); page.login("x"); }
+        else { HomePage page = new HomePage(); page.logout("y"); }
+        for (HomePage q = null; ; ) { q.logout("z"); }
+    }
+}
+""",
+    }
+    root = write_files(tmp_path, files)
+    model = extract(root, list(files), "ScopeTest.java")
+
+    assert [s[:2] for s in steps(model)] == [
+        ("LoginPage.login", "user"), ("HomePage.logout", "out"), ("HomePage.logout", "out")]
+
+
+def test_duplicate_class_names_expand_the_file_the_method_came_from(tmp_path):
+    # a/LoginPage declares logout; b/LoginPage, indexed later, owns class_to_file["LoginPage"]
+    files = {
+        "a/LoginPage.java": page("LoginPage", "logout", "btnOut", "out"),
+        "b/LoginPage.java": page("LoginPage", "login", "txtUser", "user"),
+        "LogoutTest.java": """public class LogoutTest {
+    @Test
+    public void out() { LoginPage page = new LoginPage(); page.logout("x"); }
+}
+""",
+    }
+    root = write_files(tmp_path, files)
+    model = extract(root, list(files), "LogoutTest.java")
+
+    assert steps(model) == [("LoginPage.logout", "out", f"{root}/a/LoginPage.java")]
+
+
+def test_workspace_index_cache_reindexes_only_changed_files(db, tmp_path):
+    from services.file_hash_service import FileHashService
+    from services.intent_extractor_service import WorkspaceIndexCache
+
+    files = {
+        "LoginPage.java": page("LoginPage", "login", "txtUser", "user"),
+        "HomePage.java": page("HomePage", "logout", "btnOut", "out"),
+        "FlowTest.java": """public class FlowTest {
+    @Test
+    public void flow() { LoginPage l = new LoginPage(); l.login("x"); HomePage h = new HomePage(); h.logout("y"); }
+}
+""",
+    }
+    root = write_files(tmp_path / "ws", files)
+    paths = [f"{root}/{p}" for p in files]
+
+    extractor = ASTExtractor()
+    indexed = []
+    index_java_file = extractor.index_java_file
+    extractor.index_java_file = lambda path: indexed.append(path) or index_java_file(path)
+
+    def run(cache):
+        indexed.clear()
+        extractor.use_workspace_index(cache.get("s", paths, extractor))
+        return [s[:2] for s in steps(extractor.parse_files([f"{root}/FlowTest.java"]))]
+
+    cache = WorkspaceIndexCache(FileHashService(db, max_workers=1), db=db)
+    assert run(cache) == [("LoginPage.login", "user"), ("HomePage.logout", "out")]
+    assert sorted(indexed) == sorted(paths)
+
+    index = cache.get("s", paths, extractor)
+    assert cache.get("s", paths, extractor) is index
+
+    # Only the edited page is parsed again, and the steps see its new locator
+    write_files(root, {"LoginPage.java": page("LoginPage", "login", "txtUser", "username")})
+    assert run(cache) == [("LoginPage.login", "username"), ("HomePage.logout", "out")]
+    assert indexed == [f"{root}/LoginPage.java"]
+
+    # A new cache (e.g. after a restart) reads the unchanged parts back from the database
+    write_files(root, {"HomePage.java": page("HomePage", "logout", "btnOut", "signout")})
+    assert run(WorkspaceIndexCache(FileHashService(db, max_workers=1), db=db)) == [
+        ("LoginPage.login", "username"), ("HomePage.logout", "signout")]
+    assert indexed == [f"{root}/HomePage.java"]
+
+    cache.invalidate("s")
+    run(cache)
+    assert sorted(indexed) == sorted(paths)
@@ -0,0 +1,99 @@
+import os
+import re
+
+from conftest import write_files
+from services.dependency_analysis.java_dependency_analyzer import JavaDependencyAnalyzer
+from services.dependency_resolution.path_resolver import PathResolver
+
+
+def analyze(root):
+    analyzer = JavaDependencyAnalyzer(root, parse_workers=1)
+    analyzer.analyze()
+    return {path: deps for path, deps in analyzer.get_graph().items()}
+
+
+def old_import_graph(root):
+    """The former resolution: the last segment of each import looked up by file name (first file wins)."""
+    java_map = {}
+    for directory, _, files in sorted(os.walk(root)):
+        for name in sorted(files):
+            java_map.setdefault(name[:-len(".java")], f"{directory}/{name}")
+
+    graph = {}
+    for path in java_map.values():
+        with open(path, encoding="utf-8") as f:
+            imports = re.findall(r"^import\s+(?:static\s+)?([\w.]+?)(?:\.\*)?;", f.read(), re.M)
+        graph[path] = {java_map[i.split(".")[-1]] for i in imports if i.split(".")[-1] in java_map}
+    return graph
+
+
+UNIQUE_NAMES = {
+    "src/main/java/com/acme/pages/LoginPage.java":
+        "package com.acme.pages;\nimport com.acme.utils.Waits;\npublic class LoginPage { void go() { Waits.pause(); } }\n",
+    "src/main/java/com/acme/utils/Waits.java":
+        "package com.acme.utils;\nimport java.time.Duration;\npublic class Waits { public static void pause() {} }\n",
+    "src/test/java/com/acme/tests/LoginTest.java":
+        "package com.acme.tests;\nimport com.acme.pages.LoginPage;\nimport org.testng.annotations.Test;\n"
+        "public class LoginTest { @Test public void t() { new LoginPage(); } }\n",
+}
+
+
+def test_single_type_imports_resolve_like_the_old_file_name_lookup(tmp_path):
+    root = write_files(tmp_path, UNIQUE_NAMES)
+    assert analyze(root) == old_import_graph(root)
+
+
+def test_imports_resolve_by_fully_qualified_name(tmp_path):
+    root = write_files(tmp_path, {
+        "src/main/java/com/a/Config.java": "package com.a;\npublic class Config {}\n",
+        "src/main/java/com/b/Config.java": "package com.b;\npublic class Config { public static class Inner {} }\n",
+        "src/main/java/com/b/Util.java": "package com.b;\npublic class Util { public static void help() {} }\n",
+        "src/main/java/com/c/Page.java": "package com.c;\npublic class Page {}\n",
+        "src/main/java/com/c/Helper.java": "package com.c;\npublic class Helper {}\n",
+        "src/test/java/com/c/PageTest.java": (
+            "package com.c;\n"
+            "import com.b.Config;\n"
+            "import static com.b.Util.help;\n"
+            "import org.external.Helper;\n"
+            "public class PageTest { Page page; Config config; void t() { help(); } }\n"
+        ),
+        "src/test/java/com/d/WildcardTest.java": (
+            "package com.d;\n"
+            "import com.a.*;\n"
+            "import com.b.Config.Inner;\n"
+            "public class WildcardTest { Config config; Inner inner; }\n"
+        ),
+    })
+    graph = analyze(root)
+    main = f"{root}/src/main/java/com"
+
+    # The old lookup took the first Config and the local Helper for org.external.Helper,
+    # and missed the same-package Page and the static import
+    assert graph[f"{root}/src/test/java/com/c/PageTest.java"] == {
+        f"{main}/b/Config.java", f"{main}/b/Util.java", f"{main}/c/Page.java"}
+    assert graph[f"{root}/src/test/java/com/d/WildcardTest.java"] == {
+        f"{main}/a/Config.java", f"{main}/b/Config.java"}
+
+
+def test_file_name_declares_the_primary_type_of_a_damaged_file(tmp_path):
+    # No class declaration survives the syntax error; the file name still indexes it
+    root = write_files(tmp_path, {
+        "src/main/java/com/a/Broken.java": "package com.a;\npublic class Broken {{{\n",
+        "src/test/java/com/a/UsesBroken.java": "package com.t;\nimport com.a.Broken;\npublic class UsesBroken {}\n",
+    })
+    assert analyze(root)[f"{root}/src/test/java/com/a/UsesBroken.java"] == {f"{root}/src/main/java/com/a/Broken.java"}
+
+
+def test_path_resolver_matches_the_old_filesystem_search(tmp_path):
+    root = write_files(tmp_path, {
+        "com/acme/utils/Helper.java": "package com.acme.utils;\npublic class Helper {}\n",
+        "src/main/java/com/acme/pages/LoginPage.java": "package com.acme.pages;\npublic class LoginPage {}\n",
+    })
+    resolver = PathResolver(root)
+
+    # Repository-root layout: the same relative path the os.walk search returned
+    assert resolver.resolve("com.acme.utils.Helper", "Test.java", "java") == os.path.join("com", "acme", "utils", "Helper.java")
+    # Source roots, which the old search could not see through
+    assert resolver.resolve("com.acme.pages.LoginPage", "Test.java", "java") == os.path.join(
+        "src", "main", "java", "com", "acme", "pages", "LoginPage.java")
+    assert resolver.resolve("org.openqa.selenium.By", "Test.java", "java") is None
@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+
+from database import init_db, migrations
+from database.migrations import MIGRATIONS, apply_migrations
+
+
+def applied_versions(db):
+    return [r["version"] for r in db.fetchall("SELECT version FROM schema_migrations ORDER BY version")]
+
+
+def test_fresh_database_records_every_migration_once(db):
+    assert applied_versions(db) == [version for version, _, _ in MIGRATIONS]
+
+    init_db()
+    assert applied_versions(db) == [version for version, _, _ in MIGRATIONS]
+
+
+def test_older_database_is_upgraded_to_the_latest_version(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(migrations, "MIGRATIONS", MIGRATIONS[:2])
+    init_db()
+    monkeypatch.setattr(migrations, "MIGRATIONS", MIGRATIONS)
+    init_db()
+
+    conn = sqlite3.connect(str(tmp_path / "migration_system.db"))
+    try:
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+        feature_columns = {row[1] for row in conn.execute("PRAGMA table_info(features)")}
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        conn.close()
+    assert versions == [version for version, _, _ in MIGRATIONS]
+    assert {"test_hash", "deps_hash", "config_hash", "status_reason"} <= feature_columns
+    assert "workspace_index_parts" in tables
+
+
+def test_failed_migration_is_rolled_back_and_not_recorded(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "broken.db"))
+    try:
+        conn.execute("CREATE TABLE t (a TEXT)")
+        conn.commit()
+        broken = [(1, "ok", ["CREATE INDEX idx_t_a ON t (a)"]),
+                  (2, "broken", ["CREATE TABLE u (b TEXT)", "ALTER TABLE missing ADD COLUMN c TEXT"])]
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(migrations, "MIGRATIONS", broken)
+            with pytest.raises(sqlite3.OperationalError):
+                apply_migrations(conn)
+
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_migrations")]
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        conn.close()
+    assert versions == [1]
+    assert "u" not in tables
+
+
+@pytest.mark.parametrize("query, index", [
+    ("SELECT * FROM features WHERE session_id = ? AND file_path = ?", "idx_features_session_file"),
+    ("SELECT to_file FROM dependency_edges WHERE session_id = ? AND from_file = ?", "idx_dependency_edges_session_from"),
+    ("SELECT from_file FROM dependency_edges WHERE session_id = ? AND to_file = ?", "idx_dependency_edges_session_to"),
+    ("SELECT * FROM feature_dependencies WHERE feature_id = ?", "idx_feature_dependencies_feature"),
+    ("SELECT * FROM feature_snapshots WHERE feature_id = ? ORDER BY created_at DESC LIMIT 1",
+     "idx_feature_snapshots_feature_created"),
+])
+def test_hot_queries_use_their_index(db, query, index):
+    # Before the migrations every one of these was a full table scan
+    plan = " ".join(db.explain(query, ("a",) * query.count("?")))
+    assert index in plan
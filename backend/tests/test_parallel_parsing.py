@@ -0,0 +1,35 @@
+import pytest
+
+from conftest import JAVA_REPO, write_files
+
+pytest.importorskip("tree_sitter_languages")
+
+import services.dependency_analysis.base_analyzer as base_analyzer  # noqa: E402
+from services.ast_parsing.parse_cache import JAVA_SUMMARY_TREE_SITTER, ParseCache  # noqa: E402
+from services.dependency_analysis.java_dependency_analyzer import JavaDependencyAnalyzer  # noqa: E402
+from services.discovery.repo_file_index import RepoFileIndex  # noqa: E402
+
+
+def test_parse_workers_match_in_process_parsing_and_share_one_pool(tmp_path, monkeypatch):
+    root = write_files(tmp_path, JAVA_REPO)
+    file_index = RepoFileIndex.build(root)
+    monkeypatch.setattr(base_analyzer, "PARALLEL_MIN_FILES", 1)
+
+    serial = JavaDependencyAnalyzer(root, file_index, parse_workers=1).analyze()
+
+    parse_cache = ParseCache()
+    parallel = JavaDependencyAnalyzer(root, file_index, parse_cache, parse_workers=2)
+    assert parallel.analyze() == serial
+    pool = base_analyzer._pool
+    assert pool is not None
+
+    # The summaries parsed by the workers reach this process's cache
+    misses = parse_cache.misses
+    for path in file_index.paths(".java"):
+        parse_cache.parse(path, JAVA_SUMMARY_TREE_SITTER, lambda source: pytest.fail(f"{path} parsed again"))
+    assert parse_cache.misses == misses
+
+    # A later analysis reuses the running workers
+    again = JavaDependencyAnalyzer(root, file_index, parse_workers=2)
+    assert again.analyze_files(sorted(file_index.paths(".java"))) == serial
+    assert base_analyzer._pool is pool
@@ -0,0 +1,97 @@
+import ast
+import os
+
+import pytest
+
+from conftest import write_files
+from services.dependency_resolution.path_resolver import PathResolver
+from services.dependency_resolution.python_module_index import PythonModuleIndex
+from services.discovery.repo_file_index import RepoFileIndex
+
+
+def old_resolve_import(repo_root, from_file, import_path):
+    """The former PythonDependencyAnalyzer.resolve_import: the importer's directory, then the repository root."""
+    rel_target = import_path.replace(".", "/") + ".py"
+    target = f"{os.path.dirname(from_file)}/{os.path.basename(rel_target)}"
+    if os.path.exists(target):
+        return target
+    root_target = f"{repo_root}/{rel_target}"
+    if os.path.exists(root_target):
+        return root_target
+    return None
+
+
+REPO = {
+    "utils/db.py": "",
+    "tests/helpers.py": "",
+    "tests/test_orders.py": "",
+    "src/shop/__init__.py": "",
+    "src/shop/core/__init__.py": "",
+    "src/shop/core/tax.py": "",
+    "src/shop/core/money.py": "",
+    "tests/conftest.py": (
+        "import pytest\n"
+        "@pytest.fixture\ndef browser(): pass\n"
+        "@pytest.fixture(name='api')\ndef _api(): pass\n"
+    ),
+    "tests/unit/conftest.py": "import pytest\n@pytest.fixture\ndef browser(): pass\n",
+    "tests/unit/test_tax.py": "",
+    "tests/e2e/conftest.py": "import pytest\n@pytest.fixture(autouse=True)\ndef reset(): pass\n",
+    "tests/e2e/test_checkout.py": "",
+}
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = write_files(tmp_path, REPO)
+    return root, PythonModuleIndex(RepoFileIndex.build(root))
+
+
+@pytest.mark.parametrize("from_file, module", [
+    ("tests/test_orders.py", "helpers"),
+    ("tests/test_orders.py", "utils.db"),
+    ("tests/test_orders.py", "requests"),
+    ("utils/db.py", "utils.missing"),
+])
+def test_flat_layout_resolves_like_the_old_lookup(repo, from_file, module):
+    root, index = repo
+    assert index.resolve_module(f"{root}/{from_file}", module) == old_resolve_import(root, f"{root}/{from_file}", module)
+
+
+def test_src_layout_packages_and_relative_imports(repo):
+    root, index = repo
+    core = f"{root}/src/shop/core"
+    test_file = f"{root}/tests/unit/test_tax.py"
+
+    # Package-qualified names under src/, which the old lookup could not find
+    assert index.resolve(test_file, "shop.core.tax") == {
+        f"{core}/tax.py", f"{core}/__init__.py", f"{root}/src/shop/__init__.py"}
+    # `from shop.core import money` imports the submodule
+    assert f"{core}/money.py" in index.resolve(test_file, "shop.core", names=["money", "missing"])
+    # `from .money import x` and `from .. import core` inside the package
+    assert index.resolve(f"{core}/tax.py", "money", level=1) == {f"{core}/money.py"}
+    assert index.resolve(f"{core}/tax.py", None, level=2, names=["core"]) == {
+        f"{root}/src/shop/__init__.py", f"{core}/__init__.py"}
+
+
+def test_fixtures_resolve_to_the_innermost_conftest(repo):
+    root, index = repo
+    test_tax = f"{root}/tests/unit/test_tax.py"
+    tree = ast.parse("def test_total(browser, api, tmp_path): pass\n")
+    assert index.fixture_dependencies(test_tax, tree) == {f"{root}/tests/unit/conftest.py", f"{root}/tests/conftest.py"}
+
+    only_browser = ast.parse("def test_total(browser): pass\n")
+    assert index.fixture_dependencies(test_tax, only_browser) == {f"{root}/tests/unit/conftest.py"}
+
+    # Autouse fixtures apply without being requested
+    checkout = f"{root}/tests/e2e/test_checkout.py"
+    assert index.fixture_dependencies(checkout, ast.parse("def test_pay(): pass\n")) == {f"{root}/tests/e2e/conftest.py"}
+
+
+def test_path_resolver_matches_the_old_root_relative_lookup(repo):
+    root, _ = repo
+    resolver = PathResolver(root)
+    assert resolver.resolve("utils.db", "tests/test_orders.py", "python") == os.path.join("utils", "db.py")
+    assert resolver.resolve("shop.core.tax", "tests/test_orders.py", "python") == os.path.join(
+        "src", "shop", "core", "tax.py")
+    assert resolver.resolve("requests", "tests/test_orders.py", "python") is None
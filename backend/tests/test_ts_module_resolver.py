@@ -0,0 +1,83 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from conftest import write_files
+from services.dependency_resolution.ts_module_resolver import TSModuleResolver, load_jsonc
+from services.discovery.repo_file_index import RepoFileIndex
+
+
+def old_resolve(from_file, import_path):
+    """The former resolution: relative specifiers only, probed on the filesystem."""
+    if not import_path.startswith("."):
+        return None
+    full = (Path(from_file).parent / import_path).resolve()
+    for ext in [".ts", ".js", ".tsx", ".jsx", "/index.ts", "/index.js"]:
+        candidate = Path(str(full) + ext)
+        if candidate.exists():
+            return str(candidate).replace("\\", "/")
+    return None
+
+
+REPO = {
+    "tests/login.spec.ts": "",
+    "tests/helpers/wait.ts": "",
+    "tests/helpers/legacy.js": "",
+    "tests/components/Button.tsx": "",
+    "pages/index.ts": "",
+    "pages/login.page.ts": "",
+    "utils/index.js": "",
+    "tsconfig.base.json": """{
+        // shared settings
+        "compilerOptions": {"baseUrl": ".", "paths": {"@pages/*": ["pages/*"], "@utils": ["utils"],}},
+    }""",
+    "tsconfig.json": '{"extends": "./tsconfig.base", "compilerOptions": {"strict": true}}',
+    "packages/shared/package.json": '{"name": "@acme/shared", "exports": {".": "./src/main.ts", "./api": {"import": "./src/api.ts"}}}',
+    "packages/shared/src/main.ts": "",
+    "packages/shared/src/api.ts": "",
+}
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = write_files(tmp_path, REPO)
+    return root, TSModuleResolver(RepoFileIndex.build(root))
+
+
+@pytest.mark.parametrize("specifier", [
+    "./helpers/wait", "./helpers/legacy", "./components/Button", "../pages", "../pages/login.page",
+    "../utils", "./missing", "../pages/missing",
+])
+def test_relative_specifiers_resolve_like_the_filesystem_probe(repo, specifier):
+    root, resolver = repo
+    from_file = f"{root}/tests/login.spec.ts"
+    assert resolver.resolve(from_file, specifier) == old_resolve(from_file, specifier)
+
+
+def test_aliases_and_local_packages(repo):
+    root, resolver = repo
+    from_file = f"{root}/tests/login.spec.ts"
+
+    # Bare specifiers, which the old resolution treated as external libraries
+    assert resolver.resolve(from_file, "@pages/login.page") == f"{root}/pages/login.page.ts"
+    assert resolver.resolve(from_file, "@utils") == f"{root}/utils/index.js"
+    assert resolver.resolve(from_file, "pages/login.page") == f"{root}/pages/login.page.ts"
+    assert resolver.resolve(from_file, "@acme/shared") == f"{root}/packages/shared/src/main.ts"
+    assert resolver.resolve(from_file, "@acme/shared/api") == f"{root}/packages/shared/src/api.ts"
+    assert resolver.resolve(from_file, "@playwright/test") is None
+
+
+def test_esm_specifiers_name_the_emitted_file(repo):
+    root, resolver = repo
+    assert resolver.resolve(f"{root}/tests/login.spec.ts", "../pages/login.page.js") == f"{root}/pages/login.page.ts"
+
+
+def test_resolution_reads_the_index_not_the_filesystem(repo):
+    root, resolver = repo
+    os.remove(f"{root}/tests/helpers/wait.ts")
+    assert resolver.resolve(f"{root}/tests/login.spec.ts", "./helpers/wait") == f"{root}/tests/helpers/wait.ts"
+
+
+def test_load_jsonc_keeps_comment_markers_inside_strings():
+    assert load_jsonc('{"a": "http://x/*y*/", /* c */ "b": [1,], // d\n}') == {"a": "http://x/*y*/", "b": [1]}
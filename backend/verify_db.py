@@ -19,3 +19,26 @@ try:
         print(f" - {col['name']}")
 except Exception as e:
     print(f"Error: {e}")
+
+# Query plans for the hot lookups; every line should use an index, not "SCAN"
+HOT_QUERIES = [
+    ("SELECT * FROM features WHERE session_id = ? AND file_path = ?", ("", "")),
+    ("SELECT file_path FROM feature_dependencies WHERE feature_id = ?", ("",)),
+    ("SELECT feature_id FROM feature_dependencies WHERE session_id = ? AND file_path = ?", ("", "")),
+    ("SELECT from_file, to_file FROM dependency_edges WHERE session_id = ?", ("",)),
+    ("SELECT from_file FROM dependency_edges WHERE session_id = ? AND to_file = ?", ("", "")),
+    ("SELECT snapshot_hash FROM feature_snapshots WHERE feature_id = ? ORDER BY created_at DESC LIMIT 1", ("",)),
+    ("SELECT enriched_model FROM feature_intent WHERE intent_hash = ?", ("",)),
+]
+
+try:
+    db.init_schema()
+    version = db.fetchone("SELECT MAX(version) as v FROM schema_migrations")
+    print(f"Schema version: {version['v']}")
+    print("Query plans:")
+    for query, params in HOT_QUERIES:
+        print(f" - {query}")
+        for step in db.explain(query, params):
+            print(f"     {step}")
+except Exception as e:
+    print(f"Error: {e}")
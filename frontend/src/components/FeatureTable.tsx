@@ -105,7 +105,7 @@ export const FeatureTable = ({ sessionId, features, selectedFeatures, onToggleFe
                                             </div>
                                         </div>
                                     </td>
-                                    <td className="px-6 py-4" onClick={() => toggleRow(feature.feature_id)}>
+                                    <td className="px-6 py-4" onClick={() => toggleRow(feature.feature_id)} title={feature.status_reason ? `Changed: ${feature.status_reason}` : undefined}>
                                         {getStatusBadge(feature.status)}
                                     </td>
                                     <td className="px-6 py-4 text-center" onClick={() => toggleRow(feature.feature_id)}>
@@ -57,6 +57,7 @@ export interface FeatureSummary {
     feature_id: string;
     name: string;
     status: 'MIGRATED' | 'NEEDS_UPDATE' | 'CONFLICTED' | 'NOT_MIGRATED';
+    status_reason?: string | null;
     dependent_count: number;
     config_count: number;
     shared_count: number;